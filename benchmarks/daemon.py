@@ -0,0 +1,142 @@
+"""
+Compares latency of commands forwarded by `labelbox-client` to a warm
+`labelbox serve` daemon with cold `labelbox` processes running the same
+command, both against the fake server.
+
+    python -m benchmarks.daemon --runs 20 --latency 0.05 --json daemon.json
+"""
+
+import argparse
+import os
+import signal
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from src.fake_server import FakeServer, FakeServerConfig
+from src.remote import SOCKET_ENV_VAR
+from src.utils import write_json_file
+
+ROOT = Path(__file__).resolve().parent.parent
+CLI = "import sys; from src.main import cli; cli(sys.argv[1:], prog_name='labelbox')"
+CLIENT = "from src.remote import main; main()"
+
+
+def wait_until_listening(daemon):
+    # `serve` prints its address once the socket accepts connections.
+    line = daemon.stdout.readline()
+    if not line.startswith("Listening on"):
+        daemon.wait(timeout=10)
+        raise RuntimeError(f"Daemon exited with code {daemon.returncode}: {line}")
+
+
+def time_runs(code, command, runs, env):
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        process = subprocess.run(
+            [sys.executable, "-c", code, *command],
+            cwd=ROOT,
+            env=env,
+            capture_output=True,
+            text=True,
+        )
+        samples.append(time.perf_counter() - started)
+        if process.returncode != 0:
+            raise RuntimeError(
+                f"{' '.join(command)} failed:\n{process.stdout}{process.stderr}"
+            )
+    return samples
+
+
+def summarize(mode, samples):
+    samples = sorted(samples)
+    return {
+        "mode": mode,
+        "runs": len(samples),
+        "min": samples[0],
+        "median": statistics.median(samples),
+        "p95": samples[min(len(samples) - 1, round(len(samples) * 0.95))],
+        "max": samples[-1],
+    }
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument(
+        "command",
+        nargs="*",
+        help="Command to time. Defaults to `project get` of a fake project.",
+    )
+    parser.add_argument("--json", type=Path, help="Writes results to a JSON file.")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    server = FakeServer(config=FakeServerConfig(latency=args.latency)).start()
+    project, _ = server.fake.populate(10)
+    command = args.command or ["project", "get", project["id"]]
+
+    results = []
+    with tempfile.TemporaryDirectory(prefix="labelbox-cli-bench-") as home:
+        profile = {
+            "name": "bench",
+            "api_key": "fake",
+            "endpoint": f"{server.url}/graphql",
+            "rest_endpoint": f"{server.url}/api/v1",
+            "active": True,
+        }
+        write_json_file(Path(home) / ".labelbox-cli.json", {"bench": profile})
+        socket_path = Path(home) / "labelbox.sock"
+        env = dict(
+            os.environ,
+            HOME=home,
+            PYTHONPATH=str(ROOT),
+            LABELBOX_CLI_CACHE_DIR=str(Path(home) / "cache"),
+            **{SOCKET_ENV_VAR: str(socket_path)},
+        )
+
+        daemon = subprocess.Popen(
+            [sys.executable, "-c", CLI, "serve", "--socket", str(socket_path)],
+            cwd=ROOT,
+            env=env,
+            stdout=subprocess.PIPE,
+            text=True,
+        )
+        try:
+            wait_until_listening(daemon)
+            # First forwarded command builds the daemon's client.
+            time_runs(CLIENT, command, 1, env)
+            results.append(
+                summarize("warm", time_runs(CLIENT, command, args.runs, env))
+            )
+            results.append(summarize("cold", time_runs(CLI, command, args.runs, env)))
+        finally:
+            daemon.send_signal(signal.SIGTERM)
+            daemon.wait(timeout=10)
+            server.shutdown()
+            server.server_close()
+
+    print(f"labelbox {' '.join(command)}")
+    for result in results:
+        print(
+            f"{result['mode']:>5}: median {result['median'] * 1000:7.1f}ms "
+            f"p95 {result['p95'] * 1000:7.1f}ms min {result['min'] * 1000:7.1f}ms "
+            f"max {result['max'] * 1000:7.1f}ms"
+        )
+    warm, cold = results
+    print(f"Warm daemon is {cold['median'] / warm['median']:.1f}x faster (median).")
+
+    if args.json:
+        write_json_file(args.json, results, pretty=True)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,182 @@
+"""
+Times upload, export, batch and bulk delete flows of the CLI against the fake
+server. Commands run in-process, the same way `labelbox shell` runs them.
+
+    python -m benchmarks.flows --rows 10000 --latency 0.05 --rate-limit 20
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+# Cache directory is resolved when the CLI modules are imported.
+os.environ.setdefault(
+    "LABELBOX_CLI_CACHE_DIR", tempfile.mkdtemp(prefix="labelbox-cli-bench-")
+)
+
+from src import timings
+from src.client import LazyClient
+from src.commands.daemon import invoke_command
+from src.fake_server import FakeServer, FakeServerConfig
+from src.utils import write_json_file
+
+FLOWS = ["upload", "export", "batch", "delete"]
+
+
+def prepare_upload(fake, workdir, args):
+    dataset = fake.add_dataset("bench-upload")
+    rows = workdir / "rows.ndjson"
+    with open(rows, "w") as f:
+        for index in range(args.rows):
+            row = {"row_data": f"https://bench/{index}.jpg", "global_key": f"u-{index}"}
+            f.write(json.dumps(row) + "\n")
+    command = ["dataset", "append", "--di", dataset["id"], "--ndjson", str(rows)]
+    return command + ["--workers", str(args.workers)], args.rows
+
+
+def prepare_export(fake, workdir, args):
+    project, _ = fake.populate(args.rows)
+    output = workdir / "export.ndjson"
+    return ["project", "export", project["id"], "--output", str(output)], args.rows
+
+
+def prepare_batch(fake, workdir, args):
+    dataset = fake.add_dataset("bench-batch")
+    for index in range(args.rows):
+        spec = {"row_data": f"https://bench/{index}.jpg", "global_key": f"b-{index}"}
+        fake.add_data_row(dataset["id"], spec)
+    project = fake.add_project("bench-batch")
+    keys = workdir / "keys.txt"
+    keys.write_text("\n".join(f"b-{index}" for index in range(args.rows)))
+    command = ["batch", "create", "--pi", project["id"], "--n", "bench"]
+    command += ["--fp", str(keys), "--gk", "--batch-size", str(args.batch_size)]
+    return command + ["--workers", str(args.workers)], args.rows
+
+
+def prepare_delete(fake, workdir, args):
+    ids = [fake.add_project(f"bench-{index}")["id"] for index in range(args.projects)]
+    ids_file = workdir / "projects.txt"
+    ids_file.write_text("\n".join(ids))
+    command = ["project", "delete", "--ff", str(ids_file)]
+    return command + ["--workers", str(args.workers)], len(ids)
+
+
+PREPARE = {
+    "upload": prepare_upload,
+    "export": prepare_export,
+    "batch": prepare_batch,
+    "delete": prepare_delete,
+}
+
+
+def percentile(values, q):
+    if not values:
+        return None
+    if len(values) == 1:
+        return values[0]
+    return statistics.quantiles(values, n=100, method="inclusive")[q - 1]
+
+
+def run_flow(name, server, client, workdir, args):
+    command, items = PREPARE[name](server.fake, workdir, args)
+    stats_before = dict(server.stats)
+
+    recorder = timings.start(" ".join(command))
+    started = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        exit_code = invoke_command(client, command)
+    elapsed = time.perf_counter() - started
+    timings.stop()
+
+    latencies = [span.duration for span in recorder.spans if span.category == "api"]
+    return {
+        "flow": name,
+        "exit_code": exit_code,
+        "items": items,
+        "seconds": round(elapsed, 3),
+        "items_per_second": round(items / elapsed, 1) if elapsed else None,
+        "api_calls": len(latencies),
+        "api_p50": percentile(latencies, 50),
+        "api_p95": percentile(latencies, 95),
+        "server": {key: server.stats[key] - stats_before[key] for key in server.stats},
+    }
+
+
+def print_result(result):
+    server = result["server"]
+    latency = (
+        f"api p50 {result['api_p50'] * 1000:.0f}ms p95 {result['api_p95'] * 1000:.0f}ms"
+        if result["api_calls"]
+        else "no api calls"
+    )
+    print(
+        f"{result['flow']:>7}: {result['items']} items in {result['seconds']:.2f}s "
+        f"({result['items_per_second']}/s), {result['api_calls']} calls, {latency}, "
+        f"{server['requests']} requests, {server['throttled']} throttled, "
+        f"{server['errors']} errors, exit code {result['exit_code']}"
+    )
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--flow", choices=FLOWS, action="append", dest="flows")
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--projects", type=int, default=200)
+    parser.add_argument("--batch-size", type=int, default=2000)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--rate-limit", type=float, default=None)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", type=Path, help="Writes results to a JSON file.")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    config = FakeServerConfig(
+        latency=args.latency,
+        jitter=args.jitter,
+        rate_limit=args.rate_limit,
+        error_rate=args.error_rate,
+        seed=args.seed,
+    )
+    server = FakeServer(config=config).start()
+
+    results = []
+    try:
+        with tempfile.TemporaryDirectory(prefix="labelbox-cli-bench-") as tmp:
+            workdir = Path(tmp)
+            config_file = workdir / "labelbox-cli.json"
+            profile = {
+                "name": "bench",
+                "api_key": "fake",
+                "endpoint": f"{server.url}/graphql",
+                "rest_endpoint": f"{server.url}/api/v1",
+                "active": True,
+            }
+            write_json_file(config_file, {"bench": profile})
+            client = LazyClient(config_file)
+
+            for name in args.flows or FLOWS:
+                result = run_flow(name, server, client, workdir, args)
+                print_result(result)
+                results.append(result)
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    if args.json:
+        write_json_file(args.json, results, pretty=True)
+    return 0 if all(result["exit_code"] == 0 for result in results) else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,134 @@
+"""
+Times the installed JSON serializers on synthetic export records, compact and
+pretty, as NDJSON lines (streamed exports) and as one document (--save).
+
+    python -m benchmarks.serializer --rows 1000 --rows 100000 --json serializer.json
+"""
+
+import argparse
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+from src.utils import SERIALIZERS, load_serializer, write_json_file
+
+
+def export_record(index):
+    """
+    Returns a project export record with a couple of labeled objects,
+    shaped like the ones returned by Export V2.
+    """
+    created_at = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    objects = [
+        {
+            "feature_id": f"feature-{index}-{number}",
+            "name": "Car",
+            "value": "car",
+            "annotation_kind": "ImageBoundingBox",
+            "bounding_box": {"top": 10.5, "left": 20.25, "height": 64, "width": 128},
+            "classifications": [
+                {"name": "Occluded", "radio_answer": {"name": "no", "value": "no"}}
+            ],
+        }
+        for number in range(3)
+    ]
+    return {
+        "data_row": {
+            "id": f"data-row-{index}",
+            "global_key": f"key-{index}",
+            "external_id": f"{index}.jpg",
+            "row_data": f"https://storage.labelbox.com/images/{index}.jpg",
+            "details": {"created_at": created_at, "dataset_name": "Benchmark ✓"},
+        },
+        "media_attributes": {"width": 1920, "height": 1080, "mime_type": "image/jpeg"},
+        "metadata_fields": [{"schema_name": "split", "value": "train"}],
+        "projects": {
+            "project-id": {
+                "name": "Benchmark",
+                "labels": [
+                    {
+                        "id": f"label-{index}",
+                        "label_details": {"created_at": created_at},
+                        "annotations": {"objects": objects, "classifications": []},
+                    }
+                ],
+            }
+        },
+    }
+
+
+def available_serializers():
+    """
+    Yields (name, dumps) of the installed serializers. Missing libraries
+    fall back to `json` in load_serializer, so duplicates are dropped.
+    """
+    seen = set()
+    for requested in SERIALIZERS:
+        name, dumps, _ = load_serializer(requested)
+        if name not in seen:
+            seen.add(name)
+            yield name, dumps
+
+
+def best_of(repeat, fn):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        output = fn()
+        timings.append(time.perf_counter() - started)
+    return min(timings), output
+
+
+def bench(records, dumps, pretty, shape, repeat):
+    if shape == "ndjson":
+        seconds, output = best_of(
+            repeat, lambda: "".join(dumps(record, pretty) + "\n" for record in records)
+        )
+    else:
+        seconds, output = best_of(repeat, lambda: dumps(records, pretty))
+    size = len(output.encode("utf-8"))
+    return seconds, size
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, action="append")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--json", type=Path, help="Writes results to a JSON file.")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    serializers = list(available_serializers())
+
+    results = []
+    for rows in args.rows or [1000, 10000, 100000]:
+        records = [export_record(index) for index in range(rows)]
+        for shape in ("ndjson", "document"):
+            for pretty in (False, True):
+                for name, dumps in serializers:
+                    seconds, size = bench(records, dumps, pretty, shape, args.repeat)
+                    result = {
+                        "serializer": name,
+                        "rows": rows,
+                        "shape": shape,
+                        "pretty": pretty,
+                        "seconds": seconds,
+                        "bytes": size,
+                        "rows_per_second": round(rows / seconds),
+                    }
+                    print(
+                        f"{name:>7} {shape:>8} {'pretty' if pretty else 'compact':>7} "
+                        f"{rows:>7} rows: {seconds * 1000:8.1f}ms "
+                        f"{result['rows_per_second']:>9}/s {size / 2**20:8.1f}MB"
+                    )
+                    results.append(result)
+
+    if args.json:
+        write_json_file(args.json, results, pretty=True)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,90 @@
+"""
+Times CLI startup: `labelbox --help` and `--help` of every subcommand, each in
+a fresh interpreter, and reports whether the Labelbox SDK got imported.
+
+    python -m benchmarks.startup --repeat 10 --json startup.json
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from src.main import SUBCOMMANDS
+from src.utils import write_json_file
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Runs the CLI and reports on stderr whether `labelbox` ended up in sys.modules.
+RUNNER = (
+    "import sys\n"
+    "from src.main import cli\n"
+    "try:\n"
+    "    cli(sys.argv[1:], prog_name='labelbox')\n"
+    "finally:\n"
+    "    sys.stderr.write('\\nlabelbox imported: %s\\n' % ('labelbox' in sys.modules))\n"
+)
+
+
+def time_command(args, repeat, env):
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        process = subprocess.run(
+            [sys.executable, "-c", RUNNER, *args],
+            cwd=ROOT,
+            env=env,
+            capture_output=True,
+            text=True,
+        )
+        samples.append(time.perf_counter() - started)
+        if process.returncode != 0:
+            raise RuntimeError(f"labelbox {' '.join(args)} failed:\n{process.stderr}")
+
+    return {
+        "command": " ".join(["labelbox", *args]),
+        "min": min(samples),
+        "median": statistics.median(samples),
+        "max": max(samples),
+        "sdk_imported": "labelbox imported: True" in process.stderr,
+    }
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--json", type=Path, help="Writes results to a JSON file.")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    commands = [["--help"]] + [[name, "--help"] for name in SUBCOMMANDS]
+
+    results = []
+    with tempfile.TemporaryDirectory(prefix="labelbox-cli-bench-") as home:
+        # Subcommands need a profile, otherwise the CLI asks to create one.
+        profile = {"name": "bench", "api_key": "fake", "active": True}
+        write_json_file(Path(home) / ".labelbox-cli.json", {"bench": profile})
+        env = dict(os.environ, HOME=home, PYTHONPATH=str(ROOT))
+
+        for command in commands:
+            result = time_command(command, args.repeat, env)
+            print(
+                f"{result['command']:<32} median {result['median'] * 1000:6.0f}ms "
+                f"min {result['min'] * 1000:6.0f}ms max {result['max'] * 1000:6.0f}ms "
+                f"sdk {'imported' if result['sdk_imported'] else 'not imported'}"
+            )
+            results.append(result)
+
+    if args.json:
+        write_json_file(args.json, results, pretty=True)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -13,6 +13,7 @@ setup(
     entry_points={
         "console_scripts": [
             "labelbox = src.main:cli",
+            "labelbox-client = src.remote:main",
         ]
     },
 )
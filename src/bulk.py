@@ -0,0 +1,101 @@
+import sys
+
+import click
+
+from .ratelimit import TokenBucket
+from .utils import bounded_map, iter_unique
+
+DEFAULT_BULK_WORKERS = 8
+
+
+def bulk_options(command):
+    """
+    Adds options shared by commands that operate on many IDs at once.
+    """
+    options = [
+        click.option(
+            "--from-file",
+            "--ff",
+            "from_file",
+            default=None,
+            type=click.Path(exists=True, dir_okay=False, allow_dash=True),
+            help="File with one ID per line. Use - to read IDs from stdin.",
+        ),
+        click.option(
+            "--workers",
+            default=DEFAULT_BULK_WORKERS,
+            show_default=True,
+            type=click.IntRange(min=1),
+            help="Number of IDs processed concurrently.",
+        ),
+        click.option(
+            "--rate",
+            default=None,
+            type=click.FloatRange(min=0, min_open=True),
+            help="Maximum number of IDs processed per second.",
+        ),
+    ]
+    for option in reversed(options):
+        command = option(command)
+    return command
+
+
+def read_ids(ids, from_file=None):
+    """
+    Yields unique IDs given as arguments, in the file, or on stdin ("-").
+    """
+
+    def iter_ids():
+        for item in ids:
+            if item == "-":
+                yield from _iter_lines(sys.stdin)
+            else:
+                yield item.strip()
+
+        if from_file == "-":
+            yield from _iter_lines(sys.stdin)
+        elif from_file:
+            with open(from_file, "r") as f:
+                yield from _iter_lines(f)
+
+    return iter_unique(item for item in iter_ids() if item)
+
+
+def _iter_lines(stream):
+    for line in stream:
+        yield line.strip()
+
+
+def run_bulk(fn, ids, workers=DEFAULT_BULK_WORKERS, rate=None):
+    """
+    Calls `fn(id)` for every ID on a bounded worker pool, optionally rate limited.
+    `fn` returns the message printed for the ID. Errors are reported per ID.
+    Returns list of IDs that have failed.
+    """
+    bucket = TokenBucket(rate) if rate else None
+
+    def call(item):
+        if bucket is not None:
+            bucket.acquire()
+        return fn(item)
+
+    succeeded = []
+    failed = []
+
+    for item, message, error in bounded_map(call, ids, workers):
+        if error is not None:
+            failed.append(item)
+            click.echo(f"{item}: failed: {error}", err=True)
+        else:
+            succeeded.append(item)
+            click.echo(message)
+
+    if not succeeded and not failed:
+        raise click.UsageError(
+            "Provide at least one ID as argument or with --from-file."
+        )
+
+    if len(succeeded) + len(failed) > 1:
+        click.echo(f"Done: {len(succeeded)} succeeded, {len(failed)} failed.")
+
+    return failed
@@ -0,0 +1,105 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+CACHE_DIR = Path(
+    os.environ.get("LABELBOX_CLI_CACHE_DIR", Path.home() / ".cache" / "labelbox-cli")
+)
+
+
+class DiskCache:
+    """
+    Directory of small JSON files keyed by arbitrary strings.
+
+    Entries older than `max_age` seconds are treated as missing. When there are
+    more than `max_entries` entries, `evict` removes the least recently used ones.
+    Reads update file access time, which is used for LRU ordering.
+    """
+
+    def __init__(self, directory, max_age=None, max_entries=None):
+        self.directory = Path(directory)
+        self.max_age = max_age
+        self.max_entries = max_entries
+
+    def _path(self, key):
+        digest = hashlib.sha1(key.encode("utf-8")).hexdigest()
+        return self.directory / digest[:2] / f"{digest}.json"
+
+    def _is_expired(self, stat, now, max_age=None):
+        max_age = max_age or self.max_age
+        return max_age is not None and now - stat.st_mtime > max_age
+
+    def get(self, key, max_age=None):
+        path = self._path(key)
+        now = time.time()
+
+        try:
+            stat = path.stat()
+            if self._is_expired(stat, now, max_age):
+                return None
+
+            with open(path, "r", encoding="utf-8") as f:
+                value = json.load(f)
+
+            os.utime(path, (now, stat.st_mtime))
+        except (OSError, ValueError):
+            return None
+
+        return value
+
+    def set(self, key, value):
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        # Written into temporary file first, so readers never see partial entries.
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(value, f)
+        os.replace(tmp_path, path)
+
+    def delete(self, key):
+        self._path(key).unlink(missing_ok=True)
+
+    def _entries(self):
+        if not self.directory.is_dir():
+            return []
+        return [(path, path.stat()) for path in self.directory.glob("*/*.json")]
+
+    def evict(self):
+        """
+        Removes expired entries and least recently used ones above the size limit.
+        Returns number of removed entries.
+        """
+        now = time.time()
+        entries = []
+        removed = 0
+
+        for path, stat in self._entries():
+            if self._is_expired(stat, now):
+                path.unlink(missing_ok=True)
+                removed += 1
+            else:
+                entries.append((stat.st_atime, path))
+
+        if self.max_entries is not None and len(entries) > self.max_entries:
+            entries.sort()
+            for _, path in entries[: len(entries) - self.max_entries]:
+                path.unlink(missing_ok=True)
+                removed += 1
+
+        return removed
+
+    def stats(self):
+        entries = self._entries()
+        return {
+            "directory": str(self.directory),
+            "entries": len(entries),
+            "bytes": sum(stat.st_size for _, stat in entries),
+        }
+
+    def clear(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
@@ -0,0 +1,73 @@
+import threading
+from functools import lru_cache
+
+from . import timings
+from .ratelimit import Throttle
+from .utils import find_active_profile, read_json_file
+
+
+@lru_cache(maxsize=None)
+def load_profile(config_file):
+    """
+    Reads the config file once per process and returns the active profile.
+    """
+    with timings.span("load config", "config"):
+        return find_active_profile(read_json_file(config_file))
+
+
+class LazyClient:
+    """
+    Proxy for labelbox.Client that is passed around as `ctx.obj`.
+
+    The SDK is imported and the Client is built on first attribute access,
+    so invocations that never reach the API pay no client setup cost.
+    """
+
+    def __init__(self, config_file):
+        self._config_file = config_file
+        self._client = None
+        self._lock = threading.Lock()
+        self.throttle = None
+
+    @property
+    def profile(self):
+        return load_profile(self._config_file)
+
+    @property
+    def is_built(self):
+        return self._client is not None
+
+    def get_client(self):
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    self._client = self._build_client()
+        return self._client
+
+    def _build_client(self):
+        with timings.span("import labelbox", "import"):
+            from labelbox import Client
+
+        profile = self.profile
+        # Blank endpoints mean "use the SDK defaults".
+        endpoints = {
+            key: profile[key]
+            for key in ("endpoint", "rest_endpoint")
+            if profile.get(key)
+        }
+        with timings.span("build client", "client"):
+            client = Client(api_key=profile["api_key"], **endpoints)
+
+        # Every SDK call goes through `execute`, so wrapping it on the instance
+        # rate limits all commands and retries throttled (429) requests.
+        # Timed spans include the time spent waiting for the rate limiter.
+        self.throttle = Throttle.from_profile(profile)
+        client.execute = timings.timed_execute(self.throttle.wrap(client.execute))
+        return client
+
+    def __getattr__(self, name):
+        return getattr(self.get_client(), name)
+
+    def __repr__(self):
+        state = "built" if self.is_built else "not built"
+        return f"<LazyClient {self._config_file} ({state})>"
@@ -0,0 +1,247 @@
+from itertools import islice
+
+import click
+import numpy as np
+
+from .utils import dumps
+
+COLUMNAR_FORMATS = ["parquet", "arrow"]
+BATCH_SIZE = 10_000
+EXTRA_COLUMN = "_extra"
+
+_NUMPY_TYPES = {"bool": np.bool_, "int64": np.int64, "double": np.float64}
+
+
+def _import_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.ipc
+        import pyarrow.parquet
+    except ImportError:
+        raise click.UsageError(
+            "parquet and arrow formats require pyarrow package: pip install pyarrow"
+        )
+    return pyarrow
+
+
+def _is_metadata(value):
+    return (
+        isinstance(value, list)
+        and len(value) > 0
+        and all(
+            isinstance(item, dict) and "schema_name" in item and "value" in item
+            for item in value
+        )
+    )
+
+
+def flatten(record, prefix="", columns=None):
+    """
+    Flattens nested objects into dot separated columns. Metadata fields
+    (lists of {schema_name, value}) become one column per schema name,
+    other lists are kept as values.
+    """
+    columns = {} if columns is None else columns
+
+    for key, value in record.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            if value:
+                flatten(value, f"{name}.", columns)
+            else:
+                columns[name] = None
+        elif _is_metadata(value):
+            for field in value:
+                columns[f"{name}.{field['schema_name']}"] = field["value"]
+        else:
+            columns[name] = value
+
+    return columns
+
+
+def explode_labels(record):
+    """
+    Yields one row per label of the export record. The `projects` mapping keyed
+    by project ID becomes `project` object with `id` and its `labels` list
+    becomes one `label` object per row, so columns are the same for every
+    project. Records without projects or labels yield a single row.
+    """
+    projects = record.get("projects")
+    if not isinstance(projects, dict) or not projects:
+        yield record
+        return
+
+    row = {key: value for key, value in record.items() if key != "projects"}
+    for project_id, project in projects.items():
+        project = {"id": project_id, **(project or {})}
+        labels = project.pop("labels", None) or [None]
+        for label in labels:
+            if label is None:
+                yield {**row, "project": project}
+            else:
+                yield {**row, "project": project, "label": label}
+
+
+def _type_name(value):
+    if isinstance(value, bool):
+        return "bool"
+    if isinstance(value, int):
+        return "int64"
+    if isinstance(value, float):
+        return "double"
+    return "string"
+
+
+def _infer_type(values):
+    types = {_type_name(value) for value in values if value is not None}
+    if len(types) == 1:
+        return types.pop()
+    if types == {"int64", "double"}:
+        return "double"
+    # Columns without values in the first batch are typed as strings.
+    return "string"
+
+
+def _fits(value, type_name):
+    if value is None or type_name == "string":
+        return True
+    if type_name == "double":
+        return _type_name(value) in ("int64", "double")
+    return _type_name(value) == type_name
+
+
+def _as_string(value):
+    if isinstance(value, str):
+        return value
+    return dumps(value)
+
+
+class ColumnarWriter:
+    """
+    Writes records into Parquet or Arrow IPC file in record batches.
+
+    Records are split into one row per label, flattened into columns and the
+    schema (column names and types) is fixed by the first batch. Values of columns that first appear in later
+    batches or don't match the column type are kept as JSON in `_extra` column.
+    """
+
+    def __init__(self, file_path, output_format="parquet", compression=None):
+        self.pa = _import_pyarrow()
+        self.file_path = str(file_path)
+        self.output_format = output_format
+        self.compression = compression
+        self.types = None
+        self.schema = None
+        self.writer = None
+
+    def open(self, columns):
+        """
+        Creates the file with the schema of the given {name: type} columns
+        ("bool", "int64", "double" or "string"). Called by `write_batch` with
+        types inferred from the first batch unless the writer is already open.
+        """
+        pa = self.pa
+        self.types = columns
+        self.schema = pa.schema(
+            [
+                pa.field(name, self._arrow_type(type_name))
+                for name, type_name in columns.items()
+            ]
+            + [pa.field(EXTRA_COLUMN, pa.string())]
+        )
+
+        if self.output_format == "arrow":
+            if self.compression not in (None, "none", "zstd"):
+                raise click.UsageError("arrow format supports only zstd compression.")
+            codec = None if self.compression in (None, "none") else self.compression
+            options = pa.ipc.IpcWriteOptions(compression=codec)
+            self.writer = pa.ipc.new_file(self.file_path, self.schema, options=options)
+        else:
+            codec = "snappy" if self.compression in (None, "none") else self.compression
+            self.writer = pa.parquet.ParquetWriter(
+                self.file_path, self.schema, compression=codec
+            )
+
+    def _arrow_type(self, type_name):
+        pa = self.pa
+        return {
+            "bool": pa.bool_,
+            "int64": pa.int64,
+            "double": pa.float64,
+            "string": pa.string,
+        }[type_name]()
+
+    def _column(self, values, type_name):
+        pa = self.pa
+        if type_name == "string":
+            strings = [None if value is None else _as_string(value) for value in values]
+            return pa.array(strings, type=pa.string())
+
+        count = len(values)
+        mask = np.fromiter((value is None for value in values), np.bool_, count)
+        data = np.fromiter(
+            (0 if value is None else value for value in values),
+            _NUMPY_TYPES[type_name],
+            count,
+        )
+        return pa.array(data, mask=mask, type=self._arrow_type(type_name))
+
+    def write_batch(self, records):
+        rows = [flatten(row) for record in records for row in explode_labels(record)]
+
+        if self.writer is None:
+            names = {}
+            for row in rows:
+                names.update(dict.fromkeys(row))
+            self.open(
+                {name: _infer_type([row.get(name) for row in rows]) for name in names}
+            )
+
+        columns = {name: [] for name in self.types}
+        extras = []
+        for row in rows:
+            extra = {}
+            for name, value in row.items():
+                type_name = self.types.get(name)
+                if type_name is None or not _fits(value, type_name):
+                    extra[name] = value
+            for name, values in columns.items():
+                value = row.get(name)
+                values.append(None if name in extra else value)
+            extras.append(dumps(extra) if extra else None)
+
+        arrays = [self._column(columns[name], self.types[name]) for name in self.types]
+        arrays.append(self.pa.array(extras, type=self.pa.string()))
+        batch = self.pa.RecordBatch.from_arrays(arrays, schema=self.schema)
+
+        if self.output_format == "arrow":
+            self.writer.write_batch(batch)
+        else:
+            self.writer.write_table(self.pa.Table.from_batches([batch]))
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+
+
+def write_columnar(records, file_path, output_format="parquet", compression=None):
+    """
+    Writes records into Parquet or Arrow IPC file batch by batch.
+    Returns number of written records.
+    """
+    writer = ColumnarWriter(file_path, output_format, compression)
+    records = iter(records)
+    written = 0
+
+    try:
+        while batch := list(islice(records, BATCH_SIZE)):
+            writer.write_batch(batch)
+            written += len(batch)
+
+        if writer.writer is None:
+            # Empty export still produces a readable file.
+            writer.open({})
+    finally:
+        writer.close()
+
+    return written
@@ -1,5 +0,0 @@
-from .batch import batch
-from .dataset import dataset
-from .feature import feature
-from .ontology import ontology
-from .projects import project
@@ -1,8 +1,18 @@
+import itertools
 import sys
+import time
 
 import click
 from labelbox import Client
 
+from .. import metrics
+from ..bulk import bulk_options, read_ids, run_bulk
+from ..tasks import DEFAULT_TIMEOUT, wait_for_tasks
+from ..utils import bounded_map, chunked, iter_unique
+
+# Maximum number of data rows Labelbox accepts in a single batch.
+DEFAULT_BATCH_SIZE = 100_000
+
 
 @click.group()
 def batch():
@@ -43,7 +53,29 @@ def get_batch(client: Client, project_id: str, batch_id: str):
     "--file-path",
     "--fp",
     type=click.Path(exists=True),
-    help="Text file that contains global keys separated by newlines.",
+    help="Text file that contains data row ids or global keys separated by newlines.",
+)
+@click.option(
+    "--global-keys",
+    "--gk",
+    "use_global_keys",
+    is_flag=True,
+    default=False,
+    help="Treat given rows as global keys instead of data row ids.",
+)
+@click.option(
+    "--batch-size",
+    default=DEFAULT_BATCH_SIZE,
+    show_default=True,
+    type=click.IntRange(min=1),
+    help="Maximum number of data rows in one batch. Larger inputs are split into name-001, name-002, etc.",
+)
+@click.option(
+    "--workers",
+    default=4,
+    show_default=True,
+    type=click.IntRange(min=1),
+    help="Number of batches created concurrently.",
 )
 @click.pass_obj
 def create_batch(
@@ -53,23 +85,80 @@ def create_batch(
     rows: str,
     priority: int,
     file_path: click.Path,
+    use_global_keys: bool,
+    batch_size: int,
+    workers: int,
 ):
     """
-    Creates a batch for the Benchmark project using global keys.
+    Creates a batch for the Benchmark project using data row ids or global keys.
+    Duplicate rows are dropped and large inputs are split into several batches.
     """
+    started = time.perf_counter()
     project = client.get_project(project_id)
     data_row_ids = []
 
     if rows and rows.strip():
-        data_row_ids = [row.strip() for row in rows.split(",")]
+        data_row_ids = (row.strip() for row in rows.split(",") if row.strip())
 
     if file_path:
-        with open(str(file_path), "r") as f:
-            data_row_ids = [line.strip() for line in f.readlines()]
+        data_row_ids = _read_ids(str(file_path))
+
+    # Batches are produced lazily, so only `workers` of them are held in memory.
+    batches = _name_batches(name, chunked(iter_unique(data_row_ids), batch_size))
+    rows_kwarg = "global_keys" if use_global_keys else "data_rows"
+
+    def create(named_batch):
+        batch_name, ids = named_batch
+        return project.create_batch(name=batch_name, priority=priority, **{rows_kwarg: ids})  # type: ignore
+
+    created = failed = 0
+    for (batch_name, ids), batch, error in bounded_map(create, batches, workers):
+        if error is not None:
+            failed += 1
+            metrics.inc("batches_failed_total")
+            click.echo(
+                f"Failed to create batch {batch_name} ({len(ids)} rows): {error}"
+            )
+        else:
+            created += 1
+            metrics.inc("batches_created_total")
+            metrics.inc("batch_rows_total", len(ids))
+            click.echo(
+                f"New batch has been created. Name: {batch_name}, rows: {len(ids)}, ID: {batch.uid}"
+            )
+
+    if created + failed == 0:
+        click.echo("No data rows were given.")
+        sys.exit(1)
+
+    elapsed = time.perf_counter() - started
+    click.echo(f"Created {created} of {created + failed} batches in {elapsed:.1f}s.")
+    sys.exit(1 if failed else 0)
 
-    batch = project.create_batch(name=name, data_rows=data_row_ids, priority=priority)  # type: ignore
-    click.echo(f"New batch has been created. ID: {batch.uid}")
-    sys.exit(0)
+
+def _read_ids(file_path: str):
+    with open(file_path, "r") as f:
+        for line in f:
+            if line := line.strip():
+                yield line
+
+
+def _name_batches(name: str, chunks):
+    """
+    Keeps given name when everything fits into one batch,
+    otherwise numbers batches as name-001, name-002, etc.
+    """
+    first = next(chunks, None)
+    if first is None:
+        return
+
+    second = next(chunks, None)
+    if second is None:
+        yield name, first
+        return
+
+    for index, chunk in enumerate(itertools.chain([first, second], chunks), 1):
+        yield f"{name}-{index:03d}", chunk
 
 
 @batch.command("create-from-dataset")
@@ -89,9 +178,21 @@ def create_batch(
 @click.option(
     "--priority", "--p", default=5, help="Batch priority.", show_default=True, type=int
 )
+@click.option(
+    "--timeout",
+    default=DEFAULT_TIMEOUT,
+    show_default=True,
+    type=click.IntRange(min=1),
+    help="Seconds to wait for Labelbox tasks to finish.",
+)
 @click.pass_obj
 def create_batch_from_dataset(
-    client: Client, project_id: str, name_prefix: str, dataset_id: str, priority: int
+    client: Client,
+    project_id: str,
+    name_prefix: str,
+    dataset_id: str,
+    priority: int,
+    timeout: int,
 ):
     """
     Creates batch from the dataset. Default batch priority is 5.
@@ -99,29 +200,45 @@ def create_batch_from_dataset(
     """
     project = client.get_project(project_id)
     batch_task = project.create_batches_from_dataset(name_prefix, dataset_id, priority)
-    batch_task.wait_till_done()
+    wait_for_tasks([batch_task], timeout)
 
     if err := batch_task.errors():
         click.echo(f"There were errors while creating batch: {err}")
         sys.exit(1)
 
+    batches = batch_task.result()
+    metrics.inc("batches_created_total", len(batches))
+    metrics.inc("batch_rows_total", sum(batch.size or 0 for batch in batches))
+
     click.echo("New batch(es) has been created.")
-    click.echo(batch_task.result())
+    click.echo(batches)
     sys.exit(0)
 
 
 @batch.command("delete")
 @click.argument("project_id", nargs=1)
-@click.argument("batch_id", nargs=1)
+@click.argument("batch_ids", nargs=-1)
+@bulk_options
 @click.pass_obj
-def delete_batch(client: Client, project_id: str, batch_id: str):
+def delete_batch(
+    client: Client,
+    project_id: str,
+    batch_ids: tuple,
+    from_file: str,
+    workers: int,
+    rate: float,
+):
     """
-    Deletes batch by Project and Batch ID.
+    Deletes batch by Project and Batch ID. Accepts many Batch IDs at once.
     """
-    batch = client.get_batch(project_id, batch_id)
-    batch.delete()
-    click.echo(f"Batch with ID {batch_id} has been deleted.")
-    sys.exit(0)
+
+    def delete(batch_id: str):
+        batch = client.get_batch(project_id, batch_id)
+        batch.delete()
+        return f"Batch with ID {batch_id} has been deleted."
+
+    failed = run_bulk(delete, read_ids(batch_ids, from_file), workers, rate)
+    sys.exit(1 if failed else 0)
 
 
 @batch.command("delete-labels")
@@ -0,0 +1,54 @@
+import sys
+
+import click
+
+from ..client import LazyClient
+from ..metadata import metadata_cache
+from ..upload import upload_cache
+
+CACHES = {
+    "metadata": metadata_cache,
+    "uploads": upload_cache,
+}
+
+
+@click.group()
+def cache():
+    """
+    Commands for managing local caches of the active profile.
+    """
+    pass
+
+
+@cache.command("stats")
+@click.pass_obj
+def cache_stats(client: LazyClient):
+    """
+    Prints number of entries and size of the local caches.
+    """
+    for name, get_cache in CACHES.items():
+        stats = get_cache(client.profile["name"]).stats()
+        click.echo(
+            f"{name}: {stats['entries']} entries, "
+            f"{stats['bytes'] / 1024:.1f} KB in {stats['directory']}"
+        )
+    sys.exit(0)
+
+
+@cache.command("clear")
+@click.option(
+    "--only",
+    type=click.Choice(list(CACHES)),
+    default=None,
+    help="Clears only the given cache. By default all caches are cleared.",
+)
+@click.pass_obj
+def clear_cache(client: LazyClient, only: str):
+    """
+    Removes local caches of the active profile.
+    """
+    for name, get_cache in CACHES.items():
+        if only is None or only == name:
+            get_cache(client.profile["name"]).clear()
+            click.echo(f"Cleared {name} cache.")
+    sys.exit(0)
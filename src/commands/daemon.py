@@ -0,0 +1,202 @@
+import contextlib
+import io
+import os
+import shlex
+import signal
+import socket
+import sys
+from pathlib import Path
+
+import click
+
+from ..remote import DEFAULT_SOCKET, SOCKET_ENV_VAR, recv_message, send_message
+
+# Commands that can't be nested inside an already running shell or daemon.
+_NOT_NESTABLE = ("shell", "serve")
+
+
+def invoke_command(client, args):
+    """
+    Runs one CLI invocation in the current process, reusing the given client.
+    Returns exit code of the command.
+    """
+    from ..main import cli
+
+    try:
+        result = cli.main(args, prog_name="labelbox", obj=client, standalone_mode=False)
+    except click.ClickException as e:
+        e.show()
+        return e.exit_code
+    except click.Abort:
+        click.echo("Aborted!", err=True)
+        return 1
+    except SystemExit as e:
+        if e.code is None or isinstance(e.code, int):
+            return e.code or 0
+        click.echo(e.code, err=True)
+        return 1
+    except Exception as e:
+        # A failing command must not take the warm process down with it.
+        click.echo(f"Error: {e}", err=True)
+        return 1
+
+    return result if isinstance(result, int) else 0
+
+
+def _ensure_client(client):
+    if client is None:
+        from ..client import LazyClient
+        from ..main import CONFIG_FILE
+
+        client = LazyClient(CONFIG_FILE)
+    return client
+
+
+def _check_args(args):
+    if args and args[0] == "labelbox":
+        args = args[1:]
+
+    if args and args[0] in _NOT_NESTABLE:
+        raise ValueError(f"'{args[0]}' cannot be run from the shell or daemon.")
+
+    return args
+
+
+@click.command("shell")
+@click.pass_obj
+def shell(client):
+    """
+    Starts interactive shell that reuses one Client between commands.
+    """
+    client = _ensure_client(client)
+    click.echo("Labelbox shell. Type 'exit' or press Ctrl-D to quit.")
+
+    while True:
+        try:
+            line = input("labelbox> ").strip()
+        except EOFError:
+            click.echo()
+            break
+        except KeyboardInterrupt:
+            click.echo()
+            continue
+
+        if line in ("exit", "quit"):
+            break
+
+        try:
+            args = _check_args(shlex.split(line))
+        except ValueError as e:
+            click.echo(f"Error: {e}", err=True)
+            continue
+
+        if args:
+            invoke_command(client, args)
+
+    sys.exit(0)
+
+
+class _NoStdin(io.TextIOBase):
+    """
+    Stdin of commands that were sent without it. Fails loudly instead of
+    reading from the terminal of the daemon.
+    """
+
+    def readable(self):
+        return True
+
+    def read(self, size=-1):
+        raise OSError("stdin is not forwarded to the daemon. Use - to pass IDs.")
+
+    readline = read
+
+
+@contextlib.contextmanager
+def _client_environment(request):
+    """
+    Runs the command in the working directory of `labelbox-client`
+    with its forwarded stdin, restoring both of the daemon afterwards.
+    """
+    cwd = os.getcwd()
+    stdin = sys.stdin
+    sys.stdin = io.StringIO(request["stdin"]) if "stdin" in request else _NoStdin()
+    try:
+        os.chdir(request.get("cwd") or cwd)
+        yield
+    finally:
+        os.chdir(cwd)
+        sys.stdin = stdin
+
+
+def _handle_connection(client, conn):
+    request = recv_message(conn)
+    output = io.StringIO()
+
+    with contextlib.redirect_stdout(output), contextlib.redirect_stderr(output):
+        try:
+            with _client_environment(request):
+                exit_code = invoke_command(client, _check_args(request["argv"]))
+        except (ValueError, OSError) as e:
+            click.echo(f"Error: {e}", err=True)
+            exit_code = 1
+
+    send_message(conn, {"exit_code": exit_code, "output": output.getvalue()})
+
+
+def _is_socket_alive(path):
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+        try:
+            probe.connect(str(path))
+        except OSError:
+            return False
+    return True
+
+
+@click.command("serve")
+@click.option(
+    "--socket",
+    "socket_path",
+    default=lambda: os.environ.get(SOCKET_ENV_VAR, DEFAULT_SOCKET),
+    type=click.Path(),
+    show_default=DEFAULT_SOCKET,
+    help=f"Unix socket to listen on. Can also be set with {SOCKET_ENV_VAR}.",
+)
+@click.pass_obj
+def serve(client, socket_path: str):
+    """
+    Runs daemon that keeps one warm Client and executes commands
+    forwarded by `labelbox-client` over a Unix socket.
+    Commands are executed one at a time.
+    """
+    client = _ensure_client(client)
+    path = Path(socket_path)
+
+    if path.exists():
+        if _is_socket_alive(path):
+            click.echo(f"Another daemon is already listening on {path}.")
+            sys.exit(1)
+        path.unlink()
+
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(str(path))
+    os.chmod(path, 0o600)
+    server.listen()
+    # Stop on SIGTERM the same way as on Ctrl-C so the socket gets removed.
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+    click.echo(f"Listening on {path}. Press Ctrl-C to stop.")
+
+    try:
+        while True:
+            conn, _ = server.accept()
+            with conn:
+                try:
+                    _handle_connection(client, conn)
+                except (ConnectionError, ValueError) as e:
+                    click.echo(f"Dropped malformed request: {e}", err=True)
+    except KeyboardInterrupt:
+        click.echo("\nStopping daemon.")
+    finally:
+        server.close()
+        path.unlink(missing_ok=True)
+
+    sys.exit(0)
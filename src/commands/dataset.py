@@ -1,5 +1,3 @@
-import csv
-import json
 import sys
 import time
 import uuid
@@ -8,7 +6,13 @@ from pathlib import Path
 import click
 from labelbox import Client, IAMIntegration
 
-from ..utils import read_json_file, write_json_file
+from .. import upload
+from ..bulk import bulk_options, read_ids, run_bulk
+from ..export import COMPRESSIONS, stream_export, transform_options
+from ..journal import UploadJournal
+from ..metadata import MetadataLookup, cache_options, invalidate
+from ..tasks import DEFAULT_TIMEOUT, wait_for_tasks
+from ..utils import chunked, dumps, iter_input_rows, write_json_file
 
 
 @click.group()
@@ -20,15 +24,30 @@ def dataset():
 
 
 @dataset.command("get")
-@click.argument("dataset_id", nargs=1)
+@click.argument("dataset_ids", nargs=-1)
+@bulk_options
+@cache_options
 @click.pass_obj
-def get_dataset_by_id(client: Client, dataset_id: str):
+def get_dataset_by_id(
+    client: Client,
+    dataset_ids: tuple,
+    from_file: str,
+    workers: int,
+    rate: float,
+    use_cache: bool,
+    refresh: bool,
+):
     """
-    Get Dataset by ID.
+    Get Dataset by ID. Accepts many IDs at once.
     """
-    dataset = client.get_dataset(dataset_id)
-    click.echo(dataset)
-    sys.exit(0)
+    lookup = MetadataLookup(client, use_cache, refresh)
+
+    def get(dataset_id: str):
+        return lookup.get("dataset", dataset_id, lambda: client.get_dataset(dataset_id))
+
+    failed = run_bulk(get, read_ids(dataset_ids, from_file), workers, rate)
+    lookup.close()
+    sys.exit(1 if failed else 0)
 
 
 @dataset.command("create")
@@ -51,16 +70,24 @@ def create_new_dataset(client: Client, name: str, desc: str, iam: str):
 
 
 @dataset.command("delete")
-@click.argument("dataset_id", nargs=1)
+@click.argument("dataset_ids", nargs=-1)
+@bulk_options
 @click.pass_obj
-def delete_dataset(client: Client, dataset_id: str):
+def delete_dataset(
+    client: Client, dataset_ids: tuple, from_file: str, workers: int, rate: float
+):
     """
-    Deletes Dataset by ID.
+    Deletes Dataset by ID. Accepts many IDs at once.
     """
-    dataset = client.get_dataset(dataset_id)
-    dataset.delete()
-    click.echo("Dataset has been deleted.")
-    sys.exit(0)
+
+    def delete(dataset_id: str):
+        dataset = client.get_dataset(dataset_id)
+        dataset.delete()
+        invalidate(client, "dataset", dataset_id)
+        return f"Dataset with ID {dataset_id} has been deleted."
+
+    failed = run_bulk(delete, read_ids(dataset_ids, from_file), workers, rate)
+    sys.exit(1 if failed else 0)
 
 
 @dataset.command("append")
@@ -86,6 +113,38 @@ def delete_dataset(client: Client, dataset_id: str):
     type=click.Path(),
     help="Path to the local file for upload.",
 )
+@click.option(
+    "--local-dir",
+    default=None,
+    type=click.Path(exists=True, file_okay=False),
+    help="Uploads all files from the directory, recursively.",
+)
+@click.option(
+    "--glob",
+    "glob_pattern",
+    default="",
+    help='Uploads files matching the pattern. Relative to --local-dir if given, unless absolute. Ex: "images/**/*.jpg".',
+)
+@click.option(
+    "--key-from",
+    default="path",
+    show_default=True,
+    type=click.Choice(upload.KEY_STRATEGIES),
+    help="Global keys for --local-dir and --glob: relative file path or SHA-256 of the file content.",
+)
+@click.option(
+    "--dedup/--no-dedup",
+    default=True,
+    show_default=True,
+    help="Skips local files that have already been uploaded, using a local content hash cache.",
+)
+@click.option(
+    "--cache-max-age",
+    default=upload.DEFAULT_UPLOAD_CACHE_DAYS,
+    show_default=True,
+    type=click.IntRange(min=1),
+    help="Days after which cached uploads are forgotten and files are uploaded again.",
+)
 @click.option(
     "--json",
     "json_file",
@@ -100,6 +159,47 @@ def delete_dataset(client: Client, dataset_id: str):
     type=click.Path(),
     help="Path to the CSV file. For supported format see GitHub page.",
 )
+@click.option(
+    "--ndjson",
+    "ndjson_file",
+    default="",
+    type=click.Path(),
+    help="Path to the NDJSON file with one data row object per line.",
+)
+@click.option(
+    "--chunk-size",
+    default=upload.DEFAULT_CHUNK_SIZE,
+    show_default=True,
+    type=click.IntRange(min=1),
+    help="Number of data rows sent in one upload task.",
+)
+@click.option(
+    "--workers",
+    default=upload.DEFAULT_WORKERS,
+    show_default=True,
+    type=click.IntRange(min=1),
+    help="Number of chunks (and local files) uploaded concurrently.",
+)
+@click.option(
+    "--resume",
+    is_flag=True,
+    default=False,
+    help="Records uploaded chunks in a journal next to the input file and skips them on rerun.",
+)
+@click.option(
+    "--journal",
+    "journal_file",
+    default="",
+    type=click.Path(dir_okay=False),
+    help="Path to the journal used by --resume. Required for --rows input.",
+)
+@click.option(
+    "--timeout",
+    default=DEFAULT_TIMEOUT,
+    show_default=True,
+    type=click.IntRange(min=1),
+    help="Seconds to wait for Labelbox tasks to finish.",
+)
 @click.pass_obj
 def add_data_rows(
     client: Client,
@@ -107,14 +207,43 @@ def add_data_rows(
     rows: str,
     global_keys: str,
     local_file: Path,
+    local_dir: Path,
+    glob_pattern: str,
+    key_from: str,
+    dedup: bool,
+    cache_max_age: int,
     json_file: Path,
     csv_file: Path,
+    ndjson_file: Path,
+    chunk_size: int,
+    workers: int,
+    resume: bool,
+    journal_file: Path,
+    timeout: int,
 ):
     """
     Add data rows to a selected Dataset.
+    Data rows are split into chunks that are uploaded concurrently.
     """
+    journal = None
+
+    if resume:
+        input_file = json_file or csv_file or ndjson_file or local_file or local_dir
+        if not (journal_file or input_file):
+            click.echo("Provide --journal path to resume upload of --rows input.")
+            sys.exit(1)
+
+        journal_path = journal_file or UploadJournal.default_path(input_file)
+        journal = UploadJournal(journal_path, dataset_id, chunk_size)
+        click.echo(f"Using upload journal {journal_path}.")
+
+    def new_key(source, position):
+        # Random keys would never match the journal on rerun.
+        if journal is not None:
+            return journal.row_key(source, position)
+        return str(uuid.uuid4())
+
     dataset = client.get_dataset(dataset_id)
-    upload_task = None
     assets = []
 
     if rows != "":
@@ -122,7 +251,7 @@ def add_data_rows(
         keys = []
 
         if global_keys == "":
-            keys = [str(uuid.uuid4()) for _ in range(len(urls))]
+            keys = [new_key(url, position) for position, url in enumerate(urls)]
         else:
             keys = global_keys.split(",")
 
@@ -132,24 +261,55 @@ def add_data_rows(
         ]
 
     if local_file:
-        file_url = client.upload_file(str(local_file))
+        global_key = global_keys.strip() or new_key(Path(local_file).resolve(), 0)
 
-        if global_keys == "":
-            assets = [{"row_data": file_url, "global_key": str(uuid.uuid4())}]
+        if journal is not None and global_key in journal.committed_keys:
+            click.echo(f"File {local_file} has already been uploaded, skipping.")
         else:
-            assets = [{"row_data": file_url, "global_key": global_keys.strip()}]
+            file_url = client.upload_file(str(local_file))
+            assets = [{"row_data": file_url, "global_key": global_key}]
+
+    file_uploader = None
+    cache = None
+    if local_dir or glob_pattern:
+        if dedup:
+            cache = upload.upload_cache(client.profile["name"], cache_max_age)
+
+        file_uploader = upload.LocalFileUploader(
+            client, workers, key_from, cache=cache, dataset_id=dataset_id
+        )
+        files = upload.iter_local_files(local_dir, glob_pattern)
+        assets = file_uploader.iter_data_rows(files)
+
+    # Files are read lazily, so uploading starts before the whole file is parsed.
+    input_rows = iter_input_rows(json_file, csv_file, ndjson_file)
+    if input_rows is not None:
+        assets = upload.normalize_data_rows(input_rows)
+
+    try:
+        errs = upload.upload_chunks(
+            dataset,
+            chunked(assets, chunk_size),
+            workers,
+            journal,
+            on_commit=file_uploader.commit if file_uploader else None,
+            timeout=timeout,
+        )
+    except ValueError as e:
+        click.echo(f"Invalid input: {e}")
+        sys.exit(1)
 
-    if json_file:
-        assets = read_json_file(json_file)
+    if file_uploader is not None:
+        file_uploader.report()
+        errs = file_uploader.errors + errs
 
-    if csv_file:
-        with open(csv_file, "r") as f:
-            assets = list(csv.DictReader(f))
+    if cache is not None:
+        cache.evict()
 
-    upload_task = dataset.create_data_rows(assets)
-    upload_task.wait_till_done()  # type: ignore
+    # Cached dataset has the old row count.
+    invalidate(client, "dataset", dataset_id)
 
-    if errs := upload_task.errors:  # type: ignore
+    if errs:
         click.echo(errs)
         sys.exit(1)
 
@@ -184,6 +344,33 @@ def add_data_rows(
     show_default=True,
     help="Saves export results into file with the following format: dataset_export_epoch_time.json.",
 )
+@click.option(
+    "--output",
+    "--o",
+    default="",
+    type=click.Path(dir_okay=False, writable=True),
+    help="Streams export results into the given file with bounded memory usage.",
+)
+@click.option(
+    "--compression",
+    type=click.Choice(COMPRESSIONS),
+    default=None,
+    help="Compression for --output. By default inferred from file extension (.gz, .zst).",
+)
+@click.option(
+    "--timeout",
+    default=DEFAULT_TIMEOUT,
+    show_default=True,
+    type=click.IntRange(min=1),
+    help="Seconds to wait for Labelbox tasks to finish.",
+)
+@transform_options
+@click.option(
+    "--pretty",
+    is_flag=True,
+    default=False,
+    help="Indents JSON printed to the console or saved with --save. Compact by default.",
+)
 @click.pass_obj
 def export_dataset(
     client: Client,
@@ -196,6 +383,13 @@ def export_dataset(
     project_ids: str,
     model_run_ids: str,
     save: bool,
+    output: str,
+    compression: str,
+    timeout: int,
+    output_format: str,
+    filters: list,
+    select: list,
+    pretty: bool,
 ):
     """
     Exports dataset's information.
@@ -221,9 +415,29 @@ def export_dataset(
     if len(model_runs) > 0:
         export_params["model_runs_ids"] = model_runs  # type: ignore
 
+    if not output and (output_format or filters or select):
+        raise click.UsageError("--format, --filter and --select require --output.")
+
     dataset = client.get_dataset(dataset_id)
+
+    if output:
+        rows = stream_export(
+            dataset,
+            export_params,
+            output,
+            compression,
+            timeout,
+            output_format=output_format,
+            filters=filters,
+            select=select,
+        )
+        click.echo(
+            f"Dataset {dataset_id} export results ({rows} rows) were saved into {output}."
+        )
+        sys.exit(0)
+
     export_task = dataset.export_v2(params=export_params)  # type: ignore
-    export_task.wait_till_done()
+    wait_for_tasks([export_task], timeout)
 
     if err := export_task.errors:
         click.echo(err)
@@ -231,11 +445,11 @@ def export_dataset(
 
     if save:
         filename = Path.home() / "Desktop" / f"dataset_export_{int(time.time())}.json"
-        write_json_file(filename, export_task.result)
+        write_json_file(filename, export_task.result, pretty=pretty)
         click.echo(f"Dataset's export results were saved into {filename}.")
     else:
         click.echo(f"Dataset {dataset_id} export results:\n")
-        click.echo(json.dumps(export_task.result, indent=2))
+        click.echo(dumps(export_task.result, pretty=pretty))
         sys.exit(1)
 
     sys.exit(0)
@@ -251,5 +465,6 @@ def update_dataset_name(client: Client, dataset_id: str, name: str):
     """
     dataset = client.get_dataset(dataset_id)
     dataset.update(name=name)
+    invalidate(client, "dataset", dataset_id)
     click.echo("Dataset name has been updated.")
     sys.exit(0)
@@ -0,0 +1,124 @@
+import signal
+import sys
+
+import click
+
+from ..fake_server import FakeServer, FakeServerConfig
+
+
+@click.command("fake-server")
+@click.option("--host", default="127.0.0.1", show_default=True, help="Address to bind.")
+@click.option(
+    "--port",
+    default=8765,
+    show_default=True,
+    type=click.IntRange(min=0),
+    help="Port to listen on. 0 picks a free port.",
+)
+@click.option(
+    "--latency",
+    default=0.0,
+    show_default=True,
+    type=click.FloatRange(min=0),
+    help="Seconds added to every request.",
+)
+@click.option(
+    "--jitter",
+    default=0.0,
+    show_default=True,
+    type=click.FloatRange(min=0),
+    help="Random extra latency of up to the given seconds.",
+)
+@click.option(
+    "--bandwidth",
+    default=None,
+    type=click.IntRange(min=1),
+    help="Bytes per second that responses and files are sent with. Unlimited by default.",
+)
+@click.option(
+    "--error-rate",
+    default=0.0,
+    show_default=True,
+    type=click.FloatRange(min=0, max=1),
+    help="Fraction of requests failed with HTTP 500.",
+)
+@click.option(
+    "--rate-limit",
+    default=None,
+    type=click.FloatRange(min=0, min_open=True),
+    help="Requests per second above which requests get 429 responses.",
+)
+@click.option(
+    "--task-seconds",
+    default=0.0,
+    show_default=True,
+    type=click.FloatRange(min=0),
+    help="Seconds that upload, batch and export tasks stay in progress.",
+)
+@click.option(
+    "--export-chunk-size",
+    default=1024 * 1024,
+    show_default=True,
+    type=click.IntRange(min=1),
+    help="Size in bytes of the files export results are streamed in.",
+)
+@click.option(
+    "--populate",
+    default=0,
+    show_default=True,
+    type=click.IntRange(min=0),
+    help="Creates a project and a dataset with the given number of data rows.",
+)
+@click.option(
+    "--seed", default=None, type=int, help="Seed of injected errors and jitter."
+)
+@click.option("--verbose", is_flag=True, default=False, help="Logs every request.")
+def fake_server(
+    host: str,
+    port: int,
+    latency: float,
+    jitter: float,
+    bandwidth: int,
+    error_rate: float,
+    rate_limit: float,
+    task_seconds: float,
+    export_chunk_size: int,
+    populate: int,
+    seed: int,
+    verbose: bool,
+):
+    """
+    Runs local in-memory stand-in for the Labelbox API, so commands can be
+    tested and benchmarked without a workspace. Only operations used by the
+    CLI are emulated.
+    """
+    config = FakeServerConfig(
+        latency=latency,
+        jitter=jitter,
+        bandwidth=bandwidth,
+        error_rate=error_rate,
+        rate_limit=rate_limit,
+        task_seconds=task_seconds,
+        export_chunk_bytes=export_chunk_size,
+        seed=seed,
+    )
+    server = FakeServer(host, port, config, verbose)
+
+    if populate:
+        project, dataset = server.fake.populate(populate)
+        click.echo(f"Project: {project['id']}")
+        click.echo(f"Dataset: {dataset['id']} ({populate} data rows)")
+
+    click.echo(f"Fake Labelbox API listening on {server.url}. Press Ctrl-C to stop.")
+    click.echo(f"Profile endpoint: {server.url}/graphql")
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        stats = ", ".join(f"{k}: {v}" for k, v in server.stats.items())
+        click.echo(f"\nStopping fake server ({stats}).")
+    finally:
+        server.server_close()
+
+    sys.exit(0)
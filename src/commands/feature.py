@@ -3,6 +3,10 @@ import sys
 import click
 from labelbox import Classification, Client, Option, Tool
 
+from ..bulk import bulk_options, read_ids, run_bulk
+from ..index import load_index
+from ..metadata import MetadataLookup, cache_options, invalidate
+
 
 @click.group()
 def feature():
@@ -14,38 +18,89 @@ def feature():
 
 @feature.command("get")
 @click.argument("feature_schema_id", nargs=1)
+@cache_options
 @click.pass_obj
-def get_feature_by_id(client: Client, feature_schema_id: str):
+def get_feature_by_id(
+    client: Client, feature_schema_id: str, use_cache: bool, refresh: bool
+):
     """
     Get Feature by ID (featureSchemaId).
     """
-    feature = client.get_feature_schema(feature_schema_id)
+    lookup = MetadataLookup(client, use_cache, refresh)
+    feature = lookup.get(
+        "feature",
+        feature_schema_id,
+        lambda: client.get_feature_schema(feature_schema_id),
+    )
+    lookup.close()
     click.echo(feature)
     sys.exit(0)
 
 
 @feature.command("get-by-name")
 @click.argument("feature_name", nargs=1)
+@click.option(
+    "--index",
+    "use_index",
+    is_flag=True,
+    default=False,
+    help="Resolves exact name to ID with the local index built by `labelbox index sync`.",
+)
+@cache_options
 @click.pass_obj
-def get_feature_by_name(client: Client, feature_name: str):
+def get_feature_by_name(
+    client: Client, feature_name: str, use_index: bool, use_cache: bool, refresh: bool
+):
     """
     Get Feature by name.
     """
-    feature = next(client.get_feature_schemas(feature_name))
+    lookup = MetadataLookup(client, use_cache, refresh)
+
+    if use_index:
+        matches = load_index(client, "feature").search(feature_name, "exact")
+        if not matches:
+            click.echo(f"Feature {feature_name} not found in the local index.")
+            sys.exit(1)
+
+        feature_schema_id = matches[0]["uid"]
+        feature = lookup.get(
+            "feature",
+            feature_schema_id,
+            lambda: client.get_feature_schema(feature_schema_id),
+        )
+    else:
+        feature = lookup.get_by_name(
+            "feature",
+            feature_name,
+            lambda: next(client.get_feature_schemas(feature_name)),
+        )
+    lookup.close()
     click.echo(feature)
     sys.exit(0)
 
 
 @feature.command("delete")
-@click.argument("feature_schema_id", nargs=1)
+@click.argument("feature_schema_ids", nargs=-1)
+@bulk_options
 @click.pass_obj
-def delete_feature_schema(client: Client, feature_schema_id: str):
+def delete_feature_schema(
+    client: Client,
+    feature_schema_ids: tuple,
+    from_file: str,
+    workers: int,
+    rate: float,
+):
     """
-    Deletes ununsed feature schema by ID (featureSchemaId).
+    Deletes ununsed feature schema by ID (featureSchemaId). Accepts many IDs at once.
     """
-    client.delete_unused_feature_schema(feature_schema_id)
-    click.echo(f"Feature with ID {feature_schema_id} has been deleted.")
-    sys.exit(0)
+
+    def delete(feature_schema_id: str):
+        client.delete_unused_feature_schema(feature_schema_id)
+        invalidate(client, "feature", feature_schema_id)
+        return f"Feature with ID {feature_schema_id} has been deleted."
+
+    failed = run_bulk(delete, read_ids(feature_schema_ids, from_file), workers, rate)
+    sys.exit(1 if failed else 0)
 
 
 @feature.command("create-tool")
@@ -0,0 +1,80 @@
+import sys
+
+import click
+
+from ..client import LazyClient
+from ..index import INDEX_RESOURCES, MATCH_MODES, load_index, sync_index
+from ..utils import bounded_map, dumps
+
+
+@click.group()
+def index():
+    """
+    Commands for the local name to ID index of projects, ontologies and features.
+    """
+    pass
+
+
+@index.command("sync")
+@click.option(
+    "--only",
+    type=click.Choice(INDEX_RESOURCES),
+    default=None,
+    help="Syncs only the given resource. By default all resources are synced.",
+)
+@click.option(
+    "--full",
+    is_flag=True,
+    default=False,
+    help="Rebuilds the index from scratch instead of fetching only updated projects.",
+)
+@click.pass_obj
+def sync(client: LazyClient, only: str, full: bool):
+    """
+    Pages through projects, ontologies and feature schemas and stores their
+    names and IDs locally. Resources are synced concurrently.
+    """
+    resources = [only] if only else INDEX_RESOURCES
+    failed = False
+
+    results = bounded_map(
+        lambda resource: sync_index(client, resource, full), resources, len(resources)
+    )
+    for resource, result, error in results:
+        if error is not None:
+            click.echo(f"Failed to sync {resource} index: {error}")
+            failed = True
+            continue
+
+        idx, changed = result
+        click.echo(
+            f"Synced {resource} index: {len(idx.entries)} entries, {changed} changed."
+        )
+
+    sys.exit(1 if failed else 0)
+
+
+@index.command("search")
+@click.argument("query", nargs=1)
+@click.option(
+    "--resource",
+    "--r",
+    type=click.Choice(INDEX_RESOURCES),
+    required=True,
+    help="Resource type to search.",
+)
+@click.option(
+    "--match",
+    type=click.Choice(MATCH_MODES),
+    default="substring",
+    show_default=True,
+    help="How the query is matched against names (case-insensitive).",
+)
+@click.pass_obj
+def search(client: LazyClient, query: str, resource: str, match: str):
+    """
+    Searches the local index by name. Prints one JSON object per match.
+    """
+    for entry in load_index(client, resource).search(query, match):
+        click.echo(dumps(entry))
+    sys.exit(0)
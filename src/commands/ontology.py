@@ -1,8 +1,15 @@
 import sys
+from itertools import islice
 
 import click
 from labelbox import Client, MediaType
 
+from ..bulk import DEFAULT_BULK_WORKERS, bulk_options, read_ids, run_bulk
+from ..index import load_index
+from ..metadata import MetadataLookup, cache_options, invalidate
+from ..ontology_spec import OntologyPlan, load_spec
+from ..output import iter_objects, list_options, write_records
+
 
 @click.group()
 def ontology():
@@ -14,12 +21,17 @@ def ontology():
 
 @ontology.command("get")
 @click.argument("ontology_id", nargs=1)
+@cache_options
 @click.pass_obj
-def get_ontology(client: Client, ontology_id: str):
+def get_ontology(client: Client, ontology_id: str, use_cache: bool, refresh: bool):
     """
     Retrieve ontology by ID. Prints result into the console.
     """
-    ontology = client.get_ontology(ontology_id)
+    lookup = MetadataLookup(client, use_cache, refresh)
+    ontology = lookup.get(
+        "ontology", ontology_id, lambda: client.get_ontology(ontology_id)
+    )
+    lookup.close()
     click.echo(ontology)
     sys.exit(0)
 
@@ -28,26 +40,41 @@ def get_ontology(client: Client, ontology_id: str):
 @click.option(
     "--name-contains",
     "--nc",
-    required=True,
-    help="Retrieves list of ontology matched by name.",
+    default="",
+    help="Retrieves list of ontology matched by name. Lists all ontologies if not given.",
+)
+@list_options(default_limit=5)
+@click.option(
+    "--index",
+    "use_index",
+    is_flag=True,
+    default=False,
+    help="Searches the local index built by `labelbox index sync` instead of the API.",
 )
-@click.option("--n", default=5, help="List available ontologies.", show_default=True)
 @click.pass_obj
-def list_ontologies(client: Client, name_contains: str, n: int):
+def list_ontologies(
+    client: Client,
+    name_contains: str,
+    output_format: str,
+    fields: str,
+    page_size: int,
+    limit: int,
+    list_all: bool,
+    use_index: bool,
+):
     """
-    List available ontologies in the workspace. By default print only first 10.
+    List available ontologies in the workspace. By default print only first 5.
     """
-    ontologies = client.get_ontologies(name_contains=name_contains)
-
-    # Apperantly Click for some reasons cannot convert generators into lists
-    # hence this ugly workaround
-    for ontology in ontologies:
-        click.echo(ontology)
+    limit = None if list_all else limit
 
-        n -= 1
-        if n == 0:
-            break
+    if use_index:
+        entries = load_index(client, "ontology").search(name_contains, "substring")
+        ontologies = islice(entries, limit)
+    else:
+        collection = client.get_ontologies(name_contains=name_contains)
+        ontologies = iter_objects(collection, page_size, limit)
 
+    write_records(ontologies, output_format, fields)
     sys.exit(0)
 
 
@@ -96,18 +123,71 @@ def create_ontology(
     sys.exit(0)
 
 
-@ontology.command("delete")
-@click.argument("ontology_id", nargs=1)
+@ontology.command("apply")
+@click.argument("spec_file", type=click.Path(exists=True, dir_okay=False))
+@click.option(
+    "--dry-run",
+    is_flag=True,
+    default=False,
+    help="Prints the plan without creating anything.",
+)
+@click.option(
+    "--workers",
+    default=DEFAULT_BULK_WORKERS,
+    show_default=True,
+    type=click.IntRange(min=1),
+    help="Number of feature schemas looked up and created concurrently.",
+)
 @click.pass_obj
-def delete_ontology(client: Client, ontology_id: str):
+def apply_ontology(client: Client, spec_file: str, dry_run: bool, workers: int):
     """
-    Deletes unused ontology by ID.
+    Creates or updates ontology from YAML or JSON spec.
+    Existing feature schemas with the same name and structure are reused,
+    missing tools and classifications are created concurrently.
     """
-    client.delete_unused_ontology(ontology_id)
-    click.echo(f"Ontology with ID {ontology_id} has been deleted.")
+    spec = load_spec(spec_file)
+    plan = OntologyPlan(client, spec, workers)
+    plan.diff()
+
+    click.echo(f"Ontology {spec['name']}: {plan.ontology_action}")
+    for feature in plan.features:
+        click.echo(f"  {feature}")
+
+    if not dry_run:
+        try:
+            plan.apply()
+        finally:
+            # Features might have been inserted even if assembling failed midway.
+            if plan.ontology is not None:
+                invalidate(client, "ontology", plan.ontology.uid)
+        click.echo(f"Ontology {plan.ontology.uid} is up to date.")
+
+    click.echo("Timings:")
+    for phase, seconds in plan.timings.items():
+        click.echo(f"  {phase}: {seconds:.2f}s")
     sys.exit(0)
 
 
+@ontology.command("delete")
+@click.argument("ontology_ids", nargs=-1)
+@bulk_options
+@click.pass_obj
+def delete_ontology(
+    client: Client, ontology_ids: tuple, from_file: str, workers: int, rate: float
+):
+    """
+    Deletes unused ontology by ID. Accepts many IDs at once.
+    """
+
+    def delete(ontology_id: str):
+        client.delete_unused_ontology(ontology_id)
+        invalidate(client, "ontology", ontology_id)
+        return f"Ontology with ID {ontology_id} has been deleted."
+
+    failed = run_bulk(delete, read_ids(ontology_ids, from_file), workers, rate)
+    sys.exit(1 if failed else 0)
+
+
 @ontology.command("delete-feature")
 @click.argument("ontology_id", nargs=1)
 @click.argument("feature_schema_id", nargs=1)
@@ -124,5 +204,7 @@ def delete_feature_from_ontology(
     it will neither be deleted nor archived.
     """
     client.delete_feature_schema_from_ontology(ontology_id, feature_schema_id)
+    invalidate(client, "ontology", ontology_id)
+    invalidate(client, "feature", feature_schema_id)
     click.echo("Feature schema has been deleted.")
     sys.exit(0)
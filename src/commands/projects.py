@@ -1,12 +1,20 @@
-import json
 import sys
 import time
+from datetime import datetime, timezone
+from itertools import islice
 from pathlib import Path
 
 import click
 from labelbox import Client, MediaType, Project
 
-from ..utils import write_json_file
+from .. import export, metrics
+from ..bulk import bulk_options, read_ids, run_bulk
+from ..incremental import ExportStore, activity_filter
+from ..index import MATCH_MODES, load_index
+from ..metadata import MetadataLookup, cache_options, invalidate
+from ..output import iter_objects, list_options, write_records
+from ..tasks import DEFAULT_TIMEOUT, wait_for_tasks
+from ..utils import dumps, write_json_file
 
 
 @click.group()
@@ -21,43 +29,81 @@ def project():
 @click.option(
     "--match-projects",
     "--p",
-    required=True,
-    help="Match projects with the given name",
+    default="",
+    help="Match projects with the given name. Lists all projects if not given.",
     type=str,
 )
+@list_options(default_limit=10)
 @click.option(
-    "--n", default=10, help="List number of available projects.", show_default=True
+    "--index",
+    "use_index",
+    is_flag=True,
+    default=False,
+    help="Searches the local index built by `labelbox index sync` instead of the API.",
+)
+@click.option(
+    "--match",
+    type=click.Choice(MATCH_MODES),
+    default="exact",
+    show_default=True,
+    help="How names are matched when searching the local index (case-insensitive).",
 )
 @click.pass_obj
-def list_projects(client: Client, match_projects: str, n: int):
+def list_projects(
+    client: Client,
+    match_projects: str,
+    output_format: str,
+    fields: str,
+    page_size: int,
+    limit: int,
+    list_all: bool,
+    use_index: bool,
+    match: str,
+):
     """
     Lists available projects with matching name.
     By default shows only first 10.
     """
-    projects = client.get_projects(where=Project.name == match_projects)
-
-    # Apperantly Click for some reasons cannot convert generators into lists
-    # hence this ugly workaround
-    for project in projects:
-        click.echo(project)
+    limit = None if list_all else limit
 
-        n -= 1
-        if n == 0:
-            break
+    if use_index:
+        # Empty query matches every name as a substring.
+        match = match if match_projects else "substring"
+        entries = load_index(client, "project").search(match_projects, match)
+        projects = islice(entries, limit)
+    else:
+        where = Project.name == match_projects if match_projects else None
+        projects = iter_objects(client.get_projects(where=where), page_size, limit)
 
+    write_records(projects, output_format, fields)
     sys.exit(0)
 
 
 @project.command("get")
-@click.argument("project_id", nargs=1)
+@click.argument("project_ids", nargs=-1)
+@bulk_options
+@cache_options
 @click.pass_obj
-def get_project(client: Client, project_id: str):
+def get_project(
+    client: Client,
+    project_ids: tuple,
+    from_file: str,
+    workers: int,
+    rate: float,
+    use_cache: bool,
+    refresh: bool,
+):
     """
-    Retrieves project by ID.
+    Retrieves project by ID. Accepts many IDs at once.
     """
-    project = client.get_project(project_id)
-    click.echo(project)
-    sys.exit(0)
+    lookup = MetadataLookup(client, use_cache, refresh)
+
+    def get(project_id: str):
+        return lookup.get("project", project_id, lambda: client.get_project(project_id))
+
+    failed = run_bulk(get, read_ids(project_ids, from_file), workers, rate)
+    lookup.close()
+    sys.exit(1 if failed else 0)
 
 
 @project.command("create")
@@ -97,16 +143,24 @@ def create_project(client: Client, name: str, description: str, project_type: st
 
 
 @project.command("delete")
-@click.argument("project_id", nargs=1)
+@click.argument("project_ids", nargs=-1)
+@bulk_options
 @click.pass_obj
-def delete_project(client: Client, project_id: str):
+def delete_project(
+    client: Client, project_ids: tuple, from_file: str, workers: int, rate: float
+):
     """
-    Delete project by ID.
+    Delete project by ID. Accepts many IDs at once.
     """
-    project = client.get_project(project_id)
-    project.delete()
-    click.echo(f"Project with ID {project_id} has been deleted.")
-    sys.exit(0)
+
+    def delete(project_id: str):
+        project = client.get_project(project_id)
+        project.delete()
+        invalidate(client, "project", project_id)
+        return f"Project with ID {project_id} has been deleted."
+
+    failed = run_bulk(delete, read_ids(project_ids, from_file), workers, rate)
+    sys.exit(1 if failed else 0)
 
 
 @project.command("export")
@@ -124,6 +178,45 @@ def delete_project(client: Client, project_id: str):
     show_default=True,
     help="Saves export results into file with the following format: project_export_epoch_time.json.",
 )
+@click.option(
+    "--output",
+    "--o",
+    default="",
+    type=click.Path(dir_okay=False, writable=True),
+    help="Streams export results into the given file with bounded memory usage.",
+)
+@click.option(
+    "--compression",
+    type=click.Choice(export.COMPRESSIONS),
+    default=None,
+    help="Compression for --output. By default inferred from file extension (.gz, .zst).",
+)
+@click.option(
+    "--timeout",
+    default=DEFAULT_TIMEOUT,
+    show_default=True,
+    type=click.IntRange(min=1),
+    help="Seconds to wait for Labelbox tasks to finish.",
+)
+@export.transform_options
+@click.option(
+    "--pretty",
+    is_flag=True,
+    default=False,
+    help="Indents JSON printed to the console or saved with --save. Compact by default.",
+)
+@click.option(
+    "--since",
+    type=click.DateTime(["%Y-%m-%d", "%Y-%m-%dT%H:%M:%S", "%Y-%m-%d %H:%M:%S"]),
+    default=None,
+    help="Exports only data rows with activity (e.g. labels) since the given UTC time.",
+)
+@click.option(
+    "--incremental",
+    is_flag=True,
+    default=False,
+    help="Exports only data rows changed since the last run and merges them into --output (NDJSON).",
+)
 @click.pass_obj
 def export_project(
     client: Client,
@@ -134,6 +227,15 @@ def export_project(
     project_details: bool,
     performance_details: bool,
     save: bool,
+    output: str,
+    compression: str,
+    timeout: int,
+    output_format: str,
+    filters: list,
+    select: list,
+    pretty: bool,
+    since: datetime,
+    incremental: bool,
 ):
     """
     Exports project's information.
@@ -145,9 +247,66 @@ def export_project(
         "project_details": project_details,
         "performance_details": performance_details,
     }
+    # Arguments are validated before the project is fetched.
+    if (since or incremental) and not output:
+        raise click.UsageError("--since and --incremental require --output.")
+
+    # Filtered deltas would keep stale versions of rows that stopped matching.
+    full_records = not (filters or select)
+    if incremental and not (
+        full_records and export.infer_format(output, output_format) == "ndjson"
+    ):
+        raise click.UsageError(
+            "--incremental supports only full NDJSON records, without --filter or --select."
+        )
+
+    if not output and (output_format or filters or select):
+        raise click.UsageError("--format, --filter and --select require --output.")
+
     project = client.get_project(project_id)
+
+    if incremental:
+        store = ExportStore(output, client.profile["name"], project_id, compression)
+        if store.watermark is None:
+            # Rows of an output without state can't be trusted, so it is replaced.
+            if since or Path(output).exists():
+                click.echo(f"No export state next to {output}, running full export.")
+            since = None
+        else:
+            # Explicit --since wins over the watermark of the previous run.
+            since = since or store.watermark
+        started = datetime.now(timezone.utc)
+
+        export_filters = activity_filter(since) if since else None
+        export_task = export.run_export(project, export_params, timeout, export_filters)
+        changed, total = store.merge(export.iter_export(export_task), full=not since)
+        store.save(started)
+        metrics.inc("rows_exported_total", changed)
+
+        click.echo(
+            f"Project {project_id} export: {changed} changed rows merged into {output} ({total} rows)."
+        )
+        sys.exit(0)
+
+    if output:
+        rows = export.stream_export(
+            project,
+            export_params,
+            output,
+            compression,
+            timeout,
+            output_format=output_format,
+            filters=filters,
+            select=select,
+            export_filters=activity_filter(since) if since else None,
+        )
+        click.echo(
+            f"Project {project_id} export results ({rows} rows) were saved into {output}."
+        )
+        sys.exit(0)
+
     export_task = project.export_v2(params=export_params)  # type: ignore
-    export_task.wait_till_done()
+    wait_for_tasks([export_task], timeout)
 
     if err := export_task.errors:
         click.echo(err)
@@ -155,11 +314,11 @@ def export_project(
 
     if save:
         filename = Path.home() / "Desktop" / f"project_export_{int(time.time())}.json"
-        write_json_file(filename, export_task.result)
+        write_json_file(filename, export_task.result, pretty=pretty)
         click.echo(f"Project's export results were saved into {filename}.")
     else:
         click.echo(f"Project {project_id} export results:\n")
-        click.echo(json.dumps(export_task.result, indent=2))
+        click.echo(dumps(export_task.result, pretty=pretty))
         sys.exit(1)
 
     sys.exit(0)
@@ -176,6 +335,7 @@ def setup_ontology(client: Client, project_id: str, ontology_id: str):
     project = client.get_project(project_id)
     ontology = client.get_ontology(ontology_id)
     project.setup_editor(ontology)
+    invalidate(client, "project", project_id)
     click.echo(
         f"Ontology with ID {ontology_id} has been connected to Project with ID {project_id}."
     )
@@ -0,0 +1,125 @@
+import sys
+
+import click
+
+from ..client import LazyClient
+from ..snapshot import SNAPSHOT_RESOURCES, Snapshot
+from ..tasks import DEFAULT_TIMEOUT
+from ..utils import bounded_map
+
+DEFAULT_SNAPSHOT_WORKERS = 4
+
+
+@click.command()
+@click.option(
+    "--out",
+    "out_dir",
+    required=True,
+    type=click.Path(file_okay=False, writable=True),
+    help="Directory into which the snapshot is written.",
+)
+@click.option(
+    "--only",
+    type=click.Choice(SNAPSHOT_RESOURCES),
+    multiple=True,
+    help="Snapshots only the given resources. Can be repeated. By default all resources are snapshotted.",
+)
+@click.option(
+    "--incremental",
+    is_flag=True,
+    default=False,
+    help="Skips objects that have not changed since the snapshot recorded in the manifest.",
+)
+@click.option(
+    "--exports/--no-exports",
+    default=True,
+    show_default=True,
+    help="Writes streaming exports of projects and datasets next to their metadata.",
+)
+@click.option(
+    "--workers",
+    "-w",
+    "workers",
+    multiple=True,
+    metavar="[RESOURCE=]N",
+    help=f"Number of objects snapshotted concurrently, for all or one resource. "
+    f'Ex: "-w 8 -w project=2". Defaults to {DEFAULT_SNAPSHOT_WORKERS}.',
+)
+@click.option(
+    "--timeout",
+    default=DEFAULT_TIMEOUT,
+    show_default=True,
+    type=click.IntRange(min=1),
+    help="Seconds to wait for each export task to finish.",
+)
+@click.pass_obj
+def snapshot(
+    client: LazyClient,
+    out_dir: str,
+    only: tuple,
+    incremental: bool,
+    exports: bool,
+    workers: tuple,
+    timeout: int,
+):
+    """
+    Writes snapshot of projects (with batches), datasets and ontologies
+    into a directory with gzipped metadata, exports and manifest.json.
+    """
+    resources = list(only) or SNAPSHOT_RESOURCES
+    resource_workers = _parse_workers(workers)
+    snap = Snapshot(client, out_dir, incremental, exports, timeout)
+
+    def crawl(resource):
+        counts = {"written": 0, "unchanged": 0, "failed": 0}
+        for obj, entry, error in snap.crawl(resource, resource_workers[resource]):
+            counts[entry["status"]] += 1
+            if error is not None:
+                click.echo(
+                    f"Failed to snapshot {resource} {obj.uid}: {error}", err=True
+                )
+        return counts
+
+    # Resources are crawled in parallel, each with its own worker pool.
+    failed = False
+    for resource, counts, error in bounded_map(crawl, resources, len(resources)):
+        if error is not None:
+            click.echo(f"Failed to list {resource}s: {error}", err=True)
+            failed = True
+            continue
+
+        failed = failed or counts["failed"] > 0
+        click.echo(
+            f"{resource}: {counts['written']} written, {counts['unchanged']} unchanged, "
+            f"{counts['failed']} failed in {snap.timings[resource]:.1f}s."
+        )
+
+    snap.write_manifest()
+    click.echo(f"Snapshot has been written into {out_dir}.")
+    sys.exit(1 if failed else 0)
+
+
+def _parse_workers(values):
+    """
+    Parses "N" (all resources) and "RESOURCE=N" values. Per resource values win.
+    """
+    workers = dict.fromkeys(SNAPSHOT_RESOURCES, DEFAULT_SNAPSHOT_WORKERS)
+    per_resource = {}
+
+    for value in values:
+        resource, _, count = value.rpartition("=")
+        if resource and resource not in SNAPSHOT_RESOURCES:
+            raise click.BadParameter(
+                f"Unknown resource {resource!r}.", param_hint="--workers"
+            )
+        if not count.isdigit() or int(count) < 1:
+            raise click.BadParameter(
+                f"Invalid number {count!r}.", param_hint="--workers"
+            )
+
+        if resource:
+            per_resource[resource] = int(count)
+        else:
+            workers = dict.fromkeys(SNAPSHOT_RESOURCES, int(count))
+
+    return {**workers, **per_resource}
@@ -0,0 +1,250 @@
+import csv
+import gzip
+import io
+from pathlib import Path
+
+import click
+
+from . import metrics
+from .tasks import DEFAULT_TIMEOUT, wait_for_tasks
+from .transform import parse_filter, parse_select, transform
+from .utils import dumps
+
+COMPRESSIONS = ["none", "gzip", "zstd"]
+EXPORT_FORMATS = ["ndjson", "csv", "parquet", "arrow"]
+
+_SUFFIX_COMPRESSIONS = {".gz": "gzip", ".zst": "zstd"}
+_SUFFIX_FORMATS = {
+    ".csv": "csv",
+    ".parquet": "parquet",
+    ".arrow": "arrow",
+    ".feather": "arrow",
+}
+
+
+def _parse_filters(ctx, param, value):
+    return [parse_filter(expression) for expression in value]
+
+
+def _parse_select(ctx, param, value):
+    return parse_select(value)
+
+
+def transform_options(command):
+    """
+    Adds options for post-processing streamed export records.
+    Expressions are parsed with the options, so `filters` is a list of
+    predicates and `select` a list of (column, keys) pairs.
+    """
+    options = [
+        click.option(
+            "--format",
+            "output_format",
+            type=click.Choice(EXPORT_FORMATS),
+            default=None,
+            help="Format of --output. By default inferred from file extension (.csv, .parquet, .arrow), otherwise NDJSON.",
+        ),
+        click.option(
+            "--filter",
+            "filters",
+            multiple=True,
+            callback=_parse_filters,
+            help='Keeps only records matching the expression: "path=value", "path!=value", "path~text" or "path". '
+            'Paths are dot separated, "*" matches any key. Can be repeated.',
+        ),
+        click.option(
+            "--select",
+            default="",
+            callback=_parse_select,
+            help='Comma separated paths written into --output. Ex: "data_row.id,data_row.external_id".',
+        ),
+    ]
+    for option in reversed(options):
+        command = option(command)
+    return command
+
+
+def infer_compression(file_path, compression=None):
+    """
+    Returns requested compression or guesses it from the file suffix.
+    """
+    if compression:
+        return compression
+    return _SUFFIX_COMPRESSIONS.get(Path(file_path).suffix.lower(), "none")
+
+
+def infer_format(file_path, output_format=None):
+    """
+    Returns requested output format or guesses it from the file suffixes.
+    """
+    if output_format:
+        return output_format
+    for suffix in Path(file_path).suffixes:
+        if suffix.lower() in _SUFFIX_FORMATS:
+            return _SUFFIX_FORMATS[suffix.lower()]
+    return "ndjson"
+
+
+def open_input(file_path, compression="none"):
+    """
+    Opens text file written by `open_output` for reading.
+    """
+    if compression == "gzip":
+        return gzip.open(file_path, "rt", encoding="utf-8")
+
+    if compression == "zstd":
+        import zstandard
+
+        raw = zstandard.ZstdDecompressor().stream_reader(open(file_path, "rb"))
+        return io.TextIOWrapper(raw, encoding="utf-8")
+
+    return open(file_path, "r", encoding="utf-8")
+
+
+def open_output(file_path, compression="none"):
+    """
+    Opens text file for writing, compressing its content on the fly.
+    """
+    if compression == "gzip":
+        return gzip.open(file_path, "wt", encoding="utf-8")
+
+    if compression == "zstd":
+        try:
+            import zstandard
+        except ImportError:
+            raise click.UsageError(
+                "zstd compression requires zstandard package: pip install zstandard"
+            )
+
+        raw = zstandard.ZstdCompressor().stream_writer(open(file_path, "wb"))
+        return io.TextIOWrapper(raw, encoding="utf-8")
+
+    return open(file_path, "w", encoding="utf-8")
+
+
+def iter_export(export_task, errors=False):
+    """
+    Yields records of the finished streamable export task one by one.
+    Yields export errors instead of results when `errors` is set.
+    """
+    from labelbox import StreamType
+
+    if errors:
+        stream_type, has_data = StreamType.ERRORS, export_task.has_errors()
+    else:
+        stream_type, has_data = StreamType.RESULT, export_task.has_result()
+
+    if not has_data:
+        return
+
+    for output in export_task.get_buffered_stream(stream_type=stream_type):
+        yield output.json
+
+
+def write_ndjson(records, file_path, compression="none"):
+    """
+    Writes records as NDJSON one line at a time. Returns number of written records.
+    """
+    written = 0
+    with open_output(file_path, compression) as f:
+        for record in records:
+            f.write(dumps(record))
+            f.write("\n")
+            written += 1
+    return written
+
+
+def _csv_value(value):
+    if value is None:
+        return ""
+    if isinstance(value, (dict, list)):
+        return dumps(value)
+    return value
+
+
+def write_csv(records, file_path, compression="none"):
+    """
+    Writes records as CSV. Columns are taken from the first record and
+    a later record with other keys aborts the export, as they can't be added
+    to the written header. Nested values are written as JSON.
+    Returns number of written records.
+    """
+    written = 0
+    with open_output(file_path, compression) as f:
+        writer = None
+        for record in records:
+            if writer is None:
+                writer = csv.DictWriter(f, fieldnames=list(record))
+                writer.writeheader()
+            extra = [key for key in record if key not in writer.fieldnames]
+            if extra:
+                raise click.ClickException(
+                    f"Record {written + 1} has columns missing from the CSV header "
+                    f"of the first record: {', '.join(map(str, extra))}. "
+                    "Use --select to choose the columns."
+                )
+            writer.writerow({key: _csv_value(value) for key, value in record.items()})
+            written += 1
+    return written
+
+
+def write_export(records, file_path, output_format=None, compression=None):
+    """
+    Writes records in the requested (or inferred) format. Returns number of records.
+    """
+    output_format = infer_format(file_path, output_format)
+
+    if output_format in ("parquet", "arrow"):
+        # numpy and pyarrow are only imported for columnar output.
+        from .columnar import write_columnar
+
+        return write_columnar(records, file_path, output_format, compression)
+
+    compression = infer_compression(file_path, compression)
+    if output_format == "csv":
+        return write_csv(records, file_path, compression)
+    return write_ndjson(records, file_path, compression)
+
+
+def run_export(exportable, export_params, timeout=DEFAULT_TIMEOUT, filters=None):
+    """
+    Starts streamable export of a project or dataset and waits until it's done.
+    Export errors are printed to stderr and abort the command.
+    """
+    if filters:
+        export_task = exportable.export(params=export_params, filters=filters)
+    else:
+        export_task = exportable.export(params=export_params)
+    wait_for_tasks([export_task], timeout)
+
+    if export_task.has_errors():
+        for error in iter_export(export_task, errors=True):
+            click.echo(error, err=True)
+        raise click.ClickException("Export has finished with errors.")
+
+    return export_task
+
+
+def stream_export(
+    exportable,
+    export_params,
+    file_path,
+    compression=None,
+    timeout=DEFAULT_TIMEOUT,
+    output_format=None,
+    filters=(),
+    select=(),
+    export_filters=None,
+):
+    """
+    Runs streamable export of a project or dataset and writes it into the file
+    without holding whole export in memory. Records are filtered and projected
+    one by one on the way. Returns number of written rows.
+    """
+    export_task = run_export(exportable, export_params, timeout, export_filters)
+    records = transform(iter_export(export_task), filters, select)
+    rows = write_export(records, file_path, output_format, compression)
+
+    metrics.inc("rows_exported_total", rows)
+    metrics.inc("export_bytes_total", Path(file_path).stat().st_size)
+    return rows
@@ -0,0 +1,1117 @@
+import email.parser
+import email.policy
+import itertools
+import random
+import re
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+
+from .ratelimit import TokenBucket
+from .utils import dumps, loads
+
+RATE_LIMIT_MESSAGE = "You have exceeded the rate limit of the fake server."
+REST_PREFIX = "/api/v1"
+DATETIME_FORMAT = "%Y-%m-%dT%H:%M:%S.%fZ"
+# Bookkeeping keys of stored records that are never sent to clients.
+INTERNAL_KEYS = {
+    "deleted",
+    "doneAt",
+    "output",
+    "failures",
+    "lineCount",
+    "projectId",
+    "dataRowIds",
+}
+# Time formats accepted by the last activity export filter.
+FILTER_TIME_FORMATS = ["%Y-%m-%dT%H:%M:%S%z", "%Y-%m-%d %H:%M:%S", "%Y-%m-%d"]
+
+# Operation name -> FakeLabelbox method. Filled by the @operation decorator.
+OPERATIONS = {}
+# (HTTP method, path regex, FakeLabelbox method) of REST endpoints. Filled by @route.
+ROUTES = []
+
+_OPERATION_NAME = re.compile(r"^\s*(?:query|mutation)\s+(\w+)")
+_WHERE = re.compile(r"where:\s*\{([^}]*)\}")
+_WHERE_ITEM = re.compile(r"(\w+?)(_gte|_lte|_gt|_lt|_contains)?:\s*\$(\w+)")
+_CREATED_TASK_ID = re.compile(r"createdTasks\(where:\s*\{id:\s*\$(\w+)")
+_SKIP_FIRST = re.compile(r"skip:\s*(\d+)\s+first:\s*(\d+)")
+_FILTER_OPS = {
+    None: lambda value, wanted: value == wanted,
+    "_gte": lambda value, wanted: value is not None and value >= wanted,
+    "_lte": lambda value, wanted: value is not None and value <= wanted,
+    "_gt": lambda value, wanted: value is not None and value > wanted,
+    "_lt": lambda value, wanted: value is not None and value < wanted,
+    "_contains": lambda value, wanted: wanted.lower() in (value or "").lower(),
+}
+
+
+def operation(*names):
+    def register(method):
+        for name in names:
+            OPERATIONS[name] = method
+        return method
+
+    return register
+
+
+def route(method, pattern):
+    def register(handler):
+        ROUTES.append((method, re.compile(f"^{pattern}$"), handler))
+        return handler
+
+    return register
+
+
+def _now():
+    return datetime.now(timezone.utc).strftime(DATETIME_FORMAT)
+
+
+def _new_id():
+    return uuid.uuid4().hex[:25]
+
+
+class GraphQLError(Exception):
+    def __init__(self, message, code="INTERNAL_SERVER_ERROR"):
+        super().__init__(message)
+        self.code = code
+
+
+def _public(data):
+    if isinstance(data, dict):
+        return {k: _public(v) for k, v in data.items() if k not in INTERNAL_KEYS}
+    if isinstance(data, list):
+        return [_public(item) for item in data]
+    return data
+
+
+def _parse_time(value, formats=(DATETIME_FORMAT,)):
+    for time_format in formats:
+        try:
+            parsed = datetime.strptime(value, time_format)
+        except ValueError:
+            continue
+        return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+    raise GraphQLError(f"Invalid time: {value}", "BAD_USER_INPUT")
+
+
+def _spec(payload):
+    """
+    Returns data row upsert payload as the spec of a failed import.
+    """
+    return {
+        "externalId": payload.get("external_id"),
+        "globalKey": payload.get("global_key"),
+        "rowData": payload.get("row_data"),
+        "metadata": payload.get("metadata_fields") or [],
+        "attachments": payload.get("attachments") or [],
+    }
+
+
+def _not_found(resource, uid):
+    return GraphQLError(f"{resource} {uid} not found", "RESOURCE_NOT_FOUND")
+
+
+def _page(items, variables):
+    """
+    Returns cursor paginated page of items. Cursors are offsets.
+    """
+    start = int(variables.get("from") or 0)
+    end = start + int(variables.get("first") or 100)
+    return items[start:end], str(end) if end < len(items) else None
+
+
+def _assign_schema_ids(node):
+    """
+    Gives the ontology node and its nested classifications and options
+    feature schema and schema node IDs, like the API does on upsert.
+    """
+    node.setdefault("featureSchemaId", _new_id())
+    node.setdefault("schemaNodeId", _new_id())
+    for child in node.get("classifications", []) + node.get("options", []):
+        _assign_schema_ids(child)
+    return node
+
+
+class FakeServerConfig:
+    """
+    Behaviour of the fake server. Latency is added to every request,
+    bandwidth (bytes per second) limits how fast responses and files are sent.
+    `error_rate` of requests fail with HTTP 500 and requests above `rate_limit`
+    per second get 429 responses, like the real API does.
+    """
+
+    def __init__(
+        self,
+        latency=0.0,
+        jitter=0.0,
+        bandwidth=None,
+        error_rate=0.0,
+        rate_limit=None,
+        task_seconds=0.0,
+        export_chunk_bytes=1024 * 1024,
+        seed=None,
+    ):
+        self.latency = latency
+        self.jitter = jitter
+        self.bandwidth = bandwidth
+        self.error_rate = error_rate
+        self.rate_limit = rate_limit
+        self.task_seconds = task_seconds
+        self.export_chunk_bytes = export_chunk_bytes
+        self.seed = seed
+
+
+class FakeLabelbox:
+    """
+    In-memory workspace answering the GraphQL operations and REST endpoints
+    used by the CLI: projects, datasets, data row upserts, batches, ontologies,
+    feature schemas, tasks and streamed exports. Objects are kept as GraphQL
+    (camelCase) records.
+    """
+
+    def __init__(self, base_url, task_seconds=0.0, export_chunk_bytes=1024 * 1024):
+        self.base_url = base_url
+        self.task_seconds = task_seconds
+        self.export_chunk_bytes = export_chunk_bytes
+        self.user = {"id": _new_id(), "email": "fake@labelbox.local"}
+        self.projects = {}
+        self.datasets = {}
+        self.data_rows = {}
+        # Global key -> data row ID. Keys are unique in the workspace.
+        self.global_keys = {}
+        self.batches = {}
+        self.ontologies = {}
+        self.feature_schemas = {}
+        self.tasks = {}
+        self.files = {}
+        self._lock = threading.RLock()
+
+    # Helpers
+
+    def add_file(self, content, suffix=""):
+        file_id = _new_id() + suffix
+        with self._lock:
+            self.files[file_id] = content
+        return f"{self.base_url}/files/{file_id}"
+
+    def read_file(self, url):
+        file_id = urlparse(url).path.rsplit("/", 1)[-1]
+        if file_id not in self.files:
+            raise GraphQLError(f"File {url} not found", "RESOURCE_NOT_FOUND")
+        return self.files[file_id]
+
+    def add_project(self, name, media_type="IMAGE", description=""):
+        now = _now()
+        project = {
+            "id": _new_id(),
+            "name": name,
+            "description": description,
+            "allowedMediaType": media_type,
+            "autoAuditNumberOfLabels": 1,
+            "autoAuditPercentage": 1.0,
+            "createdAt": now,
+            "updatedAt": now,
+            "lastActivityTime": now,
+            "dataRowCount": 0,
+            "editorTaskType": None,
+            "isBenchmarkEnabled": False,
+            "isConsensusEnabled": False,
+            "modelSetupComplete": False,
+            "setupComplete": None,
+            "uploadType": None,
+            "deleted": False,
+        }
+        with self._lock:
+            self.projects[project["id"]] = project
+        return project
+
+    def add_dataset(self, name, description=""):
+        now = _now()
+        dataset = {
+            "id": _new_id(),
+            "name": name,
+            "description": description,
+            "createdAt": now,
+            "updatedAt": now,
+            "rowCount": 0,
+            "deleted": False,
+        }
+        with self._lock:
+            self.datasets[dataset["id"]] = dataset
+        return dataset
+
+    def add_data_row(self, dataset_id, spec):
+        now = _now()
+        data_row = {
+            "id": _new_id(),
+            "datasetId": dataset_id,
+            "rowData": spec.get("row_data"),
+            "globalKey": spec.get("global_key"),
+            "externalId": spec.get("external_id"),
+            "metadata": spec.get("metadata_fields") or [],
+            "createdAt": now,
+            "lastActivityAt": now,
+        }
+        with self._lock:
+            self.data_rows[data_row["id"]] = data_row
+            if data_row["globalKey"]:
+                self.global_keys[data_row["globalKey"]] = data_row["id"]
+            self.datasets[dataset_id]["rowCount"] += 1
+            self.datasets[dataset_id]["updatedAt"] = now
+        return data_row
+
+    def update_data_row(self, data_row_id, **changes):
+        """
+        Changes fields (GraphQL names) of the data row like an edit or a new
+        label would, so it is picked up by exports filtered by last activity.
+        """
+        with self._lock:
+            data_row = self.data_rows[data_row_id]
+            data_row.update(changes, lastActivityAt=_now())
+        return data_row
+
+    def project_batches(self, project_id):
+        """
+        Returns batches of the project, with IDs of their data rows.
+        """
+        self._project(project_id)
+        return [b for b in self.batches.values() if b["projectId"] == project_id]
+
+    def _global_key_owner(self, global_key):
+        data_row = self.data_rows.get(self.global_keys.get(global_key))
+        if data_row is None or self.datasets[data_row["datasetId"]]["deleted"]:
+            return None
+        return data_row["id"]
+
+    def add_task(self, name, task_type, result=None):
+        now = _now()
+        task = {
+            "id": _new_id(),
+            "name": name,
+            "type": task_type,
+            "status": "IN_PROGRESS",
+            "completionPercentage": 0.0,
+            "createdAt": now,
+            "updatedAt": now,
+            "result": None,
+            "errors": None,
+            "metadata": None,
+            "doneAt": time.monotonic() + self.task_seconds,
+            "output": result,
+        }
+        with self._lock:
+            self.tasks[task["id"]] = task
+        return self._task(task["id"])
+
+    def populate(self, rows):
+        """
+        Creates a dataset with `rows` data rows and a project with all of them
+        in one batch. Returns (project, dataset).
+        """
+        dataset = self.add_dataset("fake-dataset")
+        for index in range(rows):
+            spec = {
+                "row_data": f"https://storage.labelbox.local/{index}.jpg",
+                "global_key": f"fake-{dataset['id']}-{index}",
+                "external_id": f"{index}.jpg",
+            }
+            self.add_data_row(dataset["id"], spec)
+
+        project = self.add_project("fake-project")
+        self.create_batches(
+            "",
+            {
+                "projectId": project["id"],
+                "input": {"batchNamePrefix": "fake", "datasetId": dataset["id"]},
+            },
+        )
+        return project, dataset
+
+    def _task(self, task_id):
+        task = self.tasks.get(task_id)
+        if task is None:
+            raise _not_found("Task", task_id)
+        if task["status"] == "IN_PROGRESS" and time.monotonic() >= task["doneAt"]:
+            task.update(status="COMPLETE", completionPercentage=1.0, updatedAt=_now())
+        return task
+
+    def _project(self, project_id):
+        project = self.projects.get(project_id)
+        if project is None or project["deleted"]:
+            raise _not_found("Project", project_id)
+        return project
+
+    def _dataset(self, dataset_id):
+        dataset = self.datasets.get(dataset_id)
+        if dataset is None or dataset["deleted"]:
+            raise _not_found("Dataset", dataset_id)
+        return dataset
+
+    def _ontology(self, ontology_id):
+        ontology = self.ontologies.get(ontology_id)
+        if ontology is None or ontology["deleted"]:
+            raise _not_found("Ontology", ontology_id)
+        return ontology
+
+    def _feature_schema(self, feature_schema_id):
+        feature_schema = self.feature_schemas.get(feature_schema_id)
+        if feature_schema is None or feature_schema["deleted"]:
+            raise _not_found("Feature schema", feature_schema_id)
+        return feature_schema
+
+    def execute(self, query, variables):
+        match = _OPERATION_NAME.match(query or "")
+        name = match.group(1) if match else None
+        handler = OPERATIONS.get(name)
+        if handler is None:
+            raise GraphQLError(
+                f"Operation {name} is not supported by the fake server.",
+                "GRAPHQL_VALIDATION_FAILED",
+            )
+        with self._lock:
+            return _public(handler(self, query, variables or {}))
+
+    def rest(self, method, path, body):
+        """
+        Answers REST request to the path below `/api/v1`.
+        Returns (HTTP status, JSON payload or None).
+        """
+        for route_method, pattern, handler in ROUTES:
+            match = pattern.match(path)
+            if route_method == method and match:
+                with self._lock:
+                    try:
+                        return handler(self, body, *match.groups())
+                    except GraphQLError as e:
+                        return 404, {"message": str(e)}
+        return 404, {"message": f"{method} {path} is not supported by the fake server."}
+
+    # Projects and datasets
+
+    def _list(self, records, query, variables):
+        where = _WHERE.search(query)
+        items = [record for record in records.values() if not record["deleted"]]
+
+        for field, op, param in _WHERE_ITEM.findall(where.group(1) if where else ""):
+            if field != "deleted":
+                wanted = variables[param]
+                items = [i for i in items if _FILTER_OPS[op or None](i[field], wanted)]
+
+        skip, first = map(int, _SKIP_FIRST.search(query).groups())
+        return items[skip : skip + first]
+
+    @operation("GetProjectPyApi")
+    def get_project(self, query, variables):
+        return {"project": self._project(variables["param_0"])}
+
+    @operation("GetProjectsPyApi")
+    def get_projects(self, query, variables):
+        return {"projects": self._list(self.projects, query, variables)}
+
+    @operation("CreateProjectPyApi")
+    def create_project(self, query, variables):
+        project = self.add_project(
+            variables["name"],
+            variables.get("allowedMediaType") or "IMAGE",
+            variables.get("description") or "",
+        )
+        return {"createProject": project}
+
+    @operation("deleteProjectPyApi")
+    def delete_project(self, query, variables):
+        project = self._project(variables["ProjectId"])
+        project["deleted"] = True
+        return {"updateProject": {"id": project["id"]}}
+
+    @operation("GetDatasetPyApi")
+    def get_dataset(self, query, variables):
+        return {"dataset": self._dataset(variables["param_0"])}
+
+    @operation("GetDatasetsPyApi")
+    def get_datasets(self, query, variables):
+        return {"datasets": self._list(self.datasets, query, variables)}
+
+    @operation("CreateDatasetPyApi")
+    def create_dataset(self, query, variables):
+        dataset = self.add_dataset(
+            variables["name"], variables.get("description") or ""
+        )
+        return {"createDataset": dataset}
+
+    @operation("updateDatasetPyApi")
+    def update_dataset(self, query, variables):
+        dataset = self._dataset(variables["DatasetId"])
+        if "name" in variables:
+            dataset.update(name=variables["name"], updatedAt=_now())
+        return {"updateDataset": dataset}
+
+    @operation("deleteDatasetPyApi")
+    def delete_dataset(self, query, variables):
+        dataset = self._dataset(variables["DatasetId"])
+        dataset["deleted"] = True
+        return {"updateDataset": {"id": dataset["id"]}}
+
+    # Data rows and tasks
+
+    @operation("UploadFile")
+    def upload_file(self, query, variables):
+        url = self.add_file(variables["file"])
+        return {"uploadFile": {"url": url, "filename": url.rsplit("/", 1)[-1]}}
+
+    @operation("UpsertDataRowsPyApi")
+    def upsert_data_rows(self, query, variables):
+        manifest = loads(self.read_file(variables["manifestUri"]))
+        created, failed = [], []
+        for chunk_uri in manifest["chunk_uris"]:
+            for item in loads(self.read_file(chunk_uri)):
+                payload = item["payload"]
+                dataset = self._dataset(payload["dataset_id"])
+                global_key = payload.get("global_key")
+                # Like the real API, rows reusing a global key fail one by one.
+                if global_key and self._global_key_owner(global_key):
+                    message = f"Duplicate global key: '{global_key}'"
+                    failed.append({"message": message, "spec": _spec(payload)})
+                    continue
+                created.append(self.add_data_row(dataset["id"], payload))
+
+        task = self.add_task("Upsert data rows", "adv-upsert-data-rows", created)
+        task["failures"] = failed
+        return {"upsertDataRows": task}
+
+    @operation("CurrentUserPyApi")
+    def get_current_user(self, query, variables):
+        # Asked by the SDK for exports filtered by last activity.
+        return {"user": {"id": self.user["id"], "timezone": "UTC"}}
+
+    @operation("GetUserPyApi")
+    def get_user(self, query, variables):
+        now = _now()
+        return {
+            "user": {
+                **self.user,
+                "createdAt": now,
+                "updatedAt": now,
+                "isExternalUser": False,
+                "isViewer": False,
+                "lastLoginAt": now,
+                "nickname": "fake",
+                "name": "Fake User",
+                "picture": None,
+            }
+        }
+
+    @operation("GetOrganizationPyApi")
+    def get_organization(self, query, variables):
+        now = _now()
+        organization = {"id": _new_id(), "name": "Fake", "createdAt": now}
+        return {"organization": {**organization, "updatedAt": now}}
+
+    @operation("getAllIntegrationsPyApi")
+    def get_iam_integrations(self, query, variables):
+        # No delegated access, so datasets are created without a signer.
+        return {"iamIntegrations": []}
+
+    @operation("GetUserCreatedTasksPyApi")
+    def get_created_tasks(self, query, variables):
+        # Task ID variable is named differently by the SDK methods using this query.
+        task_id = variables[_CREATED_TASK_ID.search(query).group(1)]
+        return {"user": {"createdTasks": [self._task(task_id)]}}
+
+    @operation("SuccessesfulDataRowImportsPyApi")
+    def successful_imports(self, query, variables):
+        task = self._task(variables["taskId"])
+        start = int(variables.get("from") or 0)
+        end = start + int(variables.get("first") or 100)
+        rows = task["output"] or []
+        return {
+            "successesfulDataRowImports": {
+                "nodes": rows[start:end],
+                "after": str(end) if end < len(rows) else None,
+                "total": len(rows),
+            }
+        }
+
+    @operation("FailedDataRowImportsPyApi")
+    def failed_imports(self, query, variables):
+        task = self._task(variables["taskId"])
+        start = int(variables.get("from") or 0)
+        end = start + int(variables.get("first") or 100)
+        rows = task.get("failures") or []
+        return {
+            "failedDataRowImports": {
+                "results": rows[start:end],
+                "after": str(end) if end < len(rows) else None,
+                "total": len(rows),
+            }
+        }
+
+    # Batches
+
+    def _add_batch(self, project, name):
+        if any(
+            batch["projectId"] == project["id"] and batch["name"] == name
+            for batch in self.batches.values()
+        ):
+            raise GraphQLError(f"Batch with name {name} already exists.", "CONFLICT")
+
+        now = _now()
+        batch = {
+            "id": _new_id(),
+            "projectId": project["id"],
+            "name": name,
+            "size": 0,
+            "dataRowIds": [],
+            "consensusSettingsJson": None,
+            "createdAt": now,
+            "updatedAt": now,
+        }
+        self.batches[batch["id"]] = batch
+        return batch
+
+    def _add_to_batch(self, batch, data_row_ids):
+        batch["dataRowIds"].extend(data_row_ids)
+        batch["size"] += len(data_row_ids)
+        project = self.projects[batch["projectId"]]
+        project.update(
+            dataRowCount=project["dataRowCount"] + len(data_row_ids),
+            lastActivityTime=_now(),
+        )
+
+    def _resolve_data_rows(self, spec):
+        """
+        Returns (found data row IDs, IDs or global keys that were not found)
+        of the batch input.
+        """
+        if spec.get("dataRowIds"):
+            wanted = spec["dataRowIds"]
+            found = {uid for uid in wanted if uid in self.data_rows}
+            return [uid for uid in wanted if uid in found], [
+                uid for uid in wanted if uid not in found
+            ]
+
+        keys = spec.get("globalKeys") or []
+        owners = {key: self._global_key_owner(key) for key in keys}
+        return [owners[key] for key in keys if owners[key]], [
+            key for key in keys if not owners[key]
+        ]
+
+    @operation("CheckAllDataRowsHaveBeenProcessedPyApi")
+    def check_data_rows_processed(self, query, variables):
+        # Data rows are processed as soon as their upsert task is created.
+        processed = {"allDataRowsHaveBeenProcessed": True}
+        return {"queryAllDataRowsHaveBeenProcessed": processed}
+
+    @operation("createBatchV2PyApi")
+    def create_batch(self, query, variables):
+        project = self._project(variables["projectId"])
+        spec = variables["batchInput"]
+        data_row_ids, failed = self._resolve_data_rows(spec)
+        batch = self._add_batch(project, spec["name"])
+        self._add_to_batch(batch, data_row_ids)
+        created = {"batch": batch, "failedDataRowIds": failed}
+        return {"project": {"createBatchV2": created}}
+
+    @operation("createEmptyBatchPyApi")
+    def create_empty_batch(self, query, variables):
+        project = self._project(variables["projectId"])
+        batch = self._add_batch(project, variables["input"]["name"])
+        return {"project": {"createEmptyBatch": {"id": batch["id"]}}}
+
+    @operation("addDataRowsToBatchAsyncPyApi")
+    def add_data_rows_to_batch(self, query, variables):
+        spec = variables["input"]
+        batch = self.batches.get(spec["batchId"])
+        if batch is None or batch["projectId"] != variables["projectId"]:
+            raise _not_found("Batch", spec["batchId"])
+
+        data_row_ids, _ = self._resolve_data_rows(spec)
+        self._add_to_batch(batch, data_row_ids)
+        task = self.add_task("Add data rows to batch", "add-data-rows-to-batch")
+        return {"project": {"addDataRowsToBatchAsync": {"taskId": task["id"]}}}
+
+    @operation("createBatchesFromDatasetPyApi")
+    def create_batches(self, query, variables):
+        project = self._project(variables["projectId"])
+        spec = variables["input"]
+        dataset = self._dataset(spec["datasetId"])
+        batch = self._add_batch(project, f"{spec['batchNamePrefix']}_{dataset['name']}")
+        self._add_to_batch(
+            batch,
+            [
+                data_row["id"]
+                for data_row in self.data_rows.values()
+                if data_row["datasetId"] == dataset["id"]
+            ],
+        )
+
+        task = self.add_task("Create batches", "create-batches-from-dataset")
+        tasks = [{"batchUuid": batch["id"], "taskId": task["id"]}]
+        return {"project": {"createBatchesFromDataset": {"tasks": tasks}}}
+
+    @operation("getProjectBatchPyApi")
+    def get_batch(self, query, variables):
+        batches = [
+            batch
+            for batch in self.project_batches(variables["projectId"])
+            if batch["id"] == variables["batchId"]
+        ]
+        if not batches:
+            raise _not_found("Batch", variables["batchId"])
+        return {"project": {"batches": {"nodes": batches}}}
+
+    @operation("GetProjectBatchesPyApi")
+    def get_batches(self, query, variables):
+        batches = self.project_batches(variables["projectId"])
+        nodes, cursor = _page(batches, variables)
+        return {
+            "project": {
+                "id": variables["projectId"],
+                "batches": {"nodes": nodes, "pageInfo": {"endCursor": cursor}},
+            }
+        }
+
+    @operation("DeleteBatchPyApi")
+    def delete_batch(self, query, variables):
+        self.get_batch(query, variables)
+        del self.batches[variables["batchId"]]
+        deleted = {"deletedBatchId": variables["batchId"]}
+        return {"project": {"deleteBatch": deleted}}
+
+    # Ontologies and feature schemas
+
+    def add_feature_schema(self, normalized):
+        normalized = _assign_schema_ids(dict(normalized))
+        feature_schema = {
+            "id": normalized["featureSchemaId"],
+            "name": normalized.get("name") or normalized.get("instructions"),
+            "normalized": normalized,
+            "deleted": False,
+        }
+        self.feature_schemas[feature_schema["id"]] = feature_schema
+        return feature_schema
+
+    def _search(self, records, variables):
+        search = (variables.get("search") or "").lower()
+        return [
+            record
+            for record in records.values()
+            if not record["deleted"] and search in (record["name"] or "").lower()
+        ]
+
+    @operation("rootSchemaNodesPyApi")
+    def get_feature_schemas(self, query, variables):
+        nodes, cursor = _page(self._search(self.feature_schemas, variables), variables)
+        return {"rootSchemaNodes": {"nodes": nodes, "nextCursor": cursor}}
+
+    @operation("rootSchemaNodePyApi")
+    def get_feature_schema(self, query, variables):
+        where = variables["rootSchemaNodeWhere"]
+        return {"rootSchemaNode": self._feature_schema(where["featureSchemaId"])}
+
+    @operation("upsertRootSchemaNodePyApi")
+    def upsert_schema_node(self, query, variables):
+        # The SDK sends feature schema and ontology upserts under the same name.
+        if "upsertOntology" in query:
+            return self.upsert_ontology(query, variables)
+
+        normalized = loads(variables["data"]["normalized"])
+        existing = self.feature_schemas.get(normalized.get("featureSchemaId"))
+        if existing is not None:
+            existing.update(name=normalized.get("name"), normalized=normalized)
+            return {"upsertRootSchemaNode": existing}
+        return {"upsertRootSchemaNode": self.add_feature_schema(normalized)}
+
+    def _count_schemas(self, ontology):
+        normalized = ontology["normalized"]
+        now = _now()
+        ontology.update(
+            objectSchemaCount=len(normalized["tools"]),
+            classificationSchemaCount=len(normalized["classifications"]),
+            updatedAt=now,
+        )
+
+    def upsert_ontology(self, query, variables):
+        data = variables["data"]
+        normalized = loads(data["normalized"])
+        nodes = {"tools": [], "classifications": []}
+        for kind in nodes:
+            for node in normalized.get(kind, []):
+                if node.get("featureSchemaId") not in self.feature_schemas:
+                    node = self.add_feature_schema(node)["normalized"]
+                nodes[kind].append(node)
+
+        now = _now()
+        ontology = {
+            "id": _new_id(),
+            "name": data["name"],
+            "description": None,
+            "mediaType": data.get("mediaType") or "UNKNOWN",
+            "normalized": nodes,
+            "createdAt": now,
+            "deleted": False,
+        }
+        self._count_schemas(ontology)
+        self.ontologies[ontology["id"]] = ontology
+        return {"upsertOntology": ontology}
+
+    @operation("getOntologiesPyApi")
+    def get_ontologies(self, query, variables):
+        nodes, cursor = _page(self._search(self.ontologies, variables), variables)
+        return {"ontologies": {"nodes": nodes, "nextCursor": cursor}}
+
+    @operation("GetOntologyPyApi")
+    def get_ontology(self, query, variables):
+        return {"ontology": self._ontology(variables["param_0"])}
+
+    @route("POST", r"/ontologies/(\w+)/feature-schemas/(\w+)")
+    def insert_feature_schema(self, body, ontology_id, feature_schema_id):
+        ontology = self._ontology(ontology_id)
+        node = self._feature_schema(feature_schema_id)["normalized"]
+        kind = "tools" if "tool" in node else "classifications"
+        nodes = [
+            existing
+            for existing in ontology["normalized"][kind]
+            if existing["featureSchemaId"] != feature_schema_id
+        ]
+        nodes.insert(int(loads(body or b"{}").get("position", len(nodes))), node)
+        ontology["normalized"][kind] = nodes
+        self._count_schemas(ontology)
+        return 201, None
+
+    @route("DELETE", r"/ontologies/(\w+)/feature-schemas/(\w+)")
+    def remove_feature_schema(self, body, ontology_id, feature_schema_id):
+        ontology = self._ontology(ontology_id)
+        normalized = ontology["normalized"]
+        for kind in ("tools", "classifications"):
+            normalized[kind] = [
+                node
+                for node in normalized[kind]
+                if node["featureSchemaId"] != feature_schema_id
+            ]
+        self._count_schemas(ontology)
+        return 200, {"archived": False, "deleted": True}
+
+    @route("DELETE", r"/ontologies/(\w+)")
+    def delete_ontology(self, body, ontology_id):
+        self._ontology(ontology_id)["deleted"] = True
+        return 204, None
+
+    @route("DELETE", r"/feature-schemas/(\w+)")
+    def delete_feature_schema(self, body, feature_schema_id):
+        feature_schema = self._feature_schema(feature_schema_id)
+        for ontology in self.ontologies.values():
+            nodes = (
+                ontology["normalized"]["tools"]
+                + ontology["normalized"]["classifications"]
+            )
+            if not ontology["deleted"] and any(
+                node["featureSchemaId"] == feature_schema_id for node in nodes
+            ):
+                return 400, {"message": "Feature schema is used by an ontology."}
+
+        feature_schema["deleted"] = True
+        return 204, None
+
+    # Exports
+
+    def _export_record(self, data_row, project=None):
+        record = {
+            "data_row": {
+                "id": data_row["id"],
+                "global_key": data_row["globalKey"],
+                "external_id": data_row["externalId"],
+                "row_data": data_row["rowData"],
+                "details": {
+                    "dataset_id": data_row["datasetId"],
+                    "dataset_name": self.datasets[data_row["datasetId"]]["name"],
+                    "created_at": data_row["createdAt"],
+                },
+            },
+            "media_attributes": {},
+            "metadata_fields": data_row["metadata"],
+            "attachments": [],
+        }
+        if project is not None:
+            record["projects"] = {
+                project["id"]: {
+                    "name": project["name"],
+                    "labels": [],
+                    "project_details": {"workflow_status": "TO_LABEL"},
+                }
+            }
+        return record
+
+    def _export(self, name, records):
+        lines = [dumps(record) + "\n" for record in records]
+        task = self.add_task(name, "export-data-rows", "".join(lines).encode("utf-8"))
+        task["lineCount"] = len(lines)
+        return {"taskId": task["id"], "isStreamable": True}
+
+    def _active(self, data_row, query_filters):
+        """
+        Checks the data row against `data_row_last_activity_at` export filters.
+        """
+        last_activity = _parse_time(data_row["lastActivityAt"])
+        for query_filter in query_filters:
+            if query_filter["type"] != "data_row_last_activity_at":
+                continue
+
+            operator = query_filter["value"]["operator"]
+            value = query_filter["value"]["value"]
+            if operator == "BETWEEN":
+                start, end = value["min"], value["max"]
+            elif operator == "GREATER_THAN_OR_EQUAL":
+                start, end = value, None
+            else:
+                start, end = None, value
+
+            if start and last_activity < _parse_time(start, FILTER_TIME_FORMATS):
+                return False
+            if end and last_activity > _parse_time(end, FILTER_TIME_FORMATS):
+                return False
+        return True
+
+    @operation("exportDataRowsInProjectPyApi")
+    def export_project(self, query, variables):
+        filters = variables["input"]["filters"]
+        project = self._project(filters["projectId"])
+        data_row_ids = itertools.chain.from_iterable(
+            batch["dataRowIds"] for batch in self.project_batches(project["id"])
+        )
+        query_filters = filters["searchQuery"]["query"]
+        records = [
+            self._export_record(self.data_rows[data_row_id], project)
+            for data_row_id in dict.fromkeys(data_row_ids)
+            if data_row_id in self.data_rows
+            and self._active(self.data_rows[data_row_id], query_filters)
+        ]
+        return {"exportDataRowsInProject": self._export("Export project", records)}
+
+    @operation("exportDataRowsInCatalogPyApi")
+    def export_dataset(self, query, variables):
+        query_filters = variables["input"]["filters"]["searchQuery"]["query"]
+        dataset_ids = {
+            dataset_id
+            for query_filter in query_filters
+            if query_filter["type"] == "dataset"
+            for dataset_id in query_filter["ids"]
+        }
+        records = [
+            self._export_record(data_row)
+            for data_row in self.data_rows.values()
+            if data_row["datasetId"] in dataset_ids
+            and self._active(data_row, query_filters)
+        ]
+        return {"exportDataRowsInCatalog": self._export("Export dataset", records)}
+
+    @operation("GetExportMetadataHeaderPyApi")
+    def export_header(self, query, variables):
+        task = self._task(variables["where"]["id"])
+        content = task["output"] if variables["streamType"] == "RESULT" else b""
+        header = (
+            {"totalSize": len(content), "totalLines": task.get("lineCount", 0)}
+            if content
+            else None
+        )
+        return {"task": {"exportMetadataHeader": header}}
+
+    @operation("GetExportFileFromOffsetPyApi")
+    def export_file(self, query, variables):
+        task = self._task(variables["where"]["id"])
+        content = task["output"]
+        start = int(variables["offset"])
+
+        # Chunks always end at a line boundary, like the real export stream files.
+        end = content.find(b"\n", start + self.export_chunk_bytes - 1)
+        end = len(content) - 1 if end == -1 else end
+        first_line = content.count(b"\n", 0, start)
+        last_line = first_line + content.count(b"\n", start, end + 1) - 1
+
+        return {
+            "task": {
+                "exportFileFromOffset": {
+                    "offsets": {"start": str(start), "end": str(end)},
+                    "lines": {"start": str(first_line), "end": str(last_line)},
+                    "file": self.add_file(content[start : end + 1], ".ndjson"),
+                }
+            }
+        }
+
+
+def _parse_multipart(content_type, body):
+    """
+    Returns form fields of multipart request body as {name: bytes}.
+    """
+    message = email.parser.BytesParser(policy=email.policy.HTTP).parsebytes(
+        f"Content-Type: {content_type}\r\n\r\n".encode("latin-1") + body
+    )
+    return {
+        part.get_param("name", header="content-disposition"): part.get_payload(
+            decode=True
+        )
+        for part in message.iter_parts()
+    }
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server_version = "FakeLabelbox/1.0"
+    protocol_version = "HTTP/1.1"
+    # Headers and body are written separately on keep-alive connections,
+    # Nagle's algorithm would add ~40ms of delayed ACK to every response.
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def _send(self, status, body, content_type="application/json"):
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+
+        config = self.server.config
+        if config.bandwidth:
+            # Body is written in slices, so clients see a steady transfer rate.
+            slice_size = max(1, int(config.bandwidth / 10))
+            for offset in range(0, len(body), slice_size):
+                self.wfile.write(body[offset : offset + slice_size])
+                time.sleep(min(slice_size, len(body) - offset) / config.bandwidth)
+        else:
+            self.wfile.write(body)
+
+    def _delay(self):
+        config = self.server.config
+        delay = config.latency + self.server.random.uniform(0, config.jitter)
+        if delay > 0:
+            time.sleep(delay)
+
+    def _inject_faults(self):
+        """
+        Applies configured latency and returns True if the API request was
+        answered with an injected error or 429 response.
+        """
+        server = self.server
+        config = server.config
+        server.count("requests")
+        self._delay()
+
+        if server.bucket is not None and not server.bucket.try_acquire():
+            server.count("throttled")
+            self._send(429, dumps({"message": RATE_LIMIT_MESSAGE}))
+            return True
+
+        if config.error_rate and server.random.random() < config.error_rate:
+            server.count("errors")
+            self._send(500, "Injected internal server error", "text/plain")
+            return True
+        return False
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        path = urlparse(self.path).path
+
+        if path.endswith("/graphql") or path.endswith("/_gql"):
+            if not self._inject_faults():
+                self._graphql(body)
+        elif path.startswith(REST_PREFIX):
+            if not self._inject_faults():
+                self._rest("POST", path, body)
+        else:
+            self._send(404, dumps({"message": f"{path} is not supported."}))
+
+    def do_DELETE(self):
+        self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        path = urlparse(self.path).path
+
+        if not path.startswith(REST_PREFIX):
+            self._send(404, dumps({"message": f"{path} is not supported."}))
+        elif not self._inject_faults():
+            self._rest("DELETE", path, b"")
+
+    def _rest(self, method, path, body):
+        status, payload = self.server.fake.rest(method, path[len(REST_PREFIX) :], body)
+        self._send(status, b"" if payload is None else dumps(payload))
+
+    def do_GET(self):
+        path = urlparse(self.path).path
+        file_id = path.rsplit("/", 1)[-1]
+
+        if not path.startswith("/files/") or file_id not in self.server.fake.files:
+            self._send(404, dumps({"message": f"{path} not found."}))
+        else:
+            # Files are served by cloud storage in production, which is not
+            # rate limited together with the API.
+            self._delay()
+            self._send(200, self.server.fake.files[file_id], "application/octet-stream")
+
+    def _graphql(self, body):
+        content_type = self.headers.get("Content-Type", "")
+
+        try:
+            if content_type.startswith("multipart/form-data"):
+                fields = _parse_multipart(content_type, body)
+                request = loads(fields["operations"])
+                # Uploaded files are mapped into variables, as in the GraphQL multipart spec.
+                for key, paths in loads(fields["map"]).items():
+                    for path in paths:
+                        request["variables"][path.split(".", 1)[1]] = fields[key]
+            else:
+                request = loads(body)
+
+            data = self.server.fake.execute(request["query"], request.get("variables"))
+            response = {"data": data}
+        except GraphQLError as e:
+            self.server.count("graphql_errors")
+            response = {
+                "data": None,
+                "errors": [{"message": str(e), "extensions": {"code": e.code}}],
+            }
+
+        self._send(200, dumps(response))
+
+
+class FakeServer(ThreadingHTTPServer):
+    """
+    HTTP server emulating the Labelbox API for local tests and benchmarks.
+    Point profile's `endpoint` at `<url>/graphql` to use it.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, host="127.0.0.1", port=0, config=None, verbose=False):
+        super().__init__((host, port), _Handler)
+        self.config = config or FakeServerConfig()
+        self.verbose = verbose
+        self.random = random.Random(self.config.seed)
+        self.bucket = (
+            TokenBucket(self.config.rate_limit) if self.config.rate_limit else None
+        )
+        self.stats = {"requests": 0, "throttled": 0, "errors": 0, "graphql_errors": 0}
+        self._stats_lock = threading.Lock()
+        self.fake = FakeLabelbox(
+            self.url, self.config.task_seconds, self.config.export_chunk_bytes
+        )
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def count(self, name):
+        with self._stats_lock:
+            self.stats[name] += 1
+
+    def start(self):
+        """
+        Serves requests on a background thread. Returns the server.
+        """
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
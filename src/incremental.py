@@ -0,0 +1,112 @@
+import json
+import os
+import tempfile
+from datetime import datetime, timezone
+from pathlib import Path
+
+import click
+
+from .export import infer_compression, open_input, open_output
+from .utils import dumps, loads
+
+STATE_SUFFIX = ".state"
+# ISO 8601 format accepted by export filters. Times are always sent in UTC.
+FILTER_TIME_FORMAT = "%Y-%m-%dT%H:%M:%S%z"
+
+
+def activity_filter(since):
+    """
+    Returns export filters selecting data rows with activity after `since`.
+    """
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    since = since.astimezone(timezone.utc)
+    return {"last_activity_at": [since.strftime(FILTER_TIME_FORMAT), None]}
+
+
+def _record_id(record):
+    try:
+        return record["data_row"]["id"]
+    except (KeyError, TypeError):
+        raise click.ClickException(
+            "Incremental export requires data_row.id in every exported record."
+        )
+
+
+class ExportStore:
+    """
+    Local NDJSON export of a project that is kept up to date with deltas.
+
+    The watermark (start time of the last successful export) is kept in a state
+    file next to the store, together with the profile and project it belongs to.
+    Merged records replace stored records with the same data row ID.
+    """
+
+    def __init__(self, path, profile_name, project_id, compression=None):
+        self.path = Path(path)
+        self.state_path = Path(str(path) + STATE_SUFFIX)
+        self.profile_name = profile_name
+        self.project_id = project_id
+        self.compression = infer_compression(path, compression)
+        self.watermark = None
+
+        if self.state_path.is_file() and self.path.is_file():
+            with open(self.state_path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+
+            if (state["profile"], state["project_id"]) != (profile_name, project_id):
+                raise click.ClickException(
+                    f"{self.path} stores export of project {state['project_id']} "
+                    f"from profile {state['profile']}."
+                )
+            self.watermark = datetime.fromisoformat(state["watermark"])
+
+    def merge(self, records, full=False):
+        """
+        Merges changed records into the store. Records of a `full` export
+        replace the whole store. Returns number of merged records and total
+        number of records in the store.
+        """
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        changed_ids = set()
+        total = 0
+
+        # Delta is spooled to disk, so only its IDs are kept in memory.
+        with tempfile.TemporaryFile("w+", encoding="utf-8") as delta:
+            for record in records:
+                changed_ids.add(_record_id(record))
+                delta.write(dumps(record))
+                delta.write("\n")
+
+            fd, tmp_path = tempfile.mkstemp(dir=self.path.parent, suffix=".tmp")
+            os.close(fd)
+            try:
+                with open_output(tmp_path, self.compression) as f:
+                    if self.path.is_file() and not full:
+                        with open_input(self.path, self.compression) as store:
+                            for line in store:
+                                if _record_id(loads(line)) not in changed_ids:
+                                    f.write(line)
+                                    total += 1
+
+                    delta.seek(0)
+                    for line in delta:
+                        f.write(line)
+                        total += 1
+
+                os.replace(tmp_path, self.path)
+            except BaseException:
+                Path(tmp_path).unlink(missing_ok=True)
+                raise
+
+        return len(changed_ids), total
+
+    def save(self, watermark):
+        state = {
+            "profile": self.profile_name,
+            "project_id": self.project_id,
+            "watermark": watermark.isoformat(),
+        }
+        with open(self.state_path, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+        self.watermark = watermark
@@ -0,0 +1,170 @@
+import bisect
+import json
+import os
+import tempfile
+from datetime import datetime, timezone
+from pathlib import Path
+
+import click
+
+from .cache import CACHE_DIR
+
+INDEX_RESOURCES = ["project", "ontology", "feature"]
+MATCH_MODES = ["exact", "prefix", "substring"]
+
+
+def _isoformat(value):
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return value.isoformat()
+    return str(value)
+
+
+class NameIndex:
+    """
+    Local name -> ID index of one resource type, stored as a single JSON file.
+
+    Entries are kept in memory as a dict by ID and a sorted list of lower-cased
+    names, so exact and prefix lookups are binary searches and substring
+    lookups are a single scan without any API calls.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.synced_at = None
+        self.watermark = None
+        self.entries = {}
+        self._names = None
+
+        if self.path.is_file():
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            self.synced_at = data.get("synced_at")
+            self.watermark = data.get("watermark")
+            self.entries = data.get("entries", {})
+
+    @classmethod
+    def for_profile(cls, profile_name, resource):
+        return cls(CACHE_DIR / profile_name / "index" / f"{resource}.json")
+
+    @property
+    def exists(self):
+        return self.synced_at is not None
+
+    def update(self, objects, full):
+        """
+        Adds or replaces entries of the given objects. When `full` is set,
+        entries that were not seen are removed (deleted on the server).
+        Returns number of added or changed entries.
+        """
+        seen = set()
+        changed = 0
+
+        for obj in objects:
+            updated_at = _isoformat(getattr(obj, "updated_at", None))
+            entry = {"uid": obj.uid, "name": obj.name, "updated_at": updated_at}
+            seen.add(obj.uid)
+
+            if self.entries.get(obj.uid) != entry:
+                self.entries[obj.uid] = entry
+                changed += 1
+
+            if updated_at and (self.watermark is None or updated_at > self.watermark):
+                self.watermark = updated_at
+
+        if full:
+            for uid in set(self.entries) - seen:
+                del self.entries[uid]
+                changed += 1
+
+        self.synced_at = datetime.now(timezone.utc).isoformat()
+        self._names = None
+        return changed
+
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        data = {
+            "synced_at": self.synced_at,
+            "watermark": self.watermark,
+            "entries": self.entries,
+        }
+
+        fd, tmp_path = tempfile.mkstemp(dir=self.path.parent, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, separators=(",", ":"))
+        os.replace(tmp_path, self.path)
+
+    def _sorted_names(self):
+        if self._names is None:
+            self._names = sorted(
+                (entry["name"].lower(), uid) for uid, entry in self.entries.items()
+            )
+        return self._names
+
+    def search(self, query, match="exact"):
+        """
+        Returns entries whose name matches the query, case-insensitively.
+        """
+        query = query.lower()
+        names = self._sorted_names()
+
+        if match == "substring":
+            uids = [uid for name, uid in names if query in name]
+        else:
+            uids = []
+            for name, uid in names[bisect.bisect_left(names, (query,)) :]:
+                if name == query or (match == "prefix" and name.startswith(query)):
+                    uids.append(uid)
+                else:
+                    break
+
+        return [self.entries[uid] for uid in uids]
+
+
+def iter_resource(client, resource, since=None):
+    """
+    Pages through all objects of the resource. Only projects can be filtered
+    by update time on the server, other resources are always listed fully.
+    """
+    if resource == "project":
+        from labelbox import Project
+
+        if since is not None:
+            since = datetime.fromisoformat(since)
+            return client.get_projects(where=Project.updated_at >= since)
+        return client.get_projects()
+
+    if resource == "ontology":
+        return client.get_ontologies(name_contains="")
+
+    return client.get_feature_schemas("")
+
+
+def sync_index(client, resource, full=False):
+    """
+    Refreshes the local index of the resource. Projects are refreshed
+    incrementally from the last seen `updatedAt` unless `full` is set.
+    Returns the index and number of changed entries.
+    """
+    index = NameIndex.for_profile(client.profile["name"], resource)
+    incremental = resource == "project" and index.exists and not full
+
+    since = index.watermark if incremental else None
+    changed = index.update(iter_resource(client, resource, since), full=not incremental)
+    index.save()
+    return index, changed
+
+
+def load_index(client, resource):
+    """
+    Returns the synced index of the resource. Fails if `index sync` has not been run.
+    """
+    index = NameIndex.for_profile(client.profile["name"], resource)
+    if not index.exists:
+        raise click.ClickException(
+            f"No {resource} index found. Run `labelbox index sync` first."
+        )
+    return index
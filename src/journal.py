@@ -0,0 +1,83 @@
+import json
+import os
+import threading
+import uuid
+from pathlib import Path
+
+JOURNAL_SUFFIX = ".journal"
+
+
+class UploadJournal:
+    """
+    Append-only journal of data row chunks committed by `dataset append --resume`.
+
+    Every line is a JSON object describing one successfully uploaded chunk.
+    On rerun, rows whose global keys have already been committed are skipped.
+    Rows without global keys are skipped when the chunk with the same index
+    and chunk size has been committed.
+    """
+
+    def __init__(self, path, dataset_id, chunk_size):
+        self.path = Path(path)
+        self.dataset_id = dataset_id
+        self.chunk_size = chunk_size
+        self.committed_chunks = set()
+        self.committed_keys = set()
+        self._lock = threading.Lock()
+        self._load()
+
+    @staticmethod
+    def default_path(input_file):
+        return Path(str(input_file) + JOURNAL_SUFFIX)
+
+    def _load(self):
+        if not self.path.is_file():
+            return
+
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    # Last line might be cut off if the previous run was killed.
+                    continue
+
+                if entry.get("dataset_id") != self.dataset_id:
+                    continue
+
+                self.committed_keys.update(entry["global_keys"])
+                if entry["chunk_size"] == self.chunk_size:
+                    self.committed_chunks.add(entry["chunk"])
+
+    def row_key(self, source, position):
+        """
+        Returns deterministic global key for a row given without one, e.g. a URL
+        from --rows, so reruns assign the same key and find it in the journal.
+        """
+        name = f"{self.dataset_id}/{position}/{source}"
+        return str(uuid.uuid5(uuid.NAMESPACE_URL, name))
+
+    def is_committed(self, index, row):
+        if "global_key" in row:
+            return row["global_key"] in self.committed_keys
+        return index in self.committed_chunks
+
+    def pending_rows(self, index, chunk):
+        """
+        Returns rows of the chunk that have not been committed by previous runs.
+        Rows with global keys are matched by key, other rows by chunk index.
+        """
+        return [row for row in chunk if not self.is_committed(index, row)]
+
+    def commit(self, index, chunk):
+        entry = {
+            "dataset_id": self.dataset_id,
+            "chunk": index,
+            "chunk_size": self.chunk_size,
+            "global_keys": [row["global_key"] for row in chunk if "global_key" in row],
+        }
+
+        with self._lock, open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
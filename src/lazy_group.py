@@ -0,0 +1,60 @@
+import importlib
+
+import click
+
+from . import timings
+
+
+class LazyGroup(click.Group):
+    """
+    Click group that registers subcommands by name only and imports
+    their modules (and the Labelbox SDK with them) on first use.
+
+    `lazy_subcommands` maps command name to a tuple of
+    ("package.module:attribute", "short help shown by --help").
+    """
+
+    def __init__(self, *args, lazy_subcommands=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.lazy_subcommands = lazy_subcommands or {}
+
+    def list_commands(self, ctx):
+        return sorted([*super().list_commands(ctx), *self.lazy_subcommands])
+
+    def resolve_command(self, ctx, args):
+        # Full invocation is kept for diagnostics, such as `--timings` output.
+        ctx.meta.setdefault("invocation", " ".join([ctx.command_path, *args]))
+        return super().resolve_command(ctx, args)
+
+    def get_command(self, ctx, cmd_name):
+        if cmd_name in self.lazy_subcommands:
+            return self._load_command(cmd_name)
+        return super().get_command(ctx, cmd_name)
+
+    def format_commands(self, ctx, formatter):
+        # Uses static help strings for lazy subcommands so that `--help`
+        # doesn't import every command module just to print one line.
+        commands = []
+        for name in self.list_commands(ctx):
+            if name in self.lazy_subcommands:
+                commands.append((name, self.lazy_subcommands[name][1]))
+                continue
+
+            cmd = super().get_command(ctx, name)
+            if cmd is not None and not cmd.hidden:
+                commands.append((name, cmd.get_short_help_str()))
+
+        if commands:
+            with formatter.section("Commands"):
+                formatter.write_dl(commands)
+
+    def _load_command(self, cmd_name):
+        import_path, _ = self.lazy_subcommands[cmd_name]
+        module_name, attr_name = import_path.split(":")
+        with timings.span(f"import {module_name}", "import"):
+            command = getattr(importlib.import_module(module_name), attr_name)
+
+        if not isinstance(command, click.Command):
+            raise ValueError(f"Lazy subcommand {import_path} is not a Click command.")
+
+        return command
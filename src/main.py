@@ -2,24 +2,125 @@ from pathlib import Path
 
 import click
 from click import Context
-from labelbox import Client
 
-from .commands import batch, dataset, feature, ontology, project
-from .utils import find_active_profile, read_json_file, write_json_file
+from . import metrics, timings
+from .client import LazyClient
+from .lazy_group import LazyGroup
+from .utils import write_json_file
 
 CONFIG_FILE = Path.home() / ".labelbox-cli.json"
-SUBCOMMANDS = [project, ontology, batch, feature, dataset]
+
+# Subcommand modules import the Labelbox SDK, so they are only loaded
+# when the matching subcommand is actually invoked.
+SUBCOMMANDS = {
+    "project": (
+        "src.commands.projects:project",
+        "Command for interacting with Projects in the workspace.",
+    ),
+    "ontology": (
+        "src.commands.ontology:ontology",
+        "Command for interacting with Ontologies.",
+    ),
+    "batch": (
+        "src.commands.batch:batch",
+        "Command for interacting with batches in the projects.",
+    ),
+    "feature": (
+        "src.commands.feature:feature",
+        "Command for interacting with Features in the workspace.",
+    ),
+    "dataset": (
+        "src.commands.dataset:dataset",
+        "Commands for interacting with Datasets in the workspace.",
+    ),
+    "cache": (
+        "src.commands.cache:cache",
+        "Commands for managing local caches of the active profile.",
+    ),
+    "snapshot": (
+        "src.commands.snapshot:snapshot",
+        "Writes snapshot of projects, datasets and ontologies into a directory.",
+    ),
+    "index": (
+        "src.commands.index:index",
+        "Commands for the local name to ID index of projects, ontologies and features.",
+    ),
+    "fake-server": (
+        "src.commands.fake_server:fake_server",
+        "Runs local stand-in for the Labelbox API for tests and benchmarks.",
+    ),
+    "shell": (
+        "src.commands.daemon:shell",
+        "Starts interactive shell that reuses one Client between commands.",
+    ),
+    "serve": (
+        "src.commands.daemon:serve",
+        "Runs daemon that serves commands forwarded by labelbox-client.",
+    ),
+}
 
 
 # TODO: Add support for multiple profiles
-@click.group()
+@click.group(cls=LazyGroup, lazy_subcommands=SUBCOMMANDS)
+@click.option(
+    "--timings",
+    is_flag=True,
+    default=False,
+    expose_value=False,
+    callback=timings.configure,
+    help="Prints time spent loading config, building the client, in API calls and task waits.",
+)
+@click.option(
+    "--timings-file",
+    default=None,
+    type=click.Path(dir_okay=False, writable=True),
+    expose_value=False,
+    callback=timings.configure,
+    help="Appends timed spans to the file as JSON lines.",
+)
+@click.option(
+    "--profile",
+    "profile_file",
+    default=None,
+    type=click.Path(dir_okay=False, writable=True),
+    expose_value=False,
+    callback=timings.configure,
+    help="Writes cProfile stats into the file, or speedscope profile of the timed spans if the file ends with .json.",
+)
+@click.option(
+    "--metrics-file",
+    default=None,
+    type=click.Path(dir_okay=False, writable=True),
+    expose_value=False,
+    callback=metrics.configure,
+    help="Writes Prometheus metrics into the file every 15 seconds while the command runs (textfile collector).",
+)
+@click.option(
+    "--metrics-port",
+    default=None,
+    type=click.IntRange(min=1, max=65535),
+    expose_value=False,
+    callback=metrics.configure,
+    help="Serves Prometheus metrics on http://127.0.0.1:PORT/metrics while the command runs.",
+)
+@click.option(
+    "--metrics-label",
+    multiple=True,
+    metavar="KEY=VALUE",
+    expose_value=False,
+    callback=metrics.parse_label,
+    help="Adds the label to all metrics, e.g. to tell apart concurrent jobs. Can be repeated.",
+)
 @click.pass_context
 def cli(ctx: Context):
+    if ctx.obj is not None:
+        # Client has been passed in by `labelbox shell` or `labelbox serve`.
+        return
+
     if CONFIG_FILE.is_file():
-        content = read_json_file(CONFIG_FILE)
-        profile = find_active_profile(content)
-        client = Client(api_key=profile["api_key"], endpoint=profile["endpoint"], rest_endpoint=profile["rest_endpoint"])  # type: ignore
-        ctx.obj = client
+        # Client is built on first use, so --help and invalid arguments
+        # never pay for the SDK import or client setup.
+        ctx.obj = LazyClient(CONFIG_FILE)
     else:
         click.echo("Looks like you have not configured any profiles yet.")
         click.echo(
@@ -43,9 +144,5 @@ def cli(ctx: Context):
             }
         }
 
-        write_json_file(CONFIG_FILE, profile)
+        write_json_file(CONFIG_FILE, profile, pretty=True)
         click.echo(f"Configuration saved into: {CONFIG_FILE}")
-
-
-for subcommand in SUBCOMMANDS:
-    cli.add_command(subcommand)
@@ -0,0 +1,119 @@
+import click
+
+from .cache import CACHE_DIR, DiskCache
+
+# Seconds for which cached objects are considered fresh. Ontologies and
+# feature schemas rarely change, projects and datasets do more often.
+METADATA_TTLS = {
+    "project": 60 * 60,
+    "dataset": 60 * 60,
+    "ontology": 24 * 60 * 60,
+    "feature": 24 * 60 * 60,
+}
+DEFAULT_METADATA_CACHE_ENTRIES = 10_000
+
+
+def cache_options(command):
+    """
+    Adds options shared by commands that can read objects from the metadata cache.
+    """
+    options = [
+        click.option(
+            "--cache/--no-cache",
+            "use_cache",
+            default=None,
+            help="Reads objects from the local metadata cache. Enabled for profiles with `metadata_cache` set.",
+        ),
+        click.option(
+            "--refresh",
+            is_flag=True,
+            default=False,
+            help="Fetches objects from the API and updates the local metadata cache.",
+        ),
+    ]
+    for option in reversed(options):
+        command = option(command)
+    return command
+
+
+def metadata_cache(profile_name, ttls=METADATA_TTLS):
+    """
+    Returns cache of printed objects for the profile. Entries older than
+    the longest of the `ttls` are removed on eviction.
+    """
+    return DiskCache(
+        CACHE_DIR / profile_name / "metadata",
+        max_age=max(ttls.values()),
+        max_entries=DEFAULT_METADATA_CACHE_ENTRIES,
+    )
+
+
+class MetadataLookup:
+    """
+    Returns printed objects from the local metadata cache, falling back to the API.
+
+    Entries are keyed by resource and object ID inside the profile's cache
+    directory. Names map to object IDs, so invalidating an object invalidates
+    its name lookups too. TTLs can be overridden per resource with the
+    `metadata_cache_ttl` mapping of the profile.
+    """
+
+    def __init__(self, client, use_cache=None, refresh=False):
+        profile = client.profile
+        if use_cache is None:
+            use_cache = bool(profile.get("metadata_cache"))
+
+        self.ttls = {**METADATA_TTLS, **profile.get("metadata_cache_ttl", {})}
+        self.cache = metadata_cache(profile["name"], self.ttls) if use_cache else None
+        self.refresh = refresh
+        self.updated = False
+
+    def get(self, resource, key, fetch):
+        if self.cache is None:
+            return str(fetch())
+
+        cache_key = f"{resource}:{key}"
+        if not self.refresh:
+            value = self.cache.get(cache_key, max_age=self.ttls[resource])
+            if value is not None:
+                return value
+
+        value = str(fetch())
+        self.cache.set(cache_key, value)
+        self.updated = True
+        return value
+
+    def get_by_name(self, resource, name, fetch):
+        """
+        Same as `get` for objects looked up by name. `fetch` has to return
+        the object, which is cached under its ID.
+        """
+        if self.cache is None:
+            return str(fetch())
+
+        name_key = f"{resource}:name:{name}"
+        if not self.refresh:
+            uid = self.cache.get(name_key, max_age=self.ttls[resource])
+            if uid is not None:
+                value = self.cache.get(f"{resource}:{uid}", max_age=self.ttls[resource])
+                if value is not None:
+                    return value
+
+        obj = fetch()
+        value = str(obj)
+        self.cache.set(f"{resource}:{obj.uid}", value)
+        self.cache.set(name_key, obj.uid)
+        self.updated = True
+        return value
+
+    def close(self):
+        # Eviction scans the cache directory, so it only runs after writes.
+        if self.updated:
+            self.cache.evict()
+
+
+def invalidate(client, resource, key):
+    """
+    Removes deleted or updated object from the metadata cache of the profile.
+    """
+    metadata_cache(client.profile["name"]).delete(f"{resource}:{key}")
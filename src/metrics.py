@@ -0,0 +1,293 @@
+import functools
+import math
+import os
+import tempfile
+import threading
+import time
+from bisect import bisect_left
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import click
+
+PREFIX = "labelbox_cli_"
+WRITE_INTERVAL = 15
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+TASK_WAIT_BUCKETS = (1, 2, 5, 10, 30, 60, 120, 300, 600, 1800, 3600)
+CHUNK_BUCKETS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+
+# Name -> (type, help, histogram buckets).
+METRICS = {
+    "rows_uploaded_total": ("counter", "Data rows uploaded to datasets.", None),
+    "upload_bytes_total": ("counter", "Bytes of uploaded local files.", None),
+    "upload_chunks_failed_total": ("counter", "Data row chunks that failed.", None),
+    "upload_chunk_seconds": (
+        "histogram",
+        "Time to upload one data row chunk, including the task wait.",
+        CHUNK_BUCKETS,
+    ),
+    "rows_exported_total": ("counter", "Exported rows written to files.", None),
+    "export_bytes_total": ("counter", "Bytes of written export files.", None),
+    "batches_created_total": ("counter", "Batches added to projects.", None),
+    "batches_failed_total": ("counter", "Batches that failed to be created.", None),
+    "batch_rows_total": ("counter", "Data rows added to batches.", None),
+    "task_wait_seconds": (
+        "histogram",
+        "Time spent waiting for a Labelbox task to finish.",
+        TASK_WAIT_BUCKETS,
+    ),
+}
+# Counted by the client's Throttle, read when metrics are rendered.
+THROTTLE_METRICS = {
+    "api_calls_total": ("calls", "API requests sent, including retries."),
+    "api_retries_total": ("retries", "API requests retried."),
+    "api_throttled_total": ("throttled", "API requests rejected with 429."),
+}
+
+# Registry of the running command. None when metrics are disabled,
+# so recording costs a single check.
+_registry = None
+
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class Registry:
+    """
+    Counters and histograms of one CLI invocation,
+    rendered in the Prometheus text exposition format.
+    """
+
+    def __init__(self):
+        self.values = {
+            name: Histogram(buckets) if kind == "histogram" else 0
+            for name, (kind, _, buckets) in METRICS.items()
+        }
+        self.started_at = time.time()
+        self.running = True
+        self._lock = threading.Lock()
+
+    def inc(self, name, value=1):
+        with self._lock:
+            self.values[name] += value
+
+    def observe(self, name, value):
+        with self._lock:
+            self.values[name].observe(value)
+
+    def render(self, labels=None, throttle=None):
+        labels = labels or {}
+        lines = []
+
+        def sample(name, value, **extra):
+            pairs = {**labels, **extra}
+            label_str = ",".join(f'{k}="{_escape(v)}"' for k, v in pairs.items())
+            lines.append(f"{PREFIX}{name}{{{label_str}}} {_number(value)}")
+
+        def header(name, kind, help_text):
+            lines.append(f"# HELP {PREFIX}{name} {help_text}")
+            lines.append(f"# TYPE {PREFIX}{name} {kind}")
+
+        header("start_time_seconds", "gauge", "Start time of the command.")
+        sample("start_time_seconds", self.started_at)
+        header("running", "gauge", "Whether the command is still running.")
+        sample("running", int(self.running))
+
+        with self._lock:
+            for name, (kind, help_text, buckets) in METRICS.items():
+                header(name, kind, help_text)
+                value = self.values[name]
+                if kind == "counter":
+                    sample(name, value)
+                    continue
+
+                cumulative = 0
+                for bound, count in zip((*buckets, math.inf), value.counts):
+                    cumulative += count
+                    sample(f"{name}_bucket", cumulative, le=_number(bound))
+                sample(f"{name}_sum", value.sum)
+                sample(f"{name}_count", value.count)
+
+        for name, (attribute, help_text) in THROTTLE_METRICS.items():
+            header(name, "counter", help_text)
+            sample(name, getattr(throttle, attribute, 0))
+
+        return "\n".join(lines) + "\n"
+
+
+def _number(value):
+    if value == math.inf:
+        return "+Inf"
+    if isinstance(value, float) and value.is_integer() and abs(value) < 1e15:
+        return str(int(value))
+    return str(value)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def inc(name, value=1):
+    """
+    Increments the counter of the running command. No-op when metrics are disabled.
+    """
+    if _registry is not None:
+        _registry.inc(name, value)
+
+
+def observe(name, value):
+    """
+    Records value in the histogram of the running command. No-op when metrics are disabled.
+    """
+    if _registry is not None:
+        _registry.observe(name, value)
+
+
+def write_textfile(file_path, content):
+    """
+    Replaces the file atomically, so the node exporter never reads partial output.
+    """
+    path = Path(file_path)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        f.write(content)
+    os.chmod(tmp_path, 0o644)
+    os.replace(tmp_path, path)
+
+
+class _Exporter:
+    """
+    Publishes metrics of the running command into a textfile (rewritten
+    periodically) and/or on a local `/metrics` HTTP endpoint.
+    """
+
+    def __init__(self, ctx, registry, settings):
+        self.ctx = ctx
+        self.registry = registry
+        self.settings = settings
+        self.server = None
+        self._stopped = threading.Event()
+        self._writer = None
+
+    def render(self):
+        command = _command_name(self.ctx)
+        labels = {"command": command, **dict(self.settings.get("metrics_labels", ()))}
+        throttle = getattr(self.ctx.obj, "throttle", None)
+        return self.registry.render(labels, throttle)
+
+    def serve(self, port):
+        exporter = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = exporter.render().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def write(self):
+        write_textfile(self.settings["metrics_file"], self.render())
+
+    def start_writer(self):
+        def loop():
+            while not self._stopped.wait(WRITE_INTERVAL):
+                self.write()
+
+        self._writer = threading.Thread(target=loop, daemon=True)
+        self._writer.start()
+
+    def stop(self):
+        self._stopped.set()
+        self.registry.running = False
+        if "metrics_file" in self.settings:
+            self.write()
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+
+
+def _command_name(ctx):
+    """
+    Returns the invoked subcommand path without arguments, e.g. "dataset append".
+    """
+    words = ctx.meta.get("invocation", "").split()[1:]
+    command = ctx.command
+    names = []
+    for word in words:
+        if not isinstance(command, click.Group):
+            break
+        command = command.get_command(ctx, word)
+        if command is None:
+            break
+        names.append(word)
+    return " ".join(names)
+
+
+def parse_label(ctx, param, value):
+    """
+    Callback of `--metrics-label`. Validates KEY=VALUE pairs.
+    """
+    labels = []
+    for item in value:
+        key, sep, label_value = item.partition("=")
+        if not sep or not key.isidentifier():
+            raise click.BadParameter(f"{item!r} is not KEY=VALUE.")
+        labels.append((key, label_value))
+
+    ctx.meta.setdefault("metrics", {})["metrics_labels"] = labels
+
+
+def configure(ctx, param, value):
+    """
+    Callback of the `--metrics-file` and `--metrics-port` options. Metrics are
+    published while the command runs and written once more when it exits.
+    """
+    global _registry
+    if not value:
+        return
+
+    settings = ctx.meta.setdefault("metrics", {})
+    settings[param.name] = value
+
+    exporter = settings.get("exporter")
+    if exporter is None:
+        _registry = Registry()
+        exporter = settings["exporter"] = _Exporter(ctx, _registry, settings)
+        ctx.call_on_close(functools.partial(_finish, exporter))
+
+    if param.name == "metrics_port":
+        try:
+            exporter.serve(value)
+        except OSError as e:
+            raise click.BadParameter(f"Cannot listen on port {value}: {e}")
+    else:
+        exporter.start_writer()
+
+
+def _finish(exporter):
+    global _registry
+    _registry = None
+    exporter.stop()
@@ -0,0 +1,228 @@
+import time
+from pathlib import Path
+
+import click
+from labelbox import Classification, MediaType, Option, Tool
+
+from .utils import bounded_map, read_json_file
+
+# Tool types are accepted by the names used in `feature create-tool` and by SDK values.
+TOOL_TYPES = {
+    **{tool_type.name.lower(): tool_type for tool_type in Tool.Type},
+    **{tool_type.value: tool_type for tool_type in Tool.Type},
+}
+CLASSIFICATION_TYPES = {
+    classification_type.value: classification_type
+    for classification_type in Classification.Type
+}
+
+
+def load_spec(file_path):
+    """
+    Reads ontology spec from YAML or JSON file. YAML requires PyYAML.
+    """
+    if Path(file_path).suffix.lower() in (".yaml", ".yml"):
+        try:
+            import yaml
+        except ImportError:
+            raise click.UsageError(
+                "YAML specs require PyYAML package: pip install pyyaml"
+            )
+
+        with open(file_path, "r", encoding="utf-8") as f:
+            spec = yaml.safe_load(f)
+    else:
+        spec = read_json_file(file_path)
+
+    if not isinstance(spec, dict) or not spec.get("name"):
+        raise click.UsageError("Ontology spec must be an object with a name.")
+    return spec
+
+
+def _build_option(spec):
+    if not isinstance(spec, dict):
+        return Option(value=str(spec))
+
+    value = spec.get("value") or spec.get("name")
+    return Option(
+        value=value,
+        options=[_build_classification(child) for child in spec.get("options", [])],
+    )
+
+
+def _build_classification(spec):
+    class_type = spec.get("type")
+    if class_type not in CLASSIFICATION_TYPES:
+        raise click.UsageError(
+            f"Classification {spec.get('name')!r} has invalid type {class_type!r}. "
+            f"Valid types: {', '.join(CLASSIFICATION_TYPES)}."
+        )
+
+    return Classification(
+        class_type=CLASSIFICATION_TYPES[class_type],
+        name=spec["name"],
+        required=spec.get("required", False),
+        options=[_build_option(option) for option in spec.get("options", [])],
+    )
+
+
+def _build_tool(spec):
+    tool_type = spec.get("type")
+    if tool_type not in TOOL_TYPES:
+        raise click.UsageError(
+            f"Tool {spec.get('name')!r} has invalid type {tool_type!r}. "
+            f"Valid types: {', '.join(tool_type.name.lower() for tool_type in Tool.Type)}."
+        )
+
+    return Tool(
+        tool=TOOL_TYPES[tool_type],
+        name=spec["name"],
+        required=spec.get("required", False),
+        color=spec.get("color"),
+        classifications=[
+            _build_classification(child) for child in spec.get("classifications", [])
+        ],
+    )
+
+
+def signature(node):
+    """
+    Returns comparable structure of the feature: kind, name and nested features.
+    Works for both `asdict()` output and normalized feature schemas.
+    """
+    kind = node.get("tool") or node.get("type") or ""
+    name = node.get("name") or node.get("value") or ""
+    children = (node.get("classifications") or []) + (node.get("options") or [])
+    return (kind, name, tuple(sorted(signature(child) for child in children)))
+
+
+class PlannedFeature:
+    """
+    Feature of the spec together with the action needed to provision it.
+    """
+
+    def __init__(self, kind, spec, normalized):
+        self.kind = kind
+        self.name = spec["name"]
+        self.normalized = normalized
+        self.feature_schema_id = spec.get("feature_schema_id")
+        self.action = "use" if self.feature_schema_id else None
+
+    def __str__(self):
+        target = self.feature_schema_id or "new"
+        return f"{self.action:<7} {self.kind:<15} {self.name} ({target})"
+
+
+class OntologyPlan:
+    """
+    Plan for provisioning ontology from the spec. Features of the spec are
+    matched by name and structure against existing feature schemas,
+    so only the missing ones are created.
+    """
+
+    def __init__(self, client, spec, workers):
+        self.client = client
+        self.spec = spec
+        self.workers = workers
+        self.timings = {}
+        self.ontology = None
+        self.features = [
+            PlannedFeature("tool", tool, _build_tool(tool).asdict())
+            for tool in spec.get("tools", [])
+        ] + [
+            PlannedFeature(
+                "classification",
+                classification,
+                _build_classification(classification).asdict(),
+            )
+            for classification in spec.get("classifications", [])
+        ]
+
+    def _timed(self, phase, fn, *args):
+        started = time.perf_counter()
+        try:
+            return fn(*args)
+        finally:
+            self.timings[phase] = time.perf_counter() - started
+
+    def _match(self, feature):
+        wanted = signature(feature.normalized)
+        for existing in self.client.get_feature_schemas(feature.name):
+            if signature(existing.normalized) == wanted:
+                return existing.uid
+        return None
+
+    def _find_ontology(self):
+        for ontology in self.client.get_ontologies(name_contains=self.spec["name"]):
+            if ontology.name == self.spec["name"]:
+                return ontology
+        return None
+
+    def _diff(self):
+        pending = [feature for feature in self.features if feature.action is None]
+        results = bounded_map(self._match, pending, self.workers)
+
+        for feature, feature_schema_id, error in results:
+            if error is not None:
+                raise click.ClickException(
+                    f"Failed to look up {feature.kind} {feature.name}: {error}"
+                )
+            feature.feature_schema_id = feature_schema_id
+            feature.action = "reuse" if feature_schema_id else "create"
+
+        self.ontology = self._find_ontology()
+
+    def diff(self):
+        self._timed("diff", self._diff)
+
+    def _create_features(self):
+        pending = [feature for feature in self.features if feature.action == "create"]
+        results = bounded_map(
+            lambda feature: self.client.create_feature_schema(feature.normalized).uid,
+            pending,
+            self.workers,
+        )
+
+        for feature, feature_schema_id, error in results:
+            if error is not None:
+                raise click.ClickException(
+                    f"Failed to create {feature.kind} {feature.name}: {error}"
+                )
+            feature.feature_schema_id = feature_schema_id
+
+    def _ontology_feature_ids(self):
+        normalized = self.ontology.normalized
+        nodes = normalized.get("tools", []) + normalized.get("classifications", [])
+        return {node.get("featureSchemaId") for node in nodes}
+
+    def _assemble(self):
+        feature_schema_ids = [feature.feature_schema_id for feature in self.features]
+
+        if self.ontology is None:
+            media_type = MediaType(self.spec.get("media_type", "image").upper())
+            self.ontology = self.client.create_ontology_from_feature_schemas(
+                self.spec["name"], feature_schema_ids, media_type
+            )
+            return
+
+        # Existing ontology gets missing features appended at the end.
+        present = self._ontology_feature_ids()
+        for feature in self.features:
+            if feature.feature_schema_id not in present:
+                self.client.insert_feature_schema_into_ontology(
+                    feature.feature_schema_id, self.ontology.uid, len(present)
+                )
+                present.add(feature.feature_schema_id)
+
+    def apply(self):
+        self._timed("create features", self._create_features)
+        self._timed("assemble ontology", self._assemble)
+
+    @property
+    def ontology_action(self):
+        if self.ontology is None:
+            return "create"
+
+        present = self._ontology_feature_ids()
+        missing = [f for f in self.features if f.feature_schema_id not in present]
+        return f"update (+{len(missing)} features)" if missing else "unchanged"
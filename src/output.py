@@ -0,0 +1,192 @@
+import csv
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+
+import click
+
+from .utils import dumps
+
+OUTPUT_FORMATS = ["text", "ndjson", "csv", "table"]
+DEFAULT_PAGE_SIZE = 100
+
+
+def list_options(default_limit):
+    """
+    Adds options shared by commands that list objects.
+    """
+
+    def decorator(command):
+        options = [
+            click.option(
+                "--format",
+                "output_format",
+                type=click.Choice(OUTPUT_FORMATS),
+                default="text",
+                show_default=True,
+                help="Output format. ndjson and csv are meant for piping into other tools.",
+            ),
+            click.option(
+                "--fields",
+                default="",
+                help='Comma separated fields included in ndjson, csv and table output. Ex: "uid,name".',
+            ),
+            click.option(
+                "--page-size",
+                default=DEFAULT_PAGE_SIZE,
+                show_default=True,
+                type=click.IntRange(min=1),
+                help="Number of objects fetched from the API in one request.",
+            ),
+            click.option(
+                "--limit",
+                "--n",
+                "limit",
+                default=default_limit,
+                show_default=True,
+                type=click.IntRange(min=1),
+                help="Maximum number of listed objects.",
+            ),
+            click.option(
+                "--all",
+                "list_all",
+                is_flag=True,
+                default=False,
+                help="Lists all objects, ignoring --limit.",
+            ),
+        ]
+        for option in reversed(options):
+            command = option(command)
+        return command
+
+    return decorator
+
+
+def iter_pages(collection, page_size=DEFAULT_PAGE_SIZE):
+    """
+    Yields pages (lists of objects) of the SDK PaginatedCollection,
+    requesting `page_size` objects per API call.
+    """
+    paginator = collection.paginator
+    try:
+        yield from _iter_pages(paginator, page_size)
+    finally:
+        paginator.client.unset_sdk_method()
+
+
+def _iter_pages(paginator, page_size):
+    if hasattr(paginator, "cursor_path"):
+        # Cursor paginated queries take page size as a query parameter.
+        paginator.params["first"] = page_size
+        while True:
+            page, done = paginator.get_next_page()
+            yield page
+            if done:
+                return
+
+    # Offset paginated queries have the SDK page size formatted into the query.
+    skip = 0
+    while True:
+        query = paginator.query % (skip, page_size)
+        results = paginator.client.execute(
+            query, paginator.params, experimental=paginator.experimental
+        )
+        page = paginator.get_page_data(results)
+        yield page
+
+        if len(page) < page_size:
+            return
+        skip += len(page)
+
+
+def prefetch(iterable):
+    """
+    Yields items of the iterable while the next one is already being
+    produced on a background thread.
+    """
+    iterator = iter(iterable)
+    sentinel = object()
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        future = executor.submit(next, iterator, sentinel)
+        while True:
+            item = future.result()
+            if item is sentinel:
+                return
+            future = executor.submit(next, iterator, sentinel)
+            yield item
+
+
+def iter_objects(collection, page_size, limit=None):
+    """
+    Yields up to `limit` objects of the collection, fetching the next page
+    while the current one is being written.
+    """
+    objects = (
+        obj for page in prefetch(iter_pages(collection, page_size)) for obj in page
+    )
+    return islice(objects, limit)
+
+
+def to_record(obj):
+    """
+    Converts SDK object into a dict of its fields.
+    """
+    if isinstance(obj, dict):
+        return obj
+    return {field.name: getattr(obj, field.name) for field in obj.fields()}
+
+
+def _format_value(value):
+    if value is None:
+        return ""
+    if isinstance(value, (dict, list)):
+        return dumps(value)
+    return str(value)
+
+
+def write_records(objects, output_format="text", fields=""):
+    """
+    Streams objects to stdout in the given format. Returns number of written objects.
+    Table column widths are taken from the first row, so output starts immediately.
+    """
+    fields = [field.strip() for field in fields.split(",") if field.strip()]
+    writer = None
+    widths = None
+    count = 0
+
+    for obj in objects:
+        count += 1
+
+        if output_format == "text":
+            click.echo(dumps(obj) if isinstance(obj, dict) else obj)
+            continue
+
+        record = to_record(obj)
+        if fields:
+            record = {field: record.get(field) for field in fields}
+
+        if output_format == "ndjson":
+            click.echo(dumps(record))
+            continue
+
+        if not fields:
+            fields = list(record)
+
+        row = [_format_value(record.get(field)) for field in fields]
+        if output_format == "csv":
+            if writer is None:
+                writer = csv.writer(sys.stdout, lineterminator="\n")
+                writer.writerow(fields)
+            writer.writerow(row)
+            continue
+
+        if widths is None:
+            widths = [
+                max(len(field), len(value), 8) for field, value in zip(fields, row)
+            ]
+            header = [field.upper().ljust(w) for field, w in zip(fields, widths)]
+            click.echo("  ".join(header).rstrip())
+        click.echo("  ".join(value.ljust(w) for value, w in zip(row, widths)).rstrip())
+
+    return count
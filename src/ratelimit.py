@@ -0,0 +1,155 @@
+import functools
+import random
+import threading
+import time
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket allowing `rate` operations per second
+    with bursts of up to `burst` operations.
+    """
+
+    def __init__(self, rate, burst=None):
+        self.rate = rate
+        self.capacity = burst or max(1, rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self):
+        """
+        Blocks until a token is available and takes it.
+        """
+        while True:
+            with self._lock:
+                self._refill()
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+
+            time.sleep(wait)
+
+    def try_acquire(self):
+        """
+        Takes a token if one is available. Never blocks.
+        """
+        with self._lock:
+            self._refill()
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return True
+            return False
+
+
+class AdaptiveConcurrency:
+    """
+    AIMD limit of concurrent requests. The limit grows by one after a full
+    window of healthy responses and is halved on every throttled response.
+    """
+
+    def __init__(self, initial=4, minimum=1, maximum=32):
+        self.limit = min(initial, maximum)
+        self.minimum = minimum
+        self.maximum = maximum
+        self.in_flight = 0
+        self._successes = 0
+        self._condition = threading.Condition()
+
+    def acquire(self):
+        with self._condition:
+            while self.in_flight >= int(self.limit):
+                self._condition.wait()
+            self.in_flight += 1
+
+    def release(self, throttled=False):
+        with self._condition:
+            self.in_flight -= 1
+
+            if throttled:
+                self.limit = max(self.minimum, self.limit / 2)
+                self._successes = 0
+            else:
+                self._successes += 1
+                if self._successes >= self.limit:
+                    self.limit = min(self.maximum, self.limit + 1)
+                    self._successes = 0
+
+            self._condition.notify_all()
+
+
+def is_throttled(error):
+    """
+    Whether the error is a 429 (rate limit) response from the Labelbox API.
+    """
+    if type(error).__name__ == "ApiLimitError":
+        return True
+    response = getattr(error, "response", None)
+    return getattr(response, "status_code", None) == 429
+
+
+class Throttle:
+    """
+    Wraps API calls with a token bucket and adaptive concurrency limit.
+    Throttled calls are retried with exponential backoff.
+    """
+
+    def __init__(self, rate=None, max_concurrency=32, max_retries=5):
+        self.bucket = TokenBucket(rate) if rate else None
+        self.concurrency = AdaptiveConcurrency(maximum=max_concurrency)
+        self.max_retries = max_retries
+        self.calls = 0
+        self.retries = 0
+        self.throttled = 0
+        # Counters are updated from many worker threads and read by metrics.
+        self._counter_lock = threading.Lock()
+
+    @classmethod
+    def from_profile(cls, profile):
+        """
+        Reads optional `rate_limit` (requests per second) and
+        `max_concurrency` settings of the profile.
+        """
+        return cls(
+            rate=profile.get("rate_limit"),
+            max_concurrency=profile.get("max_concurrency") or 32,
+        )
+
+    def call(self, fn, *args, **kwargs):
+        for attempt in range(self.max_retries + 1):
+            if self.bucket is not None:
+                self.bucket.acquire()
+
+            self.concurrency.acquire()
+            self._count("calls")
+            throttled = False
+            try:
+                return fn(*args, **kwargs)
+            except Exception as e:
+                throttled = is_throttled(e)
+                if throttled:
+                    self._count("throttled")
+                if not throttled or attempt == self.max_retries:
+                    raise
+            finally:
+                self.concurrency.release(throttled)
+
+            self._count("retries")
+            time.sleep(min(60, 2**attempt) * random.uniform(0.5, 1))
+
+    def _count(self, counter):
+        with self._counter_lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def wrap(self, fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            return self.call(fn, *args, **kwargs)
+
+        return wrapper
@@ -0,0 +1,66 @@
+"""
+Thin client for `labelbox serve`.
+
+Only uses the standard library, so forwarding a command to a running
+daemon doesn't pay for importing Click or the Labelbox SDK.
+"""
+import json
+import os
+import socket
+import struct
+import sys
+from pathlib import Path
+
+DEFAULT_SOCKET = str(Path.home() / ".labelbox-cli.sock")
+SOCKET_ENV_VAR = "LABELBOX_CLI_SOCKET"
+
+_HEADER = struct.Struct("!I")
+
+
+def send_message(conn, message):
+    payload = json.dumps(message).encode("utf-8")
+    conn.sendall(_HEADER.pack(len(payload)) + payload)
+
+
+def recv_message(conn):
+    (size,) = _HEADER.unpack(_recv_exactly(conn, _HEADER.size))
+    return json.loads(_recv_exactly(conn, size).decode("utf-8"))
+
+
+def _recv_exactly(conn, size):
+    data = bytearray()
+    while len(data) < size:
+        chunk = conn.recv(size - len(data))
+        if not chunk:
+            raise ConnectionError("Connection closed before message was received.")
+        data.extend(chunk)
+    return bytes(data)
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    socket_path = os.environ.get(SOCKET_ENV_VAR, DEFAULT_SOCKET)
+
+    try:
+        conn = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        conn.connect(socket_path)
+    except OSError as e:
+        print(
+            f"Could not connect to labelbox daemon at {socket_path}: {e}.\n"
+            "Start it with `labelbox serve`.",
+            file=sys.stderr,
+        )
+        sys.exit(1)
+
+    # Paths are resolved in the working directory of the client, and
+    # "-" arguments read IDs from its stdin, so both are sent along.
+    request = {"argv": argv, "cwd": os.getcwd()}
+    if any(arg == "-" or arg.endswith("=-") for arg in argv):
+        request["stdin"] = sys.stdin.read()
+
+    with conn:
+        send_message(conn, request)
+        response = recv_message(conn)
+
+    sys.stdout.write(response["output"])
+    sys.exit(response["exit_code"])
@@ -0,0 +1,184 @@
+import os
+import tempfile
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+from .export import iter_export, open_output, run_export, write_ndjson
+from .output import iter_objects, to_record
+from .tasks import DEFAULT_TIMEOUT
+from .utils import bounded_map, dumps, read_json_file
+
+SNAPSHOT_RESOURCES = ["project", "dataset", "ontology"]
+SNAPSHOT_DIRS = {"project": "projects", "dataset": "datasets", "ontology": "ontologies"}
+MANIFEST_FILE = "manifest.json"
+
+PROJECT_EXPORT_PARAMS = {
+    "attachments": True,
+    "metadata_fields": True,
+    "data_row_details": True,
+    "project_details": True,
+    "label_details": True,
+    "performance_details": True,
+}
+DATASET_EXPORT_PARAMS = {
+    "attachments": True,
+    "metadata_fields": True,
+    "data_row_details": True,
+}
+
+
+def _version(resource, record):
+    """
+    Returns value that changes whenever the object has to be snapshotted again.
+    Project activity (labels) and dataset row count are not reflected in `updatedAt`.
+    """
+    if resource == "project":
+        return f"{record.get('updated_at')}|{record.get('last_activity_time')}"
+    if resource == "dataset":
+        return f"{record.get('updated_at')}|{record.get('row_count')}"
+    return str(record.get("updated_at"))
+
+
+class Snapshot:
+    """
+    Crawls projects (with batches), datasets and ontologies of the workspace
+    into a directory of gzipped JSON metadata and NDJSON exports.
+
+    Every written object is recorded in `manifest.json`. In incremental mode
+    objects whose version did not change since the previous manifest are skipped.
+    """
+
+    def __init__(
+        self,
+        client,
+        out_dir,
+        incremental=False,
+        exports=True,
+        timeout=DEFAULT_TIMEOUT,
+    ):
+        self.client = client
+        self.out_dir = Path(out_dir)
+        self.incremental = incremental
+        self.exports = exports
+        self.timeout = timeout
+        self.started_at = datetime.now(timezone.utc)
+        self.entries = {resource: {} for resource in SNAPSHOT_RESOURCES}
+        self.timings = {}
+        self._lock = threading.Lock()
+
+        self.previous = {}
+        manifest_path = self.out_dir / MANIFEST_FILE
+        if manifest_path.is_file():
+            self.previous = read_json_file(manifest_path)["resources"]
+
+    def _write_json(self, path, data):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open_output(path, "gzip") as f:
+            f.write(dumps(data))
+
+    def _write_export(self, exportable, params, path):
+        export_task = run_export(exportable, params, self.timeout)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        write_ndjson(iter_export(export_task), path, "gzip")
+
+    def _snapshot_project(self, project, record, directory):
+        files = [directory / "project.json.gz", directory / "batches.json.gz"]
+        self._write_json(files[0], record)
+        self._write_json(files[1], [to_record(batch) for batch in project.batches()])
+
+        if self.exports:
+            files.append(directory / "export.ndjson.gz")
+            self._write_export(project, PROJECT_EXPORT_PARAMS, files[-1])
+        return files
+
+    def _snapshot_dataset(self, dataset, record, directory):
+        files = [directory / "dataset.json.gz"]
+        self._write_json(files[0], record)
+
+        if self.exports:
+            files.append(directory / "export.ndjson.gz")
+            self._write_export(dataset, DATASET_EXPORT_PARAMS, files[-1])
+        return files
+
+    def _snapshot_ontology(self, ontology, record, directory):
+        files = [directory / "ontology.json.gz"]
+        self._write_json(files[0], record)
+        return files
+
+    def _is_unchanged(self, previous, version):
+        if not previous or previous["status"] == "failed":
+            return False
+        # Snapshot without exports is outdated once exports are requested.
+        has_exports = previous.get("exports") or not self.exports
+        return has_exports and previous["version"] == version
+
+    def _snapshot(self, resource, obj):
+        record = to_record(obj)
+        version = _version(resource, record)
+
+        previous = self.previous.get(resource, {}).get(obj.uid)
+        if self.incremental and self._is_unchanged(previous, version):
+            return {**previous, "status": "unchanged"}
+
+        directory = self.out_dir / SNAPSHOT_DIRS[resource] / obj.uid
+        snapshot = getattr(self, f"_snapshot_{resource}")
+        files = snapshot(obj, record, directory)
+
+        return {
+            "name": record.get("name"),
+            "version": version,
+            "status": "written",
+            "exports": self.exports,
+            "snapshot_at": self.started_at.isoformat(),
+            "files": [str(path.relative_to(self.out_dir)) for path in files],
+        }
+
+    def _list(self, resource):
+        if resource == "project":
+            return self.client.get_projects()
+        if resource == "dataset":
+            return self.client.get_datasets()
+        return self.client.get_ontologies(name_contains="")
+
+    def crawl(self, resource, workers):
+        """
+        Snapshots all objects of the resource concurrently.
+        Yields (object, manifest entry, error) as objects are done.
+        """
+        started = time.perf_counter()
+        objects = iter_objects(self._list(resource), page_size=100)
+
+        for obj, entry, error in bounded_map(
+            lambda obj: self._snapshot(resource, obj), objects, workers
+        ):
+            if error is not None:
+                entry = {"name": obj.name, "status": "failed", "error": str(error)}
+
+            with self._lock:
+                self.entries[resource][obj.uid] = entry
+            yield obj, entry, error
+
+        self.timings[resource] = time.perf_counter() - started
+
+    def write_manifest(self):
+        # Resources that were not crawled this time keep their previous entries.
+        resources = {
+            resource: entries
+            if resource in self.timings
+            else self.previous.get(resource, {})
+            for resource, entries in self.entries.items()
+        }
+        manifest = {
+            "created_at": self.started_at.isoformat(),
+            "profile": self.client.profile["name"],
+            "exports": self.exports,
+            "resources": resources,
+        }
+
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.out_dir, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(dumps(manifest, pretty=True))
+        os.replace(tmp_path, self.out_dir / MANIFEST_FILE)
@@ -0,0 +1,88 @@
+import asyncio
+import random
+import sys
+import time
+
+import click
+
+from . import metrics, timings
+
+DEFAULT_TIMEOUT = 3600
+INITIAL_DELAY = 2.0
+MAX_DELAY = 30.0
+
+
+def _sdk_tasks(task):
+    """
+    Returns SDK Task objects behind task wrappers returned by the SDK.
+    """
+    if hasattr(task, "tasks"):  # CreateBatchesTask
+        return list(task.tasks)
+    if hasattr(task, "_task"):  # ExportTask
+        return [task._task]
+    return [task]
+
+
+class _Progress:
+    def __init__(self, total, enabled):
+        self.total = total
+        self.done = 0
+        self.enabled = enabled
+        self.started = time.monotonic()
+
+    def render(self):
+        if not self.enabled:
+            return
+        elapsed = time.monotonic() - self.started
+        click.echo(
+            f"\rWaiting for tasks: {self.done}/{self.total} done, {elapsed:.0f}s elapsed",
+            nl=self.done == self.total,
+            err=True,
+        )
+
+
+async def _poll(task, deadline, progress):
+    # Polls of many tasks interleave on one thread, so each gets its own lane.
+    started = time.monotonic()
+    with timings.span("task wait", "task", lane=f"task {task.uid}", task_id=task.uid):
+        await _poll_until_done(task, deadline, progress)
+    metrics.observe("task_wait_seconds", time.monotonic() - started)
+
+
+async def _poll_until_done(task, deadline, progress):
+    delay = INITIAL_DELAY
+
+    while task.status == "IN_PROGRESS":
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise click.ClickException(
+                f"Task {task.uid} is still in progress after the timeout."
+            )
+
+        # Exponential backoff with jitter, so many tasks don't poll in lockstep.
+        await asyncio.sleep(min(delay / 2 + random.uniform(0, delay / 2), remaining))
+        await asyncio.to_thread(task.refresh)
+        delay = min(delay * 2, MAX_DELAY)
+        progress.render()
+
+    progress.done += 1
+    progress.render()
+
+
+async def _wait_all(tasks, timeout, progress):
+    deadline = time.monotonic() + timeout
+    await asyncio.gather(*(_poll(task, deadline, progress) for task in tasks))
+
+
+def wait_for_tasks(tasks, timeout=DEFAULT_TIMEOUT, show_progress=None):
+    """
+    Waits until all Labelbox tasks are finished, polling them concurrently
+    with exponential backoff. Returns as soon as the slowest task is done.
+    Progress is shown on stderr when it is a terminal, unless disabled.
+    """
+    sdk_tasks = [sdk_task for task in tasks for sdk_task in _sdk_tasks(task)]
+    if show_progress is None:
+        show_progress = sys.stderr.isatty()
+
+    progress = _Progress(len(sdk_tasks), show_progress)
+    asyncio.run(_wait_all(sdk_tasks, timeout, progress))
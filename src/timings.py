@@ -0,0 +1,258 @@
+import contextlib
+import cProfile
+import functools
+import os
+import re
+import sys
+import threading
+import time
+import uuid
+from collections import defaultdict
+from datetime import datetime, timezone
+from pathlib import Path
+
+import click
+
+from .utils import dumps
+
+SPEEDSCOPE_SCHEMA = "https://www.speedscope.app/file-format-schema.json"
+
+_OPERATION_NAME = re.compile(r"^\s*(?:query|mutation)\s+(\w+)")
+
+# Recorder of the running command. None when timings are disabled,
+# so spans cost a single check.
+_recorder = None
+
+
+class Span:
+    def __init__(self, name, category, start, lane, attrs):
+        self.name = name
+        self.category = category
+        self.start = start
+        self.end = None
+        self.lane = lane
+        self.attrs = attrs
+
+    @property
+    def duration(self):
+        return self.end - self.start
+
+    def to_dict(self):
+        return {
+            "name": self.name,
+            "category": self.category,
+            "start": round(self.start, 6),
+            "duration": round(self.duration, 6),
+            "lane": self.lane,
+            **self.attrs,
+        }
+
+
+class Recorder:
+    """
+    Collects timed spans of one CLI invocation. Span times are seconds
+    relative to the start of the recorder.
+    """
+
+    def __init__(self, command=""):
+        self.command = command
+        self.run_id = uuid.uuid4().hex
+        self.started_at = datetime.now(timezone.utc)
+        self.origin = time.perf_counter()
+        self.spans = []
+        self._lock = threading.Lock()
+
+    @contextlib.contextmanager
+    def span(self, name, category, lane=None, **attrs):
+        lane = lane or threading.current_thread().name
+        span = Span(name, category, time.perf_counter() - self.origin, lane, attrs)
+        try:
+            yield span
+        finally:
+            span.end = time.perf_counter() - self.origin
+            with self._lock:
+                self.spans.append(span)
+
+    @property
+    def elapsed(self):
+        return time.perf_counter() - self.origin
+
+    def summary(self):
+        """
+        Returns {(category, name): (count, total seconds, max seconds)},
+        ordered by total time.
+        """
+        groups = defaultdict(list)
+        for span in self.spans:
+            groups[(span.category, span.name)].append(span.duration)
+
+        rows = {
+            key: (len(durations), sum(durations), max(durations))
+            for key, durations in groups.items()
+        }
+        return dict(sorted(rows.items(), key=lambda item: -item[1][1]))
+
+    def write_summary(self, file=None):
+        file = file or sys.stderr
+        click.echo(f"\nTimings of `{self.command}` ({self.elapsed:.3f}s):", file=file)
+        click.echo(
+            f"{'CATEGORY':<10} {'NAME':<40} {'COUNT':>6} {'TOTAL':>9} {'MEAN':>9} {'MAX':>9}",
+            file=file,
+        )
+        for (category, name), (count, total, longest) in self.summary().items():
+            click.echo(
+                f"{category:<10} {name[:40]:<40} {count:>6} "
+                f"{total:>8.3f}s {total / count:>8.3f}s {longest:>8.3f}s",
+                file=file,
+            )
+
+    def write_json_lines(self, file_path):
+        """
+        Appends one JSON object per span, tagged with the run, so spans of
+        many runs can be collected into one file.
+        """
+        run = {
+            "run_id": self.run_id,
+            "command": self.command,
+            "pid": os.getpid(),
+            "started_at": self.started_at.isoformat(),
+        }
+        with open(file_path, "a", encoding="utf-8") as f:
+            for span in sorted(self.spans, key=lambda span: span.start):
+                f.write(dumps({**run, **span.to_dict()}))
+                f.write("\n")
+
+    def write_speedscope(self, file_path):
+        """
+        Writes spans as speedscope evented profile with one lane per thread.
+        """
+        frames = {}
+        lanes = defaultdict(list)
+        for span in self.spans:
+            frames.setdefault(span.name, len(frames))
+            lanes[span.lane].append(span)
+
+        profiles = []
+        for lane, spans in lanes.items():
+            events = []
+            stack = []
+            # Parents start first and end last, so sorting keeps spans nested.
+            for span in sorted(spans, key=lambda span: (span.start, -span.end)):
+                while stack and stack[-1].end <= span.start:
+                    closed = stack.pop()
+                    events.append(_event("C", frames[closed.name], closed.end))
+                events.append(_event("O", frames[span.name], span.start))
+                stack.append(span)
+            while stack:
+                closed = stack.pop()
+                events.append(_event("C", frames[closed.name], closed.end))
+
+            profiles.append(
+                {
+                    "type": "evented",
+                    "name": lane,
+                    "unit": "seconds",
+                    "startValue": 0,
+                    "endValue": max(span.end for span in spans),
+                    "events": events,
+                }
+            )
+
+        document = {
+            "$schema": SPEEDSCOPE_SCHEMA,
+            "name": self.command,
+            "exporter": "labelbox-cli",
+            "shared": {"frames": [{"name": name} for name in frames]},
+            "profiles": profiles,
+        }
+        Path(file_path).write_text(dumps(document), encoding="utf-8")
+
+
+def _event(event_type, frame, at):
+    return {"type": event_type, "frame": frame, "at": at}
+
+
+def start(command=""):
+    global _recorder
+    _recorder = Recorder(command)
+    return _recorder
+
+
+def stop():
+    global _recorder
+    recorder, _recorder = _recorder, None
+    return recorder
+
+
+def span(name, category, lane=None, **attrs):
+    """
+    Times the block as a span of the running command. No-op when
+    timings are not enabled.
+    """
+    if _recorder is None:
+        return contextlib.nullcontext()
+    return _recorder.span(name, category, lane, **attrs)
+
+
+def timed_execute(execute):
+    """
+    Wraps `Client.execute`, so every SDK call is recorded as a span
+    named after its GraphQL operation.
+    """
+
+    @functools.wraps(execute)
+    def wrapper(query=None, *args, **kwargs):
+        if _recorder is None:
+            return execute(query, *args, **kwargs)
+
+        match = _OPERATION_NAME.match(query or "")
+        name = (
+            match.group(1) if match else "upload" if kwargs.get("files") else "graphql"
+        )
+        with _recorder.span(name, "api"):
+            return execute(query, *args, **kwargs)
+
+    return wrapper
+
+
+def configure(ctx, param, value):
+    """
+    Callback of the `--timings`, `--timings-file` and `--profile` options.
+    Recording starts while arguments are parsed, so the import of the
+    subcommand module is timed too. Results are written when the command exits.
+    """
+    if not value:
+        return
+
+    settings = ctx.meta.setdefault("timings", {})
+    if not settings:
+        start()
+        ctx.call_on_close(functools.partial(_finish, ctx, settings))
+    settings[param.name] = value
+
+    if param.name == "profile_file" and not _is_speedscope(value):
+        settings["profiler"] = cProfile.Profile()
+        settings["profiler"].enable()
+
+
+def _is_speedscope(file_path):
+    return str(file_path).endswith(".json")
+
+
+def _finish(ctx, settings):
+    recorder = stop()
+    recorder.command = ctx.meta.get("invocation", ctx.command_path)
+    profile_file = settings.get("profile_file")
+
+    if "profiler" in settings:
+        settings["profiler"].disable()
+        settings["profiler"].dump_stats(profile_file)
+    elif profile_file:
+        recorder.write_speedscope(profile_file)
+
+    if settings.get("timings"):
+        recorder.write_summary()
+    if settings.get("timings_file"):
+        recorder.write_json_lines(settings["timings_file"])
+    if profile_file:
+        click.echo(f"Profile has been written into {profile_file}.", err=True)
@@ -0,0 +1,128 @@
+import re
+
+import click
+
+# Longest operators first, so that "!=" is not parsed as "=".
+_FILTER_RE = re.compile(r"^\s*(?P<path>[^!=~]+?)\s*(?P<op>!=|=|~)\s*(?P<value>.*?)\s*$")
+
+
+def _split_path(path):
+    return [key for key in path.strip().split(".") if key]
+
+
+def _resolve(record, keys):
+    values = [record]
+    many = False
+
+    for key in keys:
+        found = []
+        for value in values:
+            if isinstance(value, list):
+                items, many = value, True
+            else:
+                items = [value]
+
+            for item in items:
+                if not isinstance(item, dict):
+                    continue
+                if key == "*":
+                    found.extend(item.values())
+                    many = True
+                elif key in item:
+                    found.append(item[key])
+        values = found
+
+    return values, many
+
+
+def resolve(record, keys):
+    """
+    Returns values found under the dotted path in the record.
+    Lists are traversed implicitly and "*" matches every key of an object.
+    Lists at the end of the path are matched element by element.
+    """
+    values, _ = _resolve(record, keys)
+    return [
+        element
+        for value in values
+        for element in (value if isinstance(value, list) else [value])
+    ]
+
+
+def _as_text(value):
+    if isinstance(value, bool):
+        return str(value).lower()
+    return str(value)
+
+
+def parse_filter(expression):
+    """
+    Parses filter expression into a predicate over records.
+
+    Supported forms are `path=value`, `path!=value`, `path~substring`
+    and bare `path` (path exists and is not empty).
+    """
+    match = _FILTER_RE.match(expression)
+
+    if match is None:
+        keys = _split_path(expression)
+        if not keys or any(op in expression for op in "!=~"):
+            raise click.BadParameter(f"Invalid filter: {expression!r}")
+        return lambda record: any(
+            value not in (None, "", {}) for value in resolve(record, keys)
+        )
+
+    keys = _split_path(match["path"])
+    if not keys:
+        raise click.BadParameter(f"Invalid filter: {expression!r}")
+    op, expected = match["op"], match["value"]
+
+    if op == "=":
+        return lambda record: any(
+            _as_text(value) == expected for value in resolve(record, keys)
+        )
+    if op == "!=":
+        return lambda record: all(
+            _as_text(value) != expected for value in resolve(record, keys)
+        )
+    return lambda record: any(
+        expected in _as_text(value) for value in resolve(record, keys)
+    )
+
+
+def parse_select(fields):
+    """
+    Parses comma separated dotted paths into (column, keys) pairs.
+    """
+    paths = [field.strip() for field in fields.split(",") if field.strip()]
+    selected = [(path, _split_path(path)) for path in paths]
+    for path, keys in selected:
+        if not keys:
+            raise click.BadParameter(f"Invalid path: {path!r}")
+    return selected
+
+
+def project_record(record, selected):
+    """
+    Returns flat record with the selected paths as keys. Paths going
+    through lists or "*" always become lists of the found values.
+    """
+    projected = {}
+    for column, keys in selected:
+        values, many = _resolve(record, keys)
+        if many:
+            projected[column] = values
+        else:
+            projected[column] = values[0] if values else None
+    return projected
+
+
+def transform(records, predicates=(), selected=()):
+    """
+    Filters and projects records one by one. All predicates have to match.
+    Expressions are parsed up front with `parse_filter` and `parse_select`,
+    so that invalid ones are reported before the export starts.
+    """
+    for record in records:
+        if all(predicate(record) for predicate in predicates):
+            yield project_record(record, selected) if selected else record
@@ -0,0 +1,305 @@
+import re
+import threading
+import time
+from pathlib import Path
+
+import click
+
+from . import metrics
+from .cache import CACHE_DIR, DiskCache
+from .tasks import DEFAULT_TIMEOUT, wait_for_tasks
+from .utils import bounded_map, file_sha256
+
+DEFAULT_CHUNK_SIZE = 1000
+DEFAULT_WORKERS = 4
+KEY_STRATEGIES = ["path", "hash"]
+DEFAULT_UPLOAD_CACHE_DAYS = 30
+DEFAULT_UPLOAD_CACHE_ENTRIES = 1_000_000
+
+_GLOB_MAGIC = re.compile(r"[*?[]")
+
+
+def normalize_data_rows(rows):
+    """
+    Validates data rows read from the input file one by one.
+    Empty optional values (e.g. blank CSV columns) are dropped.
+    """
+    for number, row in enumerate(rows, 1):
+        if not isinstance(row, dict):
+            raise ValueError(f"Data row #{number} is not an object: {row!r}")
+
+        row = {key: value for key, value in row.items() if value != ""}
+        if "row_data" not in row:
+            raise ValueError(f"Data row #{number} has no row_data: {row!r}")
+
+        yield row
+
+
+def _upload_chunk(dataset, index, chunk, on_commit=(), timeout=DEFAULT_TIMEOUT):
+    started = time.perf_counter()
+    task = dataset.create_data_rows(chunk)
+    wait_for_tasks([task], timeout, show_progress=False)
+
+    # Committed from the worker, so chunks that finish after Ctrl-C are kept too.
+    if not task.errors:
+        for callback in on_commit:
+            callback(index, chunk)
+
+    elapsed = time.perf_counter() - started
+    metrics.observe("upload_chunk_seconds", elapsed)
+    return task.errors, elapsed
+
+
+def _failed_rows(chunk, errors):
+    """
+    Returns number of rows of the chunk rejected by its upload task. Errors are
+    grouped by message with the rejected rows, anything else fails the chunk.
+    """
+    if not errors:
+        return 0
+    if not isinstance(errors, list):
+        return len(chunk)
+    failed = sum(
+        len(error.get("failedDataRows") or [error]) if isinstance(error, dict) else 1
+        for error in errors
+    )
+    return min(failed, len(chunk))
+
+
+def _pending_chunks(chunks, journal):
+    for index, chunk in enumerate(chunks, 1):
+        if journal is not None:
+            pending = journal.pending_rows(index, chunk)
+            if not pending:
+                click.echo(f"Chunk {index}: already uploaded, skipping.")
+                continue
+            chunk = pending
+
+        yield index, chunk
+
+
+def upload_chunks(
+    dataset,
+    chunks,
+    workers=DEFAULT_WORKERS,
+    journal=None,
+    on_commit=None,
+    timeout=DEFAULT_TIMEOUT,
+):
+    """
+    Uploads chunks of data rows to the dataset with up to `workers` concurrent
+    upload tasks, reporting progress for every finished chunk.
+    Chunks committed in the `journal` by previous runs are skipped.
+    `on_commit(index, chunk)` is called for every successfully uploaded chunk.
+    Returns list of errors collected from all chunks.
+    """
+    started = time.perf_counter()
+    uploaded = 0
+    errors = []
+    callbacks = [
+        callback
+        for callback in (journal.commit if journal else None, on_commit)
+        if callback is not None
+    ]
+
+    results = bounded_map(
+        lambda indexed: _upload_chunk(
+            dataset, *indexed, on_commit=callbacks, timeout=timeout
+        ),
+        _pending_chunks(chunks, journal),
+        workers,
+    )
+
+    for (index, chunk), result, error in results:
+        if error is not None:
+            errors.append({"chunk": index, "error": str(error)})
+            metrics.inc("upload_chunks_failed_total")
+            click.echo(f"Chunk {index}: failed to upload {len(chunk)} rows: {error}")
+            continue
+
+        chunk_errors, elapsed = result
+        failed = _failed_rows(chunk, chunk_errors)
+        if chunk_errors:
+            errors.append({"chunk": index, "errors": chunk_errors})
+
+        succeeded = len(chunk) - failed
+        uploaded += succeeded
+        metrics.inc("rows_uploaded_total", succeeded)
+        click.echo(
+            f"Chunk {index}: {succeeded} rows in {elapsed:.1f}s "
+            f"({succeeded / max(elapsed, 1e-9):.0f} rows/s), {uploaded} rows total"
+            + (f", {failed} rows failed." if failed else ".")
+        )
+
+    elapsed = time.perf_counter() - started
+    click.echo(
+        f"Uploaded {uploaded} rows in {elapsed:.1f}s "
+        f"({uploaded / max(elapsed, 1e-9):.0f} rows/s)."
+    )
+    return errors
+
+
+def split_glob(pattern):
+    """
+    Splits absolute glob pattern into the directory before the first wildcard
+    and the pattern relative to it, since `Path.glob` accepts only the latter.
+    """
+    parts = Path(pattern).parts
+    static = 1
+    while static < len(parts) - 1 and not _GLOB_MAGIC.search(parts[static]):
+        static += 1
+    return Path(*parts[:static]), str(Path(*parts[static:]))
+
+
+def iter_local_files(local_dir=None, pattern=None):
+    """
+    Yields (base directory, file path) pairs for all files in the directory,
+    or only for files matching the glob pattern when it is given.
+    Paths are sorted, so reruns see files in the same order.
+    """
+    base = Path(local_dir or ".")
+    if pattern and Path(pattern).is_absolute():
+        base, pattern = split_glob(pattern)
+    paths = base.glob(pattern) if pattern else base.rglob("*")
+
+    for path in sorted(paths):
+        if path.is_file():
+            yield base, path
+
+
+class LocalFileUploader:
+    """
+    Uploads local files concurrently through `client.upload_file`
+    and turns them into data rows with deterministic global keys.
+
+    With `cache`, files are identified by SHA-256 of their content:
+    already uploaded files reuse their URL, and files already added
+    to the dataset are skipped entirely.
+    """
+
+    def __init__(
+        self,
+        client,
+        workers=DEFAULT_WORKERS,
+        key_strategy="path",
+        cache=None,
+        dataset_id=None,
+    ):
+        self.client = client
+        self.workers = workers
+        self.key_strategy = key_strategy
+        self.cache = cache
+        self.dataset_id = dataset_id
+        self.errors = []
+        self.files = 0
+        self.bytes = 0
+        self.reused = 0
+        self.skipped = 0
+        self._digests = {}
+        self._lock = threading.Lock()
+        self._started = None
+
+    def _upload(self, base_and_path):
+        base, path = base_and_path
+        digest = None
+        entry = None
+
+        if self.cache is not None or self.key_strategy == "hash":
+            digest = file_sha256(path)
+        if self.cache is not None:
+            entry = self.cache.get(digest)
+
+        if entry and self.dataset_id in entry["datasets"]:
+            return None, False
+
+        if entry:
+            url = entry["url"]
+        else:
+            url = self.client.upload_file(str(path))
+            if self.cache is not None:
+                self.cache.set(digest, {"url": url, "datasets": []})
+
+        if self.key_strategy == "hash":
+            global_key = digest
+        else:
+            global_key = path.relative_to(base).as_posix()
+
+        if self.cache is not None:
+            with self._lock:
+                self._digests[global_key] = digest
+
+        return {"row_data": url, "global_key": global_key}, entry is None
+
+    def iter_data_rows(self, files):
+        """
+        Uploads files and yields data rows in the order of files,
+        so chunks stay the same between reruns with --resume.
+        """
+        self._started = time.perf_counter()
+
+        for (_, path), result, error in bounded_map(
+            self._upload, files, self.workers, ordered=True
+        ):
+            if error is not None:
+                self.errors.append({"file": str(path), "error": str(error)})
+                click.echo(f"Failed to upload {path}: {error}")
+                continue
+
+            row, uploaded = result
+            if row is None:
+                self.skipped += 1
+                continue
+
+            if uploaded:
+                size = path.stat().st_size
+                self.files += 1
+                self.bytes += size
+                metrics.inc("upload_bytes_total", size)
+            else:
+                self.reused += 1
+
+            yield row
+
+    def commit(self, index, chunk):
+        """
+        Records in the cache that files from the uploaded chunk belong to the dataset.
+        """
+        if self.cache is None:
+            return
+
+        for row in chunk:
+            with self._lock:
+                digest = self._digests.pop(row["global_key"], None)
+            if digest is None:
+                continue
+
+            entry = self.cache.get(digest) or {"url": row["row_data"], "datasets": []}
+            if self.dataset_id not in entry["datasets"]:
+                entry["datasets"].append(self.dataset_id)
+            self.cache.set(digest, entry)
+
+    def report(self):
+        elapsed = max(
+            time.perf_counter() - (self._started or time.perf_counter()), 1e-9
+        )
+        megabytes = self.bytes / (1024 * 1024)
+        click.echo(
+            f"Uploaded {self.files} files ({megabytes:.1f} MB) in {elapsed:.1f}s: "
+            f"{self.files / elapsed:.1f} files/s, {megabytes / elapsed:.2f} MB/s."
+        )
+        if self.cache is not None:
+            click.echo(
+                f"Reused {self.reused} cached uploads, skipped {self.skipped} "
+                "files already added to the dataset."
+            )
+
+
+def upload_cache(profile_name, max_age_days=DEFAULT_UPLOAD_CACHE_DAYS):
+    """
+    Returns content-addressed cache of uploaded files for the profile.
+    """
+    return DiskCache(
+        CACHE_DIR / profile_name / "uploads",
+        max_age=max_age_days * 24 * 60 * 60,
+        max_entries=DEFAULT_UPLOAD_CACHE_ENTRIES,
+    )
@@ -1,4 +1,119 @@
+import csv
+import hashlib
 import json
+import math
+import os
+import re
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import date, datetime, time
+from enum import Enum
+
+SERIALIZERS = ["orjson", "ujson", "json"]
+SERIALIZER_ENV_VAR = "LABELBOX_CLI_SERIALIZER"
+
+# Characters that may follow a number or literal inside a JSON array.
+_SCALAR_END = re.compile(r"[\s,\]]")
+
+
+def _orjson_serializer():
+    import orjson
+
+    def dumps(obj, pretty=False):
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if pretty else 0)
+        return orjson.dumps(obj, default=str, option=option).decode("utf-8")
+
+    return dumps, orjson.loads
+
+
+def _default(obj):
+    """
+    Encodes objects unknown to ujson and json the same way orjson does,
+    so output doesn't depend on the installed library.
+    """
+    if isinstance(obj, (datetime, date, time)):
+        return obj.isoformat()
+    if isinstance(obj, Enum):
+        return obj.value
+    return str(obj)
+
+
+def _finite(obj):
+    """
+    Replaces NaN and infinity, which are not valid JSON, with None like orjson.
+    """
+    if isinstance(obj, float) and not math.isfinite(obj):
+        return None
+    if isinstance(obj, dict):
+        return {key: _finite(value) for key, value in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_finite(value) for value in obj]
+    return obj
+
+
+def _without_nan(dumps):
+    # Non-finite floats are rare, so the object is only copied when they occur.
+    def wrapper(obj, pretty=False):
+        try:
+            return dumps(obj, pretty)
+        except (ValueError, OverflowError):
+            return dumps(_finite(obj), pretty)
+
+    return wrapper
+
+
+def _ujson_serializer():
+    import ujson
+
+    def dumps(obj, pretty=False):
+        return ujson.dumps(
+            obj,
+            ensure_ascii=False,
+            indent=2 if pretty else 0,
+            default=_default,
+            allow_nan=False,
+        )
+
+    return _without_nan(dumps), ujson.loads
+
+
+def _json_serializer():
+    def dumps(obj, pretty=False):
+        indent, separators = (2, None) if pretty else (None, (",", ":"))
+        return json.dumps(
+            obj,
+            ensure_ascii=False,
+            indent=indent,
+            separators=separators,
+            default=_default,
+            allow_nan=False,
+        )
+
+    return _without_nan(dumps), json.loads
+
+
+def load_serializer(name=None):
+    """
+    Returns (name, dumps, loads) of the fastest installed JSON library,
+    or of the one chosen with LABELBOX_CLI_SERIALIZER environment variable.
+    Output is compact unless `dumps` is called with `pretty=True`.
+    """
+    factories = {
+        "orjson": _orjson_serializer,
+        "ujson": _ujson_serializer,
+        "json": _json_serializer,
+    }
+    name = name or os.environ.get(SERIALIZER_ENV_VAR)
+    candidates = [name] if name in factories else SERIALIZERS
+
+    for candidate in candidates:
+        try:
+            return (candidate, *factories[candidate]())
+        except ImportError:
+            continue
+    return ("json", *_json_serializer())
+
+
+SERIALIZER, dumps, loads = load_serializer()
 
 
 def find_active_profile(profiles, key="active", value=True):
@@ -14,9 +129,188 @@ def find_active_profile(profiles, key="active", value=True):
 
 def read_json_file(file_path):
     with open(file_path, "rb") as f:
-        return json.load(f)
+        return loads(f.read())
 
 
-def write_json_file(file_path, profile):
+def write_json_file(file_path, data, pretty=False):
     with open(file_path, "w+", encoding="utf-8") as f:
-        json.dump(profile, f, ensure_ascii=False, indent=4)
+        f.write(dumps(data, pretty=pretty))
+
+
+def chunked(iterable, size):
+    """
+    Yields lists of up to `size` items without materializing the whole iterable.
+    """
+    chunk = []
+    for item in iterable:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+
+    if chunk:
+        yield chunk
+
+
+def iter_csv_rows(file_path):
+    """
+    Yields rows of the CSV file with headers as dictionaries.
+    """
+    with open(file_path, "r", newline="") as f:
+        yield from csv.DictReader(f)
+
+
+def iter_ndjson_rows(file_path):
+    """
+    Yields objects from the newline delimited JSON file, skipping blank lines.
+    """
+    with open(file_path, "r", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield loads(line)
+
+
+def iter_json_array(file_path, block_size=64 * 1024):
+    """
+    Yields items of the top-level JSON array one by one,
+    reading the file in blocks instead of loading it whole.
+    Raises ValueError if the file is not a single valid JSON array.
+    """
+    decoder = json.JSONDecoder()
+    whitespace = " \t\r\n"
+
+    with open(file_path, "r", encoding="utf-8") as f:
+        buffer, pos = "", 0
+
+        def fill():
+            # Consumed input is dropped only when more has been read,
+            # so positions stay valid at the end of the file.
+            nonlocal buffer, pos
+            block = f.read(block_size)
+            if not block:
+                return False
+            buffer, pos = buffer[pos:] + block, 0
+            return True
+
+        def peek():
+            # Returns the next non-whitespace character, "" at the end of the file.
+            nonlocal pos
+            while True:
+                while pos < len(buffer) and buffer[pos] in whitespace:
+                    pos += 1
+                if pos < len(buffer) or not fill():
+                    return buffer[pos : pos + 1]
+
+        def fail(message):
+            return ValueError(f"{message} in JSON file {file_path}.")
+
+        if peek() != "[":
+            raise fail("Expected a list")
+        pos += 1
+        closed = peek() == "]"
+
+        while not closed:
+            if not peek():
+                raise fail("Unexpected end of data")
+
+            # Numbers and literals have no closing character, so they are
+            # decoded only once the delimiter after them has been read.
+            if buffer[pos] not in '{["':
+                while not _SCALAR_END.search(buffer, pos) and fill():
+                    pass
+
+            try:
+                item, pos = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError as e:
+                if fill():
+                    continue
+                raise fail(f"Invalid item: {e.msg}") from None
+            yield item
+
+            separator = peek()
+            if separator == ",":
+                pos += 1
+            elif separator == "]":
+                closed = True
+            elif not separator:
+                raise fail("Unexpected end of data")
+            else:
+                raise fail(f"Expected ',' or ']' but found {separator!r}")
+
+        pos += 1
+        if peek():
+            raise fail("Unexpected data after the list")
+
+
+def iter_input_rows(json_file="", csv_file="", ndjson_file=""):
+    """
+    Returns lazily read rows of whichever input file is given, or None.
+    """
+    if json_file:
+        return iter_json_array(json_file)
+    if csv_file:
+        return iter_csv_rows(csv_file)
+    if ndjson_file:
+        return iter_ndjson_rows(ndjson_file)
+    return None
+
+
+def file_sha256(file_path, block_size=1024 * 1024):
+    """
+    Calculates SHA-256 digest of the file reading it in blocks.
+    """
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        while block := f.read(block_size):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def bounded_map(fn, items, workers, ordered=False):
+    """
+    Applies `fn` to items on a thread pool, keeping at most `workers` items
+    in flight so that lazily produced items are never consumed ahead of time.
+    Yields (item, result, error) tuples in completion order,
+    or in the order of items when `ordered` is set.
+    """
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        pending = {}
+
+        for item in items:
+            if len(pending) >= workers:
+                yield from _pop_finished(pending, ordered)
+
+            pending[executor.submit(fn, item)] = item
+
+        while pending:
+            yield from _pop_finished(pending, ordered)
+
+
+def _pop_finished(pending, ordered):
+    if ordered:
+        # Dict keeps submission order, so the first future is the oldest one.
+        done = [next(iter(pending))]
+    else:
+        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+
+    for future in done:
+        yield (pending.pop(future), *_outcome(future))
+
+
+def _outcome(future):
+    error = future.exception()
+    if error is not None:
+        return None, error
+    return future.result(), None
+
+
+def iter_unique(items):
+    """
+    Yields items lazily in their first-seen order, skipping duplicates. The
+    items themselves are kept, as truncated hashes could drop distinct IDs.
+    """
+    seen = set()
+    for item in items:
+        if item not in seen:
+            seen.add(item)
+            yield item
@@ -0,0 +1,60 @@
+import os
+import tempfile
+
+# Cache directory is resolved when the CLI modules are imported,
+# so tests never touch the caches of the user running them.
+os.environ["LABELBOX_CLI_CACHE_DIR"] = tempfile.mkdtemp(prefix="labelbox-cli-tests-")
+
+import pytest
+from click.testing import CliRunner
+
+from src.client import LazyClient
+from src.fake_server import FakeServer, FakeServerConfig
+from src.main import cli
+from src.utils import write_json_file
+
+
+@pytest.fixture
+def fake_config(request):
+    """
+    Config of the fake server. Override with indirect parametrization.
+    """
+    return getattr(request, "param", None) or FakeServerConfig(seed=0)
+
+
+@pytest.fixture
+def fake_server(fake_config):
+    server = FakeServer(config=fake_config).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def config_file(tmp_path, fake_server):
+    path = tmp_path / "labelbox-cli.json"
+    # Unique profile name keeps caches and indexes of tests apart.
+    profile = {
+        "name": tmp_path.name,
+        "api_key": "fake",
+        "endpoint": f"{fake_server.url}/graphql",
+        "rest_endpoint": f"{fake_server.url}/api/v1",
+        "active": True,
+    }
+    write_json_file(path, {profile["name"]: profile})
+    return path
+
+
+@pytest.fixture
+def run(config_file):
+    """
+    Runs CLI command in-process against the fake server, the same way
+    `labelbox shell` does. Returns the click Result.
+    """
+
+    def run(*args, client=None):
+        client = client or LazyClient(config_file)
+        args = [str(arg) for arg in args]
+        return CliRunner().invoke(cli, args, obj=client, catch_exceptions=False)
+
+    return run
@@ -0,0 +1,32 @@
+import pytest
+
+from src.columnar import EXTRA_COLUMN, ColumnarWriter, write_columnar
+
+pa = pytest.importorskip("pyarrow")
+pytest.importorskip("pyarrow.parquet")
+
+
+def test_empty_export_writes_readable_file(tmp_path):
+    path = tmp_path / "empty.parquet"
+    assert write_columnar(iter([]), path) == 0
+    table = pa.parquet.read_table(path)
+    assert table.num_rows == 0
+    assert table.column_names == [EXTRA_COLUMN]
+
+
+def test_open_fixes_schema_before_first_batch(tmp_path):
+    path = tmp_path / "rows.parquet"
+    writer = ColumnarWriter(path)
+    writer.open({"id": "string", "score": "double"})
+    try:
+        writer.write_batch([{"id": "a", "score": 1}, {"id": "b", "name": "b.jpg"}])
+    finally:
+        writer.close()
+
+    table = pa.parquet.read_table(path)
+    assert table.schema.field("score").type == pa.float64()
+    assert table.to_pydict() == {
+        "id": ["a", "b"],
+        "score": [1.0, None],
+        EXTRA_COLUMN: [None, '{"name":"b.jpg"}'],
+    }
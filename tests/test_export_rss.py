@@ -0,0 +1,63 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from src.utils import write_json_file
+
+ROOT = Path(__file__).resolve().parent.parent
+
+pytestmark = pytest.mark.skipif(
+    not hasattr(os, "wait4"), reason="Peak RSS is measured with os.wait4"
+)
+
+
+def export_peak_rss(tmp_path, fake_server, project_id, output):
+    """
+    Runs `labelbox project export --output` in a fresh interpreter and
+    returns its peak RSS in bytes.
+    """
+    home = tmp_path / "home"
+    home.mkdir(exist_ok=True)
+    profile = {
+        "name": "rss",
+        "api_key": "fake",
+        "endpoint": f"{fake_server.url}/graphql",
+        "rest_endpoint": f"{fake_server.url}/api/v1",
+        "active": True,
+    }
+    write_json_file(home / ".labelbox-cli.json", {"rss": profile})
+    env = dict(
+        os.environ,
+        HOME=str(home),
+        PYTHONPATH=str(ROOT),
+        LABELBOX_CLI_CACHE_DIR=str(tmp_path / "cache"),
+    )
+    code = "from src.main import cli; cli(prog_name='labelbox')"
+    args = ["project", "export", project_id, "--output", str(output)]
+    process = subprocess.Popen(
+        [sys.executable, "-c", code, *args], env=env, stdout=subprocess.DEVNULL
+    )
+    _, status, usage = os.wait4(process.pid, 0)
+    process.returncode = os.waitstatus_to_exitcode(status)
+    assert process.returncode == 0
+
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS.
+    return usage.ru_maxrss * (1 if sys.platform == "darwin" else 1024)
+
+
+def test_streaming_export_memory_does_not_grow_with_export_size(tmp_path, fake_server):
+    small, _ = fake_server.fake.populate(1000)
+    large, _ = fake_server.fake.populate(60000)
+
+    small_rss = export_peak_rss(tmp_path, fake_server, small["id"], tmp_path / "s")
+    large_output = tmp_path / "large.ndjson"
+    large_rss = export_peak_rss(tmp_path, fake_server, large["id"], large_output)
+
+    export_size = large_output.stat().st_size
+    with open(large_output) as f:
+        assert sum(1 for _ in f) == 60000
+    # Holding the export in memory grows RSS by several times its size.
+    assert large_rss - small_rss < export_size / 2
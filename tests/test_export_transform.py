@@ -0,0 +1,49 @@
+import csv
+
+import click
+import pytest
+
+from src.export import write_csv
+
+
+@pytest.mark.parametrize(
+    "option",
+    [
+        ["--filter", "=DONE"],
+        ["--filter", "..~x"],
+        ["--filter", "data_row.id", "--filter", "!x"],
+        ["--select", "data_row.id,."],
+    ],
+)
+def test_invalid_expressions_fail_before_export(run, fake_server, tmp_path, option):
+    project, _ = fake_server.fake.populate(3)
+    output = tmp_path / "export.ndjson"
+
+    result = run("project", "export", project["id"], "--output", output, *option)
+    assert result.exit_code == 2
+    assert "Invalid" in result.output
+    assert fake_server.stats["requests"] == 0
+    assert not output.exists()
+
+
+def test_export_filter_and_select_to_csv(run, fake_server, tmp_path):
+    project, dataset = fake_server.fake.populate(3)
+    output = tmp_path / "export.csv"
+
+    result = run(
+        "project", "export", project["id"], "--output", output,
+        "--filter", f"data_row.global_key=fake-{dataset['id']}-1",
+        "--select", "data_row.global_key,data_row.row_data",
+    )  # fmt: skip
+    assert result.exit_code == 0, result.output
+    with open(output, newline="") as f:
+        rows = list(csv.DictReader(f))
+    assert [row["data_row.global_key"] for row in rows] == [f"fake-{dataset['id']}-1"]
+    assert list(rows[0]) == ["data_row.global_key", "data_row.row_data"]
+
+
+def test_csv_fails_on_columns_missing_from_header(tmp_path):
+    records = [{"id": "a", "name": "a.jpg"}, {"id": "b"}, {"id": "c", "extra": 1}]
+
+    with pytest.raises(click.ClickException, match="Record 3 .* extra"):
+        write_csv(iter(records), tmp_path / "rows.csv")
@@ -0,0 +1,162 @@
+import gzip
+import json
+import time
+from datetime import datetime, timezone
+
+import pytest
+
+from src.client import LazyClient
+from src.fake_server import FakeServerConfig
+
+ONTOLOGY_SPEC = """\
+name: Vehicles
+media_type: image
+tools:
+  - name: Car
+    type: bbox
+    classifications:
+      - name: Occluded
+        type: radio
+        options: ["yes", "no"]
+classifications:
+  - name: Weather
+    type: radio
+    options: [Sunny, Rainy]
+"""
+
+
+def read_ndjson(path):
+    opener = gzip.open if str(path).endswith(".gz") else open
+    with opener(path, "rt") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def test_append_and_export_dataset(run, fake_server, tmp_path):
+    dataset = fake_server.fake.add_dataset("append")
+    rows = ",".join(f"https://example.com/{i}.jpg" for i in range(25))
+    keys = ",".join(f"key-{i}" for i in range(25))
+
+    result = run(
+        "dataset", "append", "--di", dataset["id"], "--rows", rows, "--gk", keys,
+        "--chunk-size", 10,
+    )  # fmt: skip
+    assert result.exit_code == 0, result.output
+
+    output = tmp_path / "export.ndjson"
+    result = run("dataset", "export", dataset["id"], "--output", output)
+    assert result.exit_code == 0, result.output
+    records = read_ndjson(output)
+    assert sorted(r["data_row"]["global_key"] for r in records) == sorted(
+        keys.split(",")
+    )
+
+
+def test_append_rejects_duplicate_global_keys(run, fake_server):
+    dataset = fake_server.fake.add_dataset("duplicates")
+    fake_server.fake.add_data_row(
+        dataset["id"], {"row_data": "a.jpg", "global_key": "a"}
+    )
+
+    result = run(
+        "dataset", "append", "--di", dataset["id"], "--rows", "a.jpg,b.jpg",
+        "--gk", "a,b",
+    )  # fmt: skip
+    assert result.exit_code == 1
+    assert "Duplicate global key: 'a'" in result.output
+    assert sorted(fake_server.fake.global_keys) == ["a", "b"]
+
+
+def test_export_since_last_activity(run, fake_server, tmp_path):
+    project, _ = fake_server.fake.populate(10)
+    (batch,) = fake_server.fake.project_batches(project["id"])
+    time.sleep(1)  # Export filters have second precision.
+    since = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+    fake_server.fake.update_data_row(batch["dataRowIds"][0], externalId="changed")
+
+    output = tmp_path / "since.ndjson"
+    result = run(
+        "project", "export", project["id"], "--output", output, "--since", since
+    )
+    assert result.exit_code == 0, result.output
+    (record,) = read_ndjson(output)
+    assert record["data_row"]["external_id"] == "changed"
+
+
+def test_batch_create_splits_sync_and_async_batches(run, fake_server, tmp_path):
+    fake = fake_server.fake
+    dataset = fake.add_dataset("batch")
+    for i in range(1500):
+        fake.add_data_row(
+            dataset["id"], {"row_data": f"{i}.jpg", "global_key": f"b-{i}"}
+        )
+    project = fake.add_project("batch")
+
+    keys = tmp_path / "keys.txt"
+    keys.write_text("\n".join(f"b-{i}" for i in range(1500)))
+    result = run(
+        "batch", "create", "--pi", project["id"], "--n", "split", "--fp", keys,
+        "--gk", "--batch-size", 1200,
+    )  # fmt: skip
+    assert result.exit_code == 0, result.output
+    assert "Created 2 of 2 batches" in result.output
+
+    # 1200 rows go through the async (empty batch + add rows) path, 300 through
+    # the single createBatchV2 call.
+    batches = fake.project_batches(project["id"])
+    assert sorted(batch["size"] for batch in batches) == [300, 1200]
+
+
+def test_ontology_apply_is_idempotent(run, fake_server, tmp_path):
+    spec = tmp_path / "ontology.yaml"
+    spec.write_text(ONTOLOGY_SPEC)
+
+    result = run("ontology", "apply", spec)
+    assert result.exit_code == 0, result.output
+    assert len(fake_server.fake.ontologies) == 1
+    features = len(fake_server.fake.feature_schemas)
+    assert features == 2
+
+    result = run("ontology", "apply", spec)
+    assert result.exit_code == 0, result.output
+    assert "is up to date" in result.output
+    assert len(fake_server.fake.ontologies) == 1
+    assert len(fake_server.fake.feature_schemas) == features
+
+
+def test_index_sync_and_snapshot(run, fake_server, tmp_path):
+    fake_server.fake.populate(20)
+    spec = tmp_path / "ontology.yaml"
+    spec.write_text(ONTOLOGY_SPEC)
+    assert run("ontology", "apply", spec).exit_code == 0
+
+    result = run("index", "sync")
+    assert result.exit_code == 0, result.output
+    assert "Synced project index: 1 entries" in result.output
+    assert "Synced ontology index: 1 entries" in result.output
+    assert "Synced feature index: 2 entries" in result.output
+
+    out = tmp_path / "snapshot"
+    result = run("snapshot", "--out", out)
+    assert result.exit_code == 0, result.output
+    manifest = json.loads((out / "manifest.json").read_text())
+    for resource in ("project", "dataset", "ontology"):
+        (entry,) = manifest["resources"][resource].values()
+        assert entry["status"] == "written"
+        assert all((out / path).exists() for path in entry["files"])
+
+    (project_id,) = manifest["resources"]["project"]
+    assert len(read_ndjson(out / "projects" / project_id / "export.ndjson.gz")) == 20
+
+
+@pytest.mark.parametrize(
+    "fake_config", [FakeServerConfig(rate_limit=20, seed=0)], indirect=True
+)
+def test_bulk_delete_retries_throttled_requests(run, fake_server, config_file):
+    ids = [fake_server.fake.add_project(f"p-{i}")["id"] for i in range(60)]
+
+    client = LazyClient(config_file)
+    result = run("project", "delete", *ids, "--workers", 16, client=client)
+    assert result.exit_code == 0, result.output
+    assert fake_server.stats["throttled"] > 0
+    assert client.throttle.throttled > 0
+    assert all(project["deleted"] for project in fake_server.fake.projects.values())
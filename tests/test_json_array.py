@@ -0,0 +1,92 @@
+import pytest
+
+from src.utils import iter_json_array
+
+
+@pytest.fixture
+def parse(tmp_path):
+    def parse(content, block_size=64 * 1024):
+        path = tmp_path / "rows.json"
+        path.write_text(content, encoding="utf-8")
+        return list(iter_json_array(path, block_size))
+
+    return parse
+
+
+@pytest.mark.parametrize("block_size", [1, 2, 3, 5, 7, 64 * 1024])
+def test_items_straddling_blocks(parse, block_size):
+    content = (
+        ' [ {"row_data": "a,]"}, [1, 2] ,"ü", 1.5e3, -0.25, true, null, false ] \n'
+    )
+    assert parse(content, block_size) == [
+        {"row_data": "a,]"},
+        [1, 2],
+        "ü",
+        1500.0,
+        -0.25,
+        True,
+        None,
+        False,
+    ]
+
+
+@pytest.mark.parametrize("block_size", [1, 2, 3, 4])
+def test_number_split_across_blocks(parse, block_size):
+    # "[1." and "5]" with block size 3: 1 must not be decoded before "5" is read.
+    assert parse("[1.5]", block_size) == [1.5]
+    assert parse("[12345,678]", block_size) == [12345, 678]
+
+
+@pytest.mark.parametrize("content", ["[]", "  [ \n ]  \n"])
+def test_empty_array(parse, content):
+    assert parse(content) == []
+
+
+@pytest.mark.parametrize(
+    "content",
+    [
+        "",
+        "   ",
+        "[",
+        '[{"row_data": "a"}',
+        '[{"row_data": "a"},',
+        '[{"row_data": "a"}, {"row_data": ',
+        '[{"row_data": "a',
+        "[1.",
+        "[tru",
+    ],
+)
+@pytest.mark.parametrize("block_size", [1, 4, 64 * 1024])
+def test_truncated_input(parse, content, block_size):
+    with pytest.raises(ValueError):
+        parse(content, block_size)
+
+
+@pytest.mark.parametrize(
+    "content",
+    [
+        "[1]junk",
+        "[1] [2]",
+        "[1 2]",
+        '[{"a": 1} {"b": 2}]',
+        "[1,,2]",
+        "[1,]",
+        "[,1]",
+        '{"row_data": "a"}',
+        "1",
+    ],
+)
+@pytest.mark.parametrize("block_size", [1, 64 * 1024])
+def test_malformed_input(parse, content, block_size):
+    with pytest.raises(ValueError):
+        parse(content, block_size)
+
+
+def test_append_reports_truncated_file(run, fake_server, tmp_path):
+    dataset = fake_server.fake.add_dataset("truncated")
+    path = tmp_path / "rows.json"
+    path.write_text('[{"row_data": "a.jpg"}')
+
+    result = run("dataset", "append", "--di", dataset["id"], "--json", path)
+    assert result.exit_code == 1
+    assert "Invalid input: Unexpected end of data" in result.output
@@ -0,0 +1,27 @@
+import pytest
+
+from src.client import LazyClient
+
+
+@pytest.mark.parametrize(
+    "args",
+    [
+        ["--help"],
+        ["project", "--help"],
+        ["dataset", "append", "--help"],
+        # Missing required --dataset-id.
+        ["dataset", "append", "--rows", "a.jpg"],
+    ],
+)
+def test_client_is_not_built_without_api_calls(run, config_file, args):
+    client = LazyClient(config_file)
+    run(*args, client=client)
+    assert not client.is_built
+
+
+def test_client_is_built_on_first_api_call(run, config_file, fake_server):
+    project = fake_server.fake.add_project("lazy")
+    client = LazyClient(config_file)
+    result = run("project", "get", project["id"], client=client)
+    assert result.exit_code == 0, result.output
+    assert client.is_built
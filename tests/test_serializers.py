@@ -0,0 +1,52 @@
+import json
+from datetime import date, datetime, timezone
+from enum import Enum
+
+import pytest
+
+from src.utils import SERIALIZERS, load_serializer
+
+
+class MediaType(Enum):
+    Image = "IMAGE"
+
+
+RECORD = {
+    "created_at": datetime(2026, 1, 1, tzinfo=timezone.utc),
+    "labeled_at": datetime(2026, 1, 2, 3, 4, 5, 6000),
+    "day": date(2026, 1, 3),
+    "media_type": MediaType.Image,
+    "score": float("nan"),
+    "bounds": [float("inf"), -1.5, 0],
+    "name": "Ünïcode ✓",
+    "nested": {"empty": [], "none": None, "flag": True, 1: "int key"},
+}
+
+
+def installed_serializers():
+    # Missing libraries fall back to json, so each one is tested once.
+    serializers = {}
+    for requested in SERIALIZERS:
+        name, dumps, _ = load_serializer(requested)
+        serializers.setdefault(name, dumps)
+    return serializers
+
+
+@pytest.mark.parametrize("pretty", [False, True])
+def test_serializers_produce_identical_output(pretty):
+    outputs = {
+        name: dumps(RECORD, pretty=pretty)
+        for name, dumps in installed_serializers().items()
+    }
+    assert len(set(outputs.values())) == 1, outputs
+
+
+def test_output_is_valid_json():
+    _, dumps, _ = load_serializer("json")
+    decoded = json.loads(dumps(RECORD), parse_constant=pytest.fail)
+    assert decoded["created_at"] == "2026-01-01T00:00:00+00:00"
+    assert decoded["labeled_at"] == "2026-01-02T03:04:05.006000"
+    assert decoded["day"] == "2026-01-03"
+    assert decoded["media_type"] == "IMAGE"
+    assert decoded["score"] is None
+    assert decoded["bounds"] == [None, -1.5, 0]
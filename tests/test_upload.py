@@ -0,0 +1,146 @@
+import json
+import re
+
+import pytest
+
+from src.journal import UploadJournal
+
+
+def write_ndjson(path, rows):
+    path.write_text("".join(json.dumps(row) + "\n" for row in rows))
+    return path
+
+
+def rows(count, prefix="key"):
+    return [
+        {
+            "row_data": f"https://example.com/{index}.jpg",
+            "global_key": f"{prefix}{index}",
+        }
+        for index in range(count)
+    ]
+
+
+def read_metric(path, name):
+    match = re.search(
+        rf"^labelbox_cli_{name}(?:{{.*}})? (\S+)$", path.read_text(), re.M
+    )
+    return float(match[1])
+
+
+def uploaded_images(fake_server):
+    # The SDK stores data row payloads as files too.
+    return [
+        content
+        for content in fake_server.fake.files.values()
+        if content[-4:] == b".jpg"
+    ]
+
+
+@pytest.fixture
+def dataset(fake_server):
+    return fake_server.fake.add_dataset("uploads")
+
+
+def test_rows_are_uploaded_in_chunks(run, fake_server, dataset, tmp_path):
+    path = write_ndjson(tmp_path / "rows.ndjson", rows(25))
+
+    result = run(
+        "dataset", "append", "--di", dataset["id"], "--ndjson", path,
+        "--chunk-size", 10, "--workers", 2,
+    )  # fmt: skip
+    assert result.exit_code == 0, result.output
+    assert "Chunk 3: 5 rows" in result.output
+    assert "Uploaded 25 rows" in result.output
+    assert fake_server.fake.datasets[dataset["id"]]["rowCount"] == 25
+    assert set(fake_server.fake.global_keys) == {f"key{index}" for index in range(25)}
+
+
+def test_failed_rows_are_not_counted(run, fake_server, dataset, tmp_path):
+    fake_server.fake.add_data_row(dataset["id"], rows(1)[0])
+    path = write_ndjson(tmp_path / "rows.ndjson", rows(3))
+    metrics_file = tmp_path / "metrics.prom"
+
+    result = run(
+        "--metrics-file", metrics_file,
+        "dataset", "append", "--di", dataset["id"], "--ndjson", path,
+    )  # fmt: skip
+    assert result.exit_code == 1
+    assert "Chunk 1: 2 rows" in result.output
+    assert "1 rows failed" in result.output
+    assert "Duplicate global key: 'key0'" in result.output
+    assert read_metric(metrics_file, "rows_uploaded_total") == 2
+
+
+def test_resume_skips_committed_chunks(run, fake_server, dataset, tmp_path):
+    path = write_ndjson(tmp_path / "rows.ndjson", rows(20))
+    append = ("dataset", "append", "--di", dataset["id"], "--ndjson", path)
+    append = (*append, "--chunk-size", 10, "--resume")
+
+    result = run(*append)
+    assert result.exit_code == 0, result.output
+    journal = tmp_path / "rows.ndjson.journal"
+    assert len(journal.read_text().splitlines()) == 2
+
+    # Rerun with more rows, like after the input of an interrupted run grew.
+    write_ndjson(path, rows(25))
+    result = run(*append)
+    assert result.exit_code == 0, result.output
+    assert "Chunk 1: already uploaded, skipping." in result.output
+    assert "Chunk 2: already uploaded, skipping." in result.output
+    assert "Uploaded 5 rows" in result.output
+    assert fake_server.fake.datasets[dataset["id"]]["rowCount"] == 25
+    assert len(journal.read_text().splitlines()) == 3
+
+
+def test_journal_matches_rows_by_key_or_chunk(tmp_path):
+    path = tmp_path / "rows.journal"
+    journal = UploadJournal(path, "dataset", chunk_size=2)
+    journal.commit(1, [{"row_data": "a", "global_key": "a"}, {"row_data": "b"}])
+    UploadJournal(path, "other", chunk_size=2).commit(2, [{"row_data": "c"}])
+
+    journal = UploadJournal(path, "dataset", chunk_size=2)
+    assert journal.committed_keys == {"a"}
+    assert journal.pending_rows(1, [{"row_data": "b"}]) == []
+    assert journal.pending_rows(2, [{"row_data": "c"}]) == [{"row_data": "c"}]
+    assert journal.pending_rows(3, [{"row_data": "x", "global_key": "a"}]) == []
+
+    # Chunks without keys can't be matched once the chunk size changes.
+    resized = UploadJournal(path, "dataset", chunk_size=3)
+    assert resized.pending_rows(1, [{"row_data": "b"}]) == [{"row_data": "b"}]
+    assert resized.row_key("a.jpg", 0) == journal.row_key("a.jpg", 0)
+
+
+def test_dedup_cache_skips_uploaded_files(run, fake_server, dataset, tmp_path):
+    images = tmp_path / "images"
+    images.mkdir()
+    for name in ("a.jpg", "b.jpg", "c.jpg"):
+        (images / name).write_bytes(name.encode())
+    append = ("dataset", "append", "--local-dir", images)
+
+    result = run(*append, "--di", dataset["id"])
+    assert result.exit_code == 0, result.output
+    assert "Uploaded 3 files" in result.output
+    assert len(uploaded_images(fake_server)) == 3
+
+    # Same content under another name is already in the dataset.
+    (images / "copy.jpg").write_bytes(b"a.jpg")
+    (images / "d.jpg").write_bytes(b"d.jpg")
+    result = run(*append, "--di", dataset["id"])
+    assert result.exit_code == 0, result.output
+    assert "Uploaded 1 files" in result.output
+    assert "skipped 4 files already added to the dataset" in result.output
+    assert fake_server.fake.datasets[dataset["id"]]["rowCount"] == 4
+
+    # Uploaded content is reused for other datasets, global keys must differ.
+    more = tmp_path / "more"
+    more.mkdir()
+    (more / "b-copy.jpg").write_bytes(b"b.jpg")
+    (more / "e.jpg").write_bytes(b"e.jpg")
+    other = fake_server.fake.add_dataset("other")
+    result = run("dataset", "append", "--local-dir", more, "--di", other["id"])
+    assert result.exit_code == 0, result.output
+    assert "Uploaded 1 files" in result.output
+    assert "Reused 1 cached uploads, skipped 0 files" in result.output
+    assert len(uploaded_images(fake_server)) == 5
+    assert fake_server.fake.datasets[other["id"]]["rowCount"] == 2